@@ -5,20 +5,46 @@ import base64
 import json
 import logging
 import os
+import re
+import secrets
+import time
+import uuid
 from contextlib import suppress
 from pathlib import Path
 from typing import Any
 
 import dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
 
-from .services.gemini_session import GeminiSession
-from .services.tts_client import TTSClient
-from .utils import calculate_pronunciation_score
+from .services.admission import AdmissionController, AdmissionRejected
+from .services.audio_transport import OPUS, AudioDownlink, OpusUplinkDecoder, negotiate_codec, opus_available
+from .services.client_writer import ClientWriter, SlowConsumerError
+from .services.gemini_session import GeminiSession, practice_sentence_prompt
+from .services.hibernation import HibernationMonitor
+from .services.metrics import (
+    ACTIVE_SESSIONS,
+    ADMISSION_WAITING,
+    BUFFERED_AUDIO_BYTES,
+    HIBERNATED_SESSIONS,
+    REGISTRY,
+    LoopLagMonitor,
+)
+from .services.profiling import LoopWatchdog, SamplingProfiler, TurnTimings, bind_session, track_session_tasks
+from .services.scoring import ScoringEngine
+from .services.sentence_bank import GeminiSentenceGenerator, SentenceBank
+from .services.session_pool import GeminiSessionPool
+from .services.session_registry import SessionRecord, SessionRegistry, create_session_registry
+from .services.static_assets import StaticAssets
+from .services.tts_cache import TTSCache
+from .services.tts_client import TTS_SAMPLE_RATE, FakeTTSClient, TTSClient
+from .services.tts_stream import TTSStreamPipeline
+from .services.turn_store import TurnEntry, TurnStore
+from .services.vad import StreamingVAD
+from .utils import score_from_signal_stats
 
 dotenv.load_dotenv()
 
@@ -26,17 +52,106 @@ logger = logging.getLogger("gemini_teacher.app")
 if not logging.getLogger().handlers:
     logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
 
+# Required, but checked at startup so tooling and benchmarks can import the app without it.
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
-if not GOOGLE_API_KEY:
-    raise RuntimeError("Missing GOOGLE_API_KEY environment variable")
+
+# Extra keys (comma separated) spread sessions and TTS across several quotas.
+GOOGLE_API_KEYS = list(
+    dict.fromkeys(
+        [GOOGLE_API_KEY or "", *(key.strip() for key in os.getenv("GOOGLE_API_KEYS", "").split(",") if key.strip())]
+    )
+)
 
 HTTP_PROXY = os.environ.get("HTTP_PROXY")
 HOST = os.getenv("GEMINI_HOST", "generativelanguage.googleapis.com")
 MODEL_NAME = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
+GEMINI_LIVE_URL = os.getenv("GEMINI_LIVE_URL") or None
 GEMINI_MODEL = MODEL_NAME if MODEL_NAME.startswith("models/") else f"models/{MODEL_NAME}"
 
 GEMINI_TTS_MODEL = os.getenv("GEMINI_TTS_MODEL", "gemini-2.5-flash-preview-tts")
 GEMINI_TTS_VOICE_NAME = os.getenv("GEMINI_TTS_VOICE_NAME", "Kore")
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gemini").lower()
+TTS_FAKE_LATENCY_MS = int(os.getenv("TTS_FAKE_LATENCY_MS", "200"))
+TTS_CACHE_MEMORY_BYTES = int(os.getenv("TTS_CACHE_MEMORY_BYTES", str(64 * 1024 * 1024)))
+TTS_CACHE_DISK_BYTES = int(os.getenv("TTS_CACHE_DISK_BYTES", str(512 * 1024 * 1024)))
+TTS_CACHE_DIR = Path(os.getenv("TTS_CACHE_DIR", Path(__file__).resolve().parents[1] / ".cache" / "tts"))
+TTS_STREAMING = os.getenv("TTS_STREAMING", "1").lower() not in {"0", "false", "no"}
+# TTS_STREAM_WORKERS is the older name for the concurrency limit.
+TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", os.getenv("TTS_STREAM_WORKERS", "4")))
+TTS_MAX_QUEUE = int(os.getenv("TTS_MAX_QUEUE", "32"))
+TTS_TIMEOUT_S = float(os.getenv("TTS_TIMEOUT_S", "20"))
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_FRAME_MS = int(os.getenv("AUDIO_FRAME_MS", "60"))
+AUDIO_MAX_LATENCY_MS = int(os.getenv("AUDIO_MAX_LATENCY_MS", "100"))
+AUDIO_MAX_PENDING_MS = int(os.getenv("AUDIO_MAX_PENDING_MS", "2000"))
+AUDIO_BUFFER_SECONDS = int(os.getenv("AUDIO_BUFFER_SECONDS", "60"))
+# Server-side VAD drops silence and ends turns by itself. "client": only for connections that ask
+# for it with ?vad=1; "1": every connection; "0": never.
+AUDIO_VAD = os.getenv("AUDIO_VAD", "client").lower()
+AUDIO_VAD_HANGOVER_MS = int(os.getenv("AUDIO_VAD_HANGOVER_MS", "900"))
+AUDIO_VAD_PRE_ROLL_MS = int(os.getenv("AUDIO_VAD_PRE_ROLL_MS", "200"))
+AUDIO_CODECS = [codec.strip() for codec in os.getenv("AUDIO_CODECS", "opus,pcm16").lower().split(",") if codec.strip()]
+AUDIO_OPUS_BITRATE = int(os.getenv("AUDIO_OPUS_BITRATE", "24000"))
+WS_COALESCE_MS = int(os.getenv("WS_COALESCE_MS", "25"))
+WS_SEND_QUEUE_MAX = int(os.getenv("WS_SEND_QUEUE_MAX", "512"))
+WS_SEND_QUEUE_BYTES = int(os.getenv("WS_SEND_QUEUE_BYTES", str(8 * 1024 * 1024)))
+WS_SEND_TIMEOUT_S = float(os.getenv("WS_SEND_TIMEOUT_S", "10"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+SCORING_MODE = os.getenv("SCORING_MODE", "auto")
+if SCORING_MODE == "auto" and WEB_CONCURRENCY > 1:
+    # Each worker already has a core to itself; extra scoring processes would oversubscribe.
+    SCORING_MODE = "thread"
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "0")) or None
+SCORING_BREAKDOWN = os.getenv("SCORING_BREAKDOWN", "1").lower() not in {"0", "false", "no"}
+GEMINI_POOL_SIZE = int(os.getenv("GEMINI_POOL_SIZE", "2"))
+GEMINI_POOL_TTL = float(os.getenv("GEMINI_POOL_TTL", "120"))
+GEMINI_POOL_CHECK_INTERVAL = float(os.getenv("GEMINI_POOL_CHECK_INTERVAL", "5"))
+GEMINI_RESUME_ATTEMPTS = int(os.getenv("GEMINI_RESUME_ATTEMPTS", "5"))
+GEMINI_RESUME_TRANSCRIPT_TURNS = int(os.getenv("GEMINI_RESUME_TRANSCRIPT_TURNS", "12"))
+GEMINI_CONTEXT_MAX_TOKENS = int(os.getenv("GEMINI_CONTEXT_MAX_TOKENS", "16000"))
+GEMINI_SUMMARY_TURNS = int(os.getenv("GEMINI_SUMMARY_TURNS", "6"))
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in {"0", "false", "no"}
+LOOP_LAG_INTERVAL_MS = int(os.getenv("LOOP_LAG_INTERVAL_MS", "500"))
+# Log the stack, task and conversation whenever the event loop is blocked this long; 0 turns it off.
+LOOP_STALL_MS = int(os.getenv("LOOP_STALL_MS", "100"))
+TURN_TIMINGS_KEEP = int(os.getenv("TURN_TIMINGS_KEEP", "20"))
+# Bearer token for the /admin endpoints (profiling, stalls, per-session timings) and the learner
+# history/progress APIs; unset disables them.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+SESSION_REGISTRY = os.getenv("SESSION_REGISTRY", "sqlite" if WEB_CONCURRENCY > 1 else "memory").lower()
+SESSION_REGISTRY_PATH = Path(
+    os.getenv("SESSION_REGISTRY_PATH", Path(__file__).resolve().parents[1] / ".cache" / "sessions.sqlite3")
+)
+SESSION_TTL = float(os.getenv("SESSION_TTL", "3600"))
+SENTENCE_BANK = os.getenv("SENTENCE_BANK", "1").lower() not in {"0", "false", "no"}
+SENTENCE_BANK_MODEL = os.getenv("SENTENCE_BANK_MODEL", "gemini-2.0-flash")
+SENTENCE_BANK_SIZE = int(os.getenv("SENTENCE_BANK_SIZE", "6"))
+SENTENCE_BANK_MAX_SERVES = int(os.getenv("SENTENCE_BANK_MAX_SERVES", "20"))
+SENTENCE_BANK_REFILL_S = float(os.getenv("SENTENCE_BANK_REFILL_S", "900"))
+SENTENCE_BANK_PATH = Path(
+    os.getenv("SENTENCE_BANK_PATH", Path(__file__).resolve().parents[1] / ".cache" / "sentence_bank.json.gz")
+)
+# "background": load the TTS SDK, PyAV and scoring workers right after startup;
+# "lazy": only when first used; "eager": before the worker starts serving.
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "background").lower()
+# Serve the frontend from memory with fingerprinted, precompressed assets; "0" serves files from disk as edited.
+STATIC_ASSETS = os.getenv("STATIC_ASSETS", "1").lower() not in {"0", "false", "no"}
+HIBERNATE_IDLE_S = float(os.getenv("HIBERNATE_IDLE_S", "300"))
+HIBERNATE_PAUSED_S = float(os.getenv("HIBERNATE_PAUSED_S", "60"))
+HIBERNATE_CHECK_INTERVAL_S = float(os.getenv("HIBERNATE_CHECK_INTERVAL_S", "5"))
+ADMISSION_MAX_SESSIONS_PER_KEY = int(os.getenv("ADMISSION_MAX_SESSIONS_PER_KEY", "50"))
+ADMISSION_SESSIONS_PER_MINUTE = float(os.getenv("ADMISSION_SESSIONS_PER_MINUTE", "60"))
+ADMISSION_AUDIO_BYTES_PER_S = float(os.getenv("ADMISSION_AUDIO_BYTES_PER_S", "0"))
+ADMISSION_TTS_PER_MINUTE = float(os.getenv("ADMISSION_TTS_PER_MINUTE", "0"))
+ADMISSION_MAX_WAITING = int(os.getenv("ADMISSION_MAX_WAITING", "100"))
+ADMISSION_QUEUE_TIMEOUT_S = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_S", "120"))
+TURN_STORE = os.getenv("TURN_STORE", "1").lower() not in {"0", "false", "no"}
+TURN_STORE_PATH = Path(os.getenv("TURN_STORE_PATH", Path(__file__).resolve().parents[1] / ".cache" / "turns.sqlite3"))
+TURN_STORE_BATCH = int(os.getenv("TURN_STORE_BATCH", "256"))
+TURN_STORE_FLUSH_MS = int(os.getenv("TURN_STORE_FLUSH_MS", "500"))
+TURN_STORE_MAX_PENDING = int(os.getenv("TURN_STORE_MAX_PENDING", "10000"))
+LEARNER_ID_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
 
 THEMES: dict[str, list[str]] = {
     "business": ["job interview", "business meeting", "presentation", "networking"],
@@ -55,54 +170,423 @@ app.add_middleware(
 )
 
 frontend_dir = Path(__file__).resolve().parents[1] / "frontend"
+static_assets = StaticAssets(frontend_dir) if STATIC_ASSETS else None
 
 
 @app.on_event("startup")
 async def _init_clients() -> None:
-    app.state.tts_client = TTSClient(
-        api_key=GOOGLE_API_KEY,
-        voice_name=GEMINI_TTS_VOICE_NAME,
-        model_id=GEMINI_TTS_MODEL,
+    if not GOOGLE_API_KEY:
+        raise RuntimeError("Missing GOOGLE_API_KEY environment variable")
+    app.state.admission = AdmissionController(
+        GOOGLE_API_KEYS,
+        max_sessions=ADMISSION_MAX_SESSIONS_PER_KEY,
+        sessions_per_minute=ADMISSION_SESSIONS_PER_MINUTE,
+        audio_bytes_per_second=ADMISSION_AUDIO_BYTES_PER_S,
+        tts_per_minute=ADMISSION_TTS_PER_MINUTE,
+        max_waiting=ADMISSION_MAX_WAITING,
+        queue_timeout=ADMISSION_QUEUE_TIMEOUT_S,
+    )
+    ADMISSION_WAITING.set_function(lambda: app.state.admission.waiting)
+    tts_cache = TTSCache(
+        max_memory_bytes=TTS_CACHE_MEMORY_BYTES,
+        disk_dir=TTS_CACHE_DIR,
+        max_disk_bytes=TTS_CACHE_DISK_BYTES,
+    )
+    if TTS_BACKEND == "fake":
+        logger.warning("Using the fake TTS backend; no speech will be synthesized")
+        app.state.tts_client = FakeTTSClient(
+            cache=tts_cache,
+            latency=TTS_FAKE_LATENCY_MS / 1000,
+            max_concurrency=TTS_MAX_CONCURRENCY,
+            max_queue=TTS_MAX_QUEUE,
+            timeout=TTS_TIMEOUT_S,
+            admission=app.state.admission,
+        )
+    else:
+        app.state.tts_client = TTSClient(
+            api_key=GOOGLE_API_KEY,
+            voice_name=GEMINI_TTS_VOICE_NAME,
+            model_id=GEMINI_TTS_MODEL,
+            cache=tts_cache,
+            max_concurrency=TTS_MAX_CONCURRENCY,
+            max_queue=TTS_MAX_QUEUE,
+            timeout=TTS_TIMEOUT_S,
+            extra_api_keys=GOOGLE_API_KEYS[1:],
+            admission=app.state.admission,
+        )
+    app.state.scoring_engine = ScoringEngine(mode=SCORING_MODE, max_workers=SCORING_WORKERS)
+    app.state.gemini_pool = GeminiSessionPool(
+        factory=_new_gemini_session,
+        size=GEMINI_POOL_SIZE,
+        ttl=GEMINI_POOL_TTL,
+        check_interval=GEMINI_POOL_CHECK_INTERVAL,
+        pick_key=app.state.admission.least_loaded_key,
+    )
+    app.state.gemini_pool.start()
+    app.state.active_sessions = set()
+    app.state.session_registry = create_session_registry(
+        SESSION_REGISTRY, path=SESSION_REGISTRY_PATH, ttl=SESSION_TTL
+    )
+    app.state.session_registry.start()
+    if SESSION_REGISTRY == "memory" and WEB_CONCURRENCY > 1:
+        logger.warning("In-memory session registry with %d workers; reconnects may not resume", WEB_CONCURRENCY)
+    BUFFERED_AUDIO_BYTES.set_function(
+        lambda: sum(session.buffered_audio_bytes for session in app.state.active_sessions)
+    )
+    app.state.sentence_bank = None
+    if SENTENCE_BANK:
+        app.state.sentence_bank = SentenceBank(
+            generator=GeminiSentenceGenerator(api_key=GOOGLE_API_KEY, model=SENTENCE_BANK_MODEL),
+            tts_client=app.state.tts_client,
+            scenarios=THEMES,
+            path=SENTENCE_BANK_PATH,
+            target_size=SENTENCE_BANK_SIZE,
+            max_serves=SENTENCE_BANK_MAX_SERVES,
+            refill_interval=SENTENCE_BANK_REFILL_S,
+        )
+        app.state.sentence_bank.start()
+    app.state.turn_store = None
+    if TURN_STORE:
+        app.state.turn_store = TurnStore(
+            TURN_STORE_PATH,
+            batch_size=TURN_STORE_BATCH,
+            flush_interval=TURN_STORE_FLUSH_MS / 1000,
+            max_pending=TURN_STORE_MAX_PENDING,
+        )
+        app.state.turn_store.start()
+    HIBERNATED_SESSIONS.set_function(
+        lambda: sum(1 for session in app.state.active_sessions if session.hibernating)
+    )
+    app.state.hibernation_monitor = HibernationMonitor(
+        sessions=lambda: app.state.active_sessions,
+        idle_timeout=HIBERNATE_IDLE_S,
+        paused_timeout=HIBERNATE_PAUSED_S,
+        interval=HIBERNATE_CHECK_INTERVAL_S,
+    )
+    app.state.hibernation_monitor.start()
+    app.state.loop_lag_monitor = LoopLagMonitor(interval=LOOP_LAG_INTERVAL_MS / 1000)
+    if METRICS_ENABLED:
+        app.state.loop_lag_monitor.start()
+    loop = asyncio.get_running_loop()
+    track_session_tasks(loop)
+    app.state.loop_watchdog = LoopWatchdog(threshold=LOOP_STALL_MS / 1000)
+    app.state.loop_watchdog.start()
+    app.state.profiler = SamplingProfiler(loop)
+    app.state.turn_timings = {}
+    app.state.warmed_up = False
+    app.state.warmup = None
+    app.state.static_assets_load = None
+    if static_assets is not None:
+        # Hashing and compressing the frontend is CPU work; it runs in a thread and the app answers 503 meanwhile.
+        app.state.static_assets_load = asyncio.create_task(_load_static_assets(), name="static_assets_load")
+    if STARTUP_WARMUP == "eager":
+        if app.state.static_assets_load is not None:
+            await app.state.static_assets_load
+        await _warm_up()
+    elif STARTUP_WARMUP == "background":
+        # Runs while uvicorn binds the port; the first connection does not wait for it.
+        app.state.warmup = asyncio.create_task(_warm_up(), name="startup_warmup")
+
+
+async def _load_static_assets() -> None:
+    try:
+        await asyncio.to_thread(static_assets.load)
+    except Exception:
+        logger.exception("Failed to load the frontend from %s", frontend_dir)
+
+
+async def _warm_up() -> None:
+    """Load what the first conversation would otherwise pay for: the TTS SDK, PyAV and scoring workers."""
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(app.state.scoring_engine.warm_up)
+        if OPUS in AUDIO_CODECS:
+            await asyncio.to_thread(opus_available)
+        await app.state.tts_client.warm_up()
+    except Exception:
+        logger.exception("Startup warm-up failed; the rest loads on first use")
+        return
+    app.state.warmed_up = True
+    logger.info("Warm-up finished in %.3fs", time.perf_counter() - started)
+
+
+@app.on_event("shutdown")
+async def _shutdown_clients() -> None:
+    for name in ("warmup", "static_assets_load"):
+        task: asyncio.Task[None] | None = getattr(app.state, name, None)
+        if task and not task.done():
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    loop_lag_monitor: LoopLagMonitor | None = getattr(app.state, "loop_lag_monitor", None)
+    if loop_lag_monitor:
+        await loop_lag_monitor.stop()
+    loop_watchdog: LoopWatchdog | None = getattr(app.state, "loop_watchdog", None)
+    if loop_watchdog:
+        await loop_watchdog.stop()
+    hibernation_monitor: HibernationMonitor | None = getattr(app.state, "hibernation_monitor", None)
+    if hibernation_monitor:
+        await hibernation_monitor.stop()
+    sentence_bank: SentenceBank | None = getattr(app.state, "sentence_bank", None)
+    if sentence_bank:
+        await sentence_bank.close()
+    gemini_pool: GeminiSessionPool | None = getattr(app.state, "gemini_pool", None)
+    if gemini_pool:
+        await gemini_pool.close()
+    scoring_engine: ScoringEngine | None = getattr(app.state, "scoring_engine", None)
+    if scoring_engine:
+        scoring_engine.shutdown()
+    session_registry: SessionRegistry | None = getattr(app.state, "session_registry", None)
+    if session_registry:
+        await session_registry.close()
+    turn_store: TurnStore | None = getattr(app.state, "turn_store", None)
+    if turn_store:
+        await turn_store.close()
+    tts_client: TTSClient | None = getattr(app.state, "tts_client", None)
+    if tts_client:
+        await tts_client.aclose()
+
+
+def _pcm_bytes_for(duration_ms: int) -> int:
+    """Size of ``duration_ms`` of 16-bit mono PCM at the upstream sample rate."""
+    return AUDIO_SAMPLE_RATE * 2 * duration_ms // 1000
+
+
+def _new_gemini_session(api_key: str | None = None) -> GeminiSession:
+    return GeminiSession(
+        model=GEMINI_MODEL,
+        api_key=api_key or GOOGLE_API_KEY,
+        host=HOST,
+        proxy_url=HTTP_PROXY,
+        endpoint=GEMINI_LIVE_URL,
+        audio_frame_bytes=_pcm_bytes_for(AUDIO_FRAME_MS),
+        audio_max_latency=AUDIO_MAX_LATENCY_MS / 1000,
+        audio_max_pending_bytes=_pcm_bytes_for(AUDIO_MAX_PENDING_MS),
+        audio_buffer_samples=AUDIO_SAMPLE_RATE * AUDIO_BUFFER_SECONDS,
+        resume_attempts=GEMINI_RESUME_ATTEMPTS,
+        transcript_turns=GEMINI_RESUME_TRANSCRIPT_TURNS,
+        context_max_tokens=GEMINI_CONTEXT_MAX_TOKENS,
+        summary_turns=GEMINI_SUMMARY_TURNS,
+    )
+
+
+async def _save_record(record: SessionRecord) -> None:
+    record.updated_at = time.time()
+    try:
+        await app.state.session_registry.put(record)
+    except Exception:
+        logger.exception("Failed to update session registry for %s", record.session_id)
+
+
+def _log_turn(record: SessionRecord | None, **fields: Any) -> None:
+    turn_store: TurnStore | None = app.state.turn_store
+    if turn_store is None or record is None:
+        return
+    turn_store.append(
+        TurnEntry(
+            learner_id=record.learner_id or record.session_id,
+            session_id=record.session_id,
+            theme=record.theme,
+            scenario=record.scenario,
+            **fields,
+        )
     )
 
 
+async def _open_record(requested_id: str | None, learner_id: str | None = None) -> tuple[SessionRecord, bool]:
+    """Load the conversation a reconnecting client asks for, or start a new one."""
+    registry: SessionRegistry = app.state.session_registry
+    record = None
+    if requested_id:
+        try:
+            record = await registry.get(requested_id)
+        except Exception:
+            logger.exception("Failed to read session registry for %s", requested_id)
+    resumed = record is not None
+    now = time.time()
+    if record is None:
+        record = SessionRecord(session_id=uuid.uuid4().hex, worker=os.getpid(), created_at=now, updated_at=now)
+    record.worker = os.getpid()
+    record.connected = True
+    if learner_id and LEARNER_ID_RE.match(learner_id):
+        record.learner_id = learner_id
+    await _save_record(record)
+    return record, resumed
+
+
 @app.get("/api/themes")
 async def get_themes() -> JSONResponse:
     return JSONResponse(THEMES)
 
 
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
 async def _forward_gemini_events(
     *,
     session: GeminiSession,
     websocket: WebSocket,
+    writer: ClientWriter,
     tts_client: TTSClient,
+    downlink: AudioDownlink,
+    accepted_at: float | None = None,
+    record: SessionRecord | None = None,
+    timings: TurnTimings | None = None,
 ) -> None:
     logger.debug("Begin forwarding Gemini events to %s", websocket.client)
+    if timings is None:
+        timings = TurnTimings(max_turns=TURN_TIMINGS_KEEP)
+    stream_tts = TTS_STREAMING and tts_client.enabled
+    pipeline: TTSStreamPipeline | None = None
+    finishing: set[asyncio.Task[int]] = set()
+    # Allocated from the downlink when the turn's first audio or its final response appears.
+    turn_id: int | None = None
+    # Set as soon as the reply asks for a break, before the turn completes.
+    pausing = False
     try:
         async for event in session.events():
             if event.type == "text-delta" and event.text:
-                logger.debug("Forwarding text delta (%d chars)", len(event.text))
-                await websocket.send_json({"type": "partial-response", "text": event.text})
+                with timings.phase("deltas"):
+                    logger.debug("Forwarding text delta (%d chars)", len(event.text))
+                    if accepted_at is not None:
+                        first_token = time.monotonic() - accepted_at
+                        app.state.gemini_pool.first_token.observe(first_token)
+                        logger.info("First Gemini token for %s after %.3fs", websocket.client, first_token)
+                        accepted_at = None
+                    await writer.send_json({"type": "partial-response", "text": event.text})
+            elif event.type == "english-delta" and event.text:
+                if stream_tts and not session.paused and not pausing:
+                    with timings.phase("deltas"):
+                        if pipeline is None:
+                            if turn_id is None:
+                                turn_id = downlink.next_turn()
+                            pipeline = TTSStreamPipeline(
+                                tts_client=tts_client,
+                                send_audio=downlink.send,
+                                turn_id=turn_id,
+                            )
+                        pipeline.feed(event.text)
+            elif event.type == "separator":
+                if pipeline is not None:
+                    pipeline.end_text()
+            elif event.type == "score":
+                await writer.send_json({"type": "tutor-score", "score": event.score})
+            elif event.type == "pause":
+                pausing = True
+                if pipeline is not None:
+                    await pipeline.cancel()
+                    pipeline = None
+            elif event.type == "reconnecting":
+                logger.info("Gemini connection lost for %s; resuming", websocket.client)
+                # The interrupted reply will not be completed by the new connection.
+                if pipeline is not None:
+                    await pipeline.cancel()
+                    pipeline = None
+                turn_id = None
+                await writer.send_json({"type": "gemini-reconnecting"})
+            elif event.type == "reconnected":
+                logger.info("Gemini session resumed for %s", websocket.client)
+                await writer.send_json({"type": "gemini-reconnected"})
+                if record is not None:
+                    record.counters["upstream_resumes"] = record.counters.get("upstream_resumes", 0) + 1
+                    await _save_record(record)
+            elif event.type == "hibernated":
+                logger.info("Conversation %s hibernated", record.session_id if record else websocket.client)
+                await writer.send_json({"type": "hibernated", "paused": session.paused})
+                if record is not None:
+                    record.transcript = session.transcript()
+                    record.paused = session.paused
+                    record.counters["hibernations"] = record.counters.get("hibernations", 0) + 1
+                    await _save_record(record)
+            elif event.type == "rehydrated":
+                await writer.send_json({"type": "rehydrated"})
+            elif event.type == "context-rollover":
+                logger.info(
+                    "Conversation %s moved to a fresh Gemini connection (rollover %d)",
+                    record.session_id if record else websocket.client,
+                    session.context_rollovers,
+                )
+                if record is not None:
+                    record.transcript = session.transcript()
+                    record.counters["context_rollovers"] = record.counters.get("context_rollovers", 0) + 1
+                    await _save_record(record)
             elif event.type == "turn-complete":
+                if turn_id is None:
+                    turn_id = downlink.next_turn()
                 payload: dict[str, Any] = {
                     "type": "final-response",
                     "text": event.text,
                     "paused": event.paused,
                 }
-                audio_bytes = session.reset_audio_buffer()
-                if audio_bytes:
-                    logger.debug("Calculated pronunciation score from %d audio bytes", len(audio_bytes))
-                    payload["score"] = calculate_pronunciation_score(audio_bytes)
-                english_text = ""
-                if event.text:
-                    english_text = event.text.split("---")[0].strip()
-                if english_text and tts_client.enabled and not event.paused:
-                    audio_b64 = await tts_client.synthesize(english_text)
-                    if audio_b64:
-                        payload["audio"] = audio_b64
-                await websocket.send_json(payload)
-                await websocket.send_json({"type": "pause-state", "paused": event.paused})
+                if event.score is not None:
+                    payload["tutor_score"] = event.score
+                pausing = False
+                turn_audio: bytes | None = None
+                with timings.phase("scoring"):
+                    samples = session.audio_samples() if SCORING_BREAKDOWN else None
+                    features = session.reset_audio_buffer()
+                    if features.samples:
+                        logger.debug("Calculated pronunciation score from %d audio samples", features.samples)
+                        payload["score"] = score_from_signal_stats(
+                            mean_abs=features.mean_abs,
+                            zero_crossings=features.zero_crossings,
+                        )
+                if features.samples and samples is not None and samples.size:
+                    try:
+                        with timings.phase("analysis"):
+                            payload["score_breakdown"] = await app.state.scoring_engine.analyze(samples)
+                    except Exception:
+                        logger.exception("Pronunciation analysis failed")
+                if pipeline is not None:
+                    if event.paused:
+                        await pipeline.cancel()
+                    else:
+                        # Let the remaining sentences finish in the background; the
+                        # first chunks are usually already on their way to the client.
+                        payload["audio_streamed"] = True
+                        task = asyncio.create_task(pipeline.finish(), name=f"tts_stream_finish_{turn_id}")
+                        finishing.add(task)
+                        task.add_done_callback(finishing.discard)
+                    pipeline = None
+                else:
+                    english_text = event.english or ""
+                    if english_text and tts_client.enabled and not event.paused:
+                        try:
+                            with timings.phase("tts"):
+                                turn_audio = await tts_client.synthesize_bytes(english_text)
+                        except Exception as exc:
+                            # Feedback text is still useful without the spoken version.
+                            logger.warning("TTS failed for turn %d: %r", turn_id, exc)
+                        if turn_audio and downlink.codec is None:
+                            payload["audio"] = base64.b64encode(turn_audio).decode()
+                            turn_audio = None
+                        elif turn_audio:
+                            payload["audio_streamed"] = True
+                with timings.phase("deliver"):
+                    await writer.send_json(payload)
+                    if turn_audio:
+                        await downlink.send(turn_audio, turn=turn_id, text=english_text)
+                    turn_id = None
+                    await writer.send_json({"type": "pause-state", "paused": event.paused})
                 logger.info("Delivered final response to client %s (paused=%s)", websocket.client, event.paused)
+                with timings.phase("record"):
+                    _log_turn(
+                        record,
+                        tutor_text=event.text or "",
+                        score=payload.get("score"),
+                        tutor_score=event.score,
+                        breakdown=payload.get("score_breakdown"),
+                        paused=bool(event.paused),
+                        first_token_ms=_ms(event.first_token_seconds),
+                        turn_ms=_ms(event.turn_seconds),
+                    )
+                    if record is not None:
+                        record.transcript = session.transcript()
+                        record.paused = bool(event.paused)
+                        record.counters["turns"] = record.counters.get("turns", 0) + 1
+                        await _save_record(record)
+                timings.finish(gemini_first_token=event.first_token_seconds, gemini_turn=event.turn_seconds)
     except ConnectionClosedOK as exc:
         logger.info(
             "Gemini connection closed gracefully: code=%s reason=%s",
@@ -110,7 +594,7 @@ async def _forward_gemini_events(
             exc.reason,
         )
         with suppress(Exception):
-            await websocket.send_json(
+            await writer.send_json(
                 {
                     "type": "gemini-disconnected",
                     "code": exc.code,
@@ -124,7 +608,7 @@ async def _forward_gemini_events(
             exc.reason,
         )
         with suppress(Exception):
-            await websocket.send_json(
+            await writer.send_json(
                 {
                     "type": "gemini-disconnected",
                     "code": exc.code,
@@ -136,14 +620,89 @@ async def _forward_gemini_events(
         logger.exception("Unhandled error while forwarding Gemini events")
         raise
     finally:
+        if pipeline is not None:
+            await pipeline.cancel()
+        for task in list(finishing):
+            task.cancel()
         logger.debug("Finished forwarding Gemini events for %s", websocket.client)
 
 
+async def _serve_banked_sentence(
+    *,
+    session: GeminiSession,
+    websocket: WebSocket,
+    writer: ClientWriter,
+    downlink: AudioDownlink,
+    theme: str,
+    scenario: str,
+    served: set[str],
+    record: SessionRecord | None = None,
+) -> bool:
+    """Answer ``start-practice`` from the sentence bank; ``False`` means ask Gemini instead."""
+    sentence_bank: SentenceBank | None = app.state.sentence_bank
+    if sentence_bank is None:
+        return False
+    sentence = sentence_bank.take(theme, scenario, exclude=served)
+    if sentence is None:
+        return False
+    served.add(sentence.english)
+    logger.info("Serving banked practice sentence to %s (theme=%s scenario=%s)", websocket.client, theme, scenario)
+    # Record the exchange so Gemini scores the learner against this sentence.
+    await session.add_context(
+        [("user", practice_sentence_prompt(theme=theme, scenario=scenario)), ("model", sentence.text)]
+    )
+    audio_bytes = None
+    try:
+        audio_bytes = await sentence_bank.audio(sentence)
+    except Exception as exc:
+        logger.warning("TTS failed for banked sentence: %r", exc)
+    await writer.send_json(
+        {
+            "type": "final-response",
+            "text": sentence.text,
+            "paused": False,
+            "source": "sentence-bank",
+            "audio_streamed": bool(audio_bytes),
+        }
+    )
+    if audio_bytes:
+        await downlink.send(audio_bytes, turn=downlink.next_turn(), text=sentence.english)
+    _log_turn(record, tutor_text=sentence.text, source="sentence-bank")
+    return True
+
+
+async def _ingest_audio(
+    *,
+    session: GeminiSession,
+    websocket: WebSocket,
+    writer: ClientWriter,
+    vad: StreamingVAD | None,
+    pcm: bytes,
+) -> None:
+    """Forward learner audio, dropping silence and ending the turn once the VAD hears the learner stop."""
+    if vad is None or session.paused:
+        await session.send_audio_bytes(pcm)
+        return
+    result = vad.process(pcm)
+    if result.audio:
+        await session.send_audio_bytes(result.audio)
+    if result.turn_ended:
+        logger.info("Voice activity ended the turn for %s", websocket.client)
+        await session.end_user_turn()
+        await writer.send_json({"type": "vad-end-turn"})
+
+
 async def _forward_client_messages(
     *,
     session: GeminiSession,
     websocket: WebSocket,
+    writer: ClientWriter,
+    downlink: AudioDownlink,
+    uplink: OpusUplinkDecoder | None = None,
+    vad: StreamingVAD | None = None,
+    record: SessionRecord | None = None,
 ) -> None:
+    served_sentences: set[str] = set()
     while True:
         message = await websocket.receive()
         message_type = message.get("type")
@@ -156,9 +715,24 @@ async def _forward_client_messages(
             logger.debug("Received client message type=%s", msg_type)
             if msg_type == "audio-chunk" and "data" in data:
                 logger.debug("Streaming audio chunk from client (len=%d)", len(data["data"]))
-                await session.send_audio_chunk(base64_chunk=data["data"])
+                if vad is None:
+                    await session.send_audio_chunk(base64_chunk=data["data"])
+                else:
+                    await _ingest_audio(
+                        session=session,
+                        websocket=websocket,
+                        writer=writer,
+                        vad=vad,
+                        pcm=base64.b64decode(data["data"]),
+                    )
             elif msg_type == "end-turn":
+                if vad is not None and vad.ended_turn:
+                    # The VAD already ended this turn; a second turn_complete would ask for another reply.
+                    logger.info("Ignoring end-turn from %s; turn already ended by voice activity", websocket.client)
+                    continue
                 logger.info("Client marked end of turn")
+                if vad is not None:
+                    vad.reset()
                 await session.end_user_turn()
             elif msg_type == "preference":
                 theme = data.get("theme")
@@ -170,6 +744,10 @@ async def _forward_client_messages(
                         )
                     )
                     logger.info("Updating practice preference to theme=%s scenario=%s", theme, scenario)
+                    session.theme, session.scenario = theme, scenario
+                    if record is not None:
+                        record.theme, record.scenario = theme, scenario
+                        await _save_record(record)
                     await session.send_user_text(preference_text)
             elif msg_type == "start-practice":
                 theme = data.get("theme")
@@ -182,6 +760,13 @@ async def _forward_client_messages(
                 )
                 session.paused = False
                 session.reset_audio_buffer()
+                if vad is not None:
+                    vad.reset()
+                if theme or scenario:
+                    session.theme, session.scenario = theme, scenario
+                if record is not None and (theme or scenario):
+                    record.theme, record.scenario = theme, scenario
+                    await _save_record(record)
                 if theme and scenario:
                     friendly_target = f"{theme} - {scenario}"
                 elif theme:
@@ -191,70 +776,309 @@ async def _forward_client_messages(
                 else:
                     friendly_target = "练习内容"
                 with suppress(Exception):
-                    await websocket.send_json(
+                    await writer.send_json(
                         {
                             "type": "status",
                             "message": f"AI 正在准备 {friendly_target} 的练习句子…",
                         }
                     )
+                if theme and scenario and await _serve_banked_sentence(
+                    session=session,
+                    websocket=websocket,
+                    writer=writer,
+                    downlink=downlink,
+                    theme=theme,
+                    scenario=scenario,
+                    served=served_sentences,
+                    record=record,
+                ):
+                    continue
                 await session.request_practice_sentence(theme=theme, scenario=scenario)
             elif msg_type == "control":
                 action = data.get("action")
                 if action == "resume":
                     logger.info("Client resumed session")
                     session.paused = False
+                    # Reconnect now rather than on the learner's first audio frame.
+                    await session.wake()
                 elif action == "pause":
                     logger.info("Client paused session")
                     session.paused = True
         elif "bytes" in message and message["bytes"] is not None:
             logger.debug("Received binary audio chunk from client (%d bytes)", len(message["bytes"]))
-            await session.send_audio_chunk(base64_chunk=base64.b64encode(message["bytes"]).decode())
+            pcm = message["bytes"]
+            if uplink is not None:
+                try:
+                    pcm = uplink.decode(pcm)
+                except Exception as exc:
+                    logger.warning("Dropping undecodable Opus packet from %s: %r", websocket.client, exc)
+                    continue
+            await _ingest_audio(session=session, websocket=websocket, writer=writer, vad=vad, pcm=pcm)
+
+
+async def _report_queue_position(writer: ClientWriter, position: int) -> None:
+    await writer.send_json(
+        {
+            "type": "status",
+            "message": f"当前练习人数较多，正在排队（第 {position} 位）…",
+            "queue_position": position,
+        }
+    )
 
 
 @app.websocket("/ws/conversation")
 async def websocket_conversation(websocket: WebSocket) -> None:
     await websocket.accept()
+    accepted_at = time.monotonic()
     tts_client: TTSClient = app.state.tts_client
-    await websocket.send_json({"type": "status", "message": "connected"})
+    writer = ClientWriter(
+        websocket,
+        coalesce_window=WS_COALESCE_MS / 1000,
+        max_items=WS_SEND_QUEUE_MAX,
+        max_bytes=WS_SEND_QUEUE_BYTES,
+        send_timeout=WS_SEND_TIMEOUT_S,
+    )
+    writer.start()
+    await writer.send_json({"type": "status", "message": "connected"})
     if tts_client.enabled:
-        await websocket.send_json({"type": "status", "message": "voice-enabled"})
+        await writer.send_json({"type": "status", "message": "voice-enabled"})
     else:
-        await websocket.send_json({"type": "status", "message": "voice-disabled"})
+        await writer.send_json({"type": "status", "message": "voice-disabled"})
 
+    record, resumed = await _open_record(
+        websocket.query_params.get("session"), websocket.query_params.get("learner")
+    )
+    # Stall reports and session-grouped profiles name this conversation from here on.
+    bind_session(record.session_id, writer.task)
+    timings = TurnTimings(max_turns=TURN_TIMINGS_KEEP)
+    app.state.turn_timings[record.session_id] = timings
+    await writer.send_json(
+        {"type": "session", "id": record.session_id, "resumed": resumed, "theme": record.theme, "scenario": record.scenario}
+    )
+    codec = negotiate_codec(websocket.query_params.get("codecs"), allowed=AUDIO_CODECS)
+    if codec is not None:
+        await writer.send_json({"type": "transport", "codec": codec})
+    downlink = AudioDownlink(
+        send_json=writer.send_json,
+        send_bytes=writer.send_bytes,
+        codec=codec,
+        mime_type=tts_client.audio_mime_type,
+        sample_rate=TTS_SAMPLE_RATE,
+        opus_bitrate=AUDIO_OPUS_BITRATE,
+    )
+    uplink = OpusUplinkDecoder(sample_rate=AUDIO_SAMPLE_RATE) if codec == OPUS else None
+    vad = None
+    vad_requested = websocket.query_params.get("vad", "").lower() in {"1", "true", "yes"}
+    if AUDIO_VAD in {"1", "true", "yes"} or (AUDIO_VAD == "client" and vad_requested):
+        vad = StreamingVAD(
+            sample_rate=AUDIO_SAMPLE_RATE,
+            hangover_ms=AUDIO_VAD_HANGOVER_MS,
+            pre_roll_ms=AUDIO_VAD_PRE_ROLL_MS,
+        )
+    gemini_pool: GeminiSessionPool = app.state.gemini_pool
+    admission: AdmissionController = app.state.admission
     try:
-        async with GeminiSession(
-            model=GEMINI_MODEL,
-            api_key=GOOGLE_API_KEY,
-            host=HOST,
-            proxy_url=HTTP_PROXY,
-        ) as session:
-            forward_gemini = asyncio.create_task(
-                _forward_gemini_events(session=session, websocket=websocket, tts_client=tts_client)
-            )
-            forward_client = asyncio.create_task(
-                _forward_client_messages(session=session, websocket=websocket)
-            )
-            done, pending = await asyncio.wait(
-                {forward_gemini, forward_client}, return_when=asyncio.FIRST_EXCEPTION
-            )
-            for task in pending:
-                task.cancel()
-                with suppress(asyncio.CancelledError):
-                    await task
-            for task in done:
-                if task.exception():
-                    raise task.exception()
+        lease = await admission.acquire_session(
+            on_position=lambda position: _report_queue_position(writer, position)
+        )
+        try:
+            session = await gemini_pool.acquire(lease.api_key)
+            session.audio_limiter = lease.throttle_audio
+            app.state.active_sessions.add(session)
+            ACTIVE_SESSIONS.inc()
+            session.theme, session.scenario = record.theme, record.scenario
+            try:
+                if resumed and record.transcript:
+                    logger.info(
+                        "Resuming conversation %s with %d turns", record.session_id, len(record.transcript)
+                    )
+                    await session.add_context(record.transcript)
+                forward_gemini = asyncio.create_task(
+                    _forward_gemini_events(
+                        session=session,
+                        websocket=websocket,
+                        writer=writer,
+                        tts_client=tts_client,
+                        downlink=downlink,
+                        accepted_at=accepted_at,
+                        record=record,
+                        timings=timings,
+                    )
+                )
+                forward_client = asyncio.create_task(
+                    _forward_client_messages(
+                        session=session,
+                        websocket=websocket,
+                        writer=writer,
+                        downlink=downlink,
+                        uplink=uplink,
+                        vad=vad,
+                        record=record,
+                    )
+                )
+                done, pending = await asyncio.wait(
+                    {forward_gemini, forward_client}, return_when=asyncio.FIRST_EXCEPTION
+                )
+                for task in pending:
+                    task.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await task
+                for task in done:
+                    if task.exception():
+                        raise task.exception()
+            finally:
+                ACTIVE_SESSIONS.dec()
+                app.state.active_sessions.discard(session)
+                await session.close()
+        finally:
+            lease.release()
     except WebSocketDisconnect:
         pass
+    except AdmissionRejected as exc:
+        logger.warning("Turning away %s: %s", websocket.client, exc)
+        with suppress(Exception):
+            await writer.send_json(
+                {"type": "status", "message": "当前练习人数已满，请稍后再试。", "busy": True}
+            )
+        await writer.close()
+        with suppress(Exception):
+            await websocket.close(code=1013, reason="server busy")
+    except SlowConsumerError:
+        await writer.close(drain_timeout=0)
+        with suppress(Exception):
+            await websocket.close(code=1013, reason="client too slow")
     except Exception as exc:  # pragma: no cover - runtime safety
+        await writer.close()
         with suppress(Exception):
             await websocket.send_json({"type": "error", "message": str(exc)})
         await websocket.close(code=1011, reason=str(exc))
+    finally:
+        await writer.close()
+        if app.state.turn_timings.get(record.session_id) is timings:
+            del app.state.turn_timings[record.session_id]
+        record.connected = False
+        await _save_record(record)
+
+
+def _require_admin(request: Request) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="admin endpoints disabled")
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.strip().encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=401, detail="admin token required", headers={"WWW-Authenticate": "Bearer"})
+
+
+def _turn_store_or_404() -> TurnStore:
+    turn_store: TurnStore | None = getattr(app.state, "turn_store", None)
+    if turn_store is None:
+        raise HTTPException(status_code=404, detail="turn log disabled")
+    return turn_store
+
+
+@app.get("/api/learners/{learner_id}/history")
+async def learner_history(
+    request: Request,
+    learner_id: str,
+    limit: int = 50,
+    before: float | None = None,
+    theme: str | None = None,
+    scenario: str | None = None,
+) -> JSONResponse:
+    # Learner IDs are chosen by the browser and prove nothing, so transcripts are operator-only.
+    _require_admin(request)
+    turns = await _turn_store_or_404().history(
+        learner_id, limit=limit, before=before, theme=theme, scenario=scenario
+    )
+    return JSONResponse({"learner_id": learner_id, "turns": turns})
+
+
+@app.get("/api/learners/{learner_id}/progress")
+async def learner_progress(request: Request, learner_id: str, days: int = 30) -> JSONResponse:
+    _require_admin(request)
+    return JSONResponse(await _turn_store_or_404().progress(learner_id, days=days))
+
+
+@app.post("/admin/profile")
+async def admin_profile(
+    request: Request,
+    seconds: float = 10.0,
+    interval_ms: float = 10.0,
+    idle: bool = False,
+    by_session: bool = False,
+) -> PlainTextResponse:
+    """Sample every thread's stack for ``seconds`` and return collapsed stacks (flamegraph.pl, speedscope)."""
+    _require_admin(request)
+    if not 0 < seconds <= PROFILE_MAX_SECONDS:
+        raise HTTPException(status_code=400, detail=f"seconds must be in (0, {PROFILE_MAX_SECONDS:g}]")
+    if not 1 <= interval_ms <= 1000:
+        raise HTTPException(status_code=400, detail="interval_ms must be in [1, 1000]")
+    profiler: SamplingProfiler = app.state.profiler
+    try:
+        stacks = await profiler.profile(seconds, interval=interval_ms / 1000, idle=idle, by_session=by_session)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=409, detail=str(exc)) from exc
+    return PlainTextResponse(stacks)
+
+
+@app.get("/admin/stalls")
+async def admin_stalls(request: Request) -> JSONResponse:
+    _require_admin(request)
+    loop_watchdog: LoopWatchdog = app.state.loop_watchdog
+    return JSONResponse({"threshold_ms": LOOP_STALL_MS, "stalls": loop_watchdog.recent()})
+
+
+@app.get("/admin/sessions")
+async def admin_sessions(request: Request) -> JSONResponse:
+    """Per-phase timings of each connected conversation's last ``TURN_TIMINGS_KEEP`` turns."""
+    _require_admin(request)
+    stalls: dict[str, list[float]] = {}
+    for stall in app.state.loop_watchdog.recent():
+        if stall["session"]:
+            stalls.setdefault(stall["session"], []).append(stall["blocked_ms"])
+    sessions = [
+        {"session_id": session_id, "recent_stalls_ms": stalls.get(session_id, []), "turns": timings.snapshot()}
+        for session_id, timings in list(app.state.turn_timings.items())
+    ]
+    return JSONResponse({"worker": os.getpid(), "sessions": sessions})
 
 
 @app.get("/health")
 async def healthcheck() -> JSONResponse:
-    return JSONResponse({"status": "ok"})
+    payload: dict[str, Any] = {"status": "ok", "warmed_up": getattr(app.state, "warmed_up", False)}
+    tts_client: TTSClient | None = getattr(app.state, "tts_client", None)
+    if tts_client:
+        payload["tts"] = tts_client.stats()
+    if tts_client and tts_client.cache:
+        payload["tts_cache"] = tts_client.cache.stats()
+    gemini_pool: GeminiSessionPool | None = getattr(app.state, "gemini_pool", None)
+    if gemini_pool:
+        payload["gemini_pool"] = gemini_pool.stats()
+    admission: AdmissionController | None = getattr(app.state, "admission", None)
+    if admission:
+        payload["admission"] = admission.stats()
+    if static_assets is not None:
+        payload["static_assets"] = static_assets.stats()
+    sentence_bank: SentenceBank | None = getattr(app.state, "sentence_bank", None)
+    if sentence_bank:
+        payload["sentence_bank"] = sentence_bank.stats()
+    turn_store: TurnStore | None = getattr(app.state, "turn_store", None)
+    if turn_store:
+        payload["turn_store"] = turn_store.stats()
+    session_registry: SessionRegistry | None = getattr(app.state, "session_registry", None)
+    if session_registry:
+        payload["worker"] = os.getpid()
+        payload["session_registry"] = await session_registry.stats()
+    return JSONResponse(payload)
+
+
+@app.get("/metrics")
+async def metrics() -> PlainTextResponse:
+    if not METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
-app.mount("/", StaticFiles(directory=frontend_dir, html=True), name="frontend")
+if static_assets is not None:
+    app.mount("/", static_assets, name="frontend")
+else:
+    app.mount("/", StaticFiles(directory=frontend_dir, html=True), name="frontend")
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SAMPLE_RATE = 16000
+FRAME_MS = 25
+HOP_MS = 10
+PITCH_WINDOW_MS = 40
+MIN_PITCH_HZ = 75.0
+MAX_PITCH_HZ = 400.0
+MAX_PITCH_FRAMES = 240
+PITCH_BLOCK_FRAMES = 256
+CLIP_LEVEL = 32000
+SILENCE_DBFS = -50.0
+VAD_MARGIN_DB = 10.0
+VAD_HANGOVER_FRAMES = 8
+MIN_PAUSE_MS = 300
+_EPS = 1e-10
+
+
+@dataclass
+class PronunciationBreakdown:
+    """Frame-level features of one learner turn (silence trimmed)."""
+
+    duration_s: float = 0.0
+    voiced_s: float = 0.0
+    voiced_ratio: float = 0.0
+    clipping_ratio: float = 0.0
+    rms_dbfs: float = SILENCE_DBFS
+    loudness_variation_db: float = 0.0
+    zcr: float = 0.0
+    pitch_hz: float | None = None
+    pitch_variation_semitones: float | None = None
+    speaking_rate_sps: float = 0.0
+    pause_count: int = 0
+    fluency_score: int = 0
+    intonation_score: int = 0
+    volume_score: int = 0
+
+    def to_dict(self) -> dict[str, float | int | None]:
+        return {key: (round(value, 3) if isinstance(value, float) else value) for key, value in asdict(self).items()}
+
+
+def _window_sums(cumulative: np.ndarray, starts: np.ndarray, width: int) -> np.ndarray:
+    # Window sums from one cumulative sum instead of materialising overlapping frames.
+    return cumulative[starts + width] - cumulative[starts]
+
+
+def _cumulative(values: np.ndarray, dtype: type = np.int64) -> np.ndarray:
+    # Integer prefix sums are exact however many turns share them.
+    cumulative = np.empty(values.size + 1, dtype=dtype)
+    cumulative[0] = 0
+    np.cumsum(values, dtype=dtype, out=cumulative[1:])
+    return cumulative
+
+
+def _voice_activity(frame_db: np.ndarray) -> np.ndarray:
+    noise_floor = float(np.percentile(frame_db, 10))
+    threshold = max(noise_floor + VAD_MARGIN_DB, SILENCE_DBFS)
+    active = frame_db > threshold
+    if not active.any():
+        return active
+    # Hangover: keep short gaps between words inside the voiced region.
+    kernel = np.ones(VAD_HANGOVER_FRAMES, dtype=np.int32)
+    return np.convolve(active.astype(np.int32), kernel, mode="same") > 0
+
+
+def _pitch_frame_starts(frame_starts: np.ndarray, size: int, window: int) -> np.ndarray:
+    """Frames of one turn whose pitch window fits in its ``size`` samples, thinned to ``MAX_PITCH_FRAMES``."""
+    frame_starts = frame_starts[frame_starts + window <= size]
+    if frame_starts.size > MAX_PITCH_FRAMES:
+        frame_starts = frame_starts[np.linspace(0, frame_starts.size - 1, MAX_PITCH_FRAMES).astype(np.int64)]
+    return frame_starts
+
+
+def _estimate_pitch(samples: np.ndarray, frame_starts: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Autocorrelation pitch (Hz) for frames starting at ``frame_starts``; NaN where unvoiced."""
+    window = int(sample_rate * PITCH_WINDOW_MS / 1000)
+    n_fft = 1 << (2 * window - 1).bit_length()
+    min_lag = int(sample_rate / MAX_PITCH_HZ)
+    max_lag = min(int(sample_rate / MIN_PITCH_HZ), window - 1)
+    pitch = np.empty(frame_starts.size)
+    if frame_starts.size == 0:
+        return pitch
+    windows = sliding_window_view(samples, window)
+    # Blocks keep each spectrum cache-sized however many turns are batched together.
+    for block in range(0, frame_starts.size, PITCH_BLOCK_FRAMES):
+        selected = frame_starts[block : block + PITCH_BLOCK_FRAMES]
+        # Strided window view; only the selected frames are gathered into a float copy.
+        frames = windows[selected].astype(np.float32)
+        frames -= frames.mean(axis=1, keepdims=True)
+        spectrum = np.fft.rfft(frames, n=n_fft, axis=1)
+        autocorr = np.fft.irfft(spectrum.real**2 + spectrum.imag**2, n=n_fft, axis=1)
+        region = autocorr[:, min_lag:max_lag]
+        best = region.argmax(axis=1)
+        peak = region[np.arange(region.shape[0]), best]
+        voiced = peak > 0.3 * (autocorr[:, 0] + _EPS)
+        pitch[block : block + selected.size] = np.where(voiced, sample_rate / (best + min_lag), np.nan)
+    return pitch
+
+
+def _count_syllables(frame_db: np.ndarray, voiced: np.ndarray) -> int:
+    """Approximate syllable nuclei as local maxima of the smoothed energy envelope."""
+    if frame_db.size < 3:
+        return 0
+    envelope = np.convolve(frame_db, np.ones(5) / 5, mode="same")
+    middle = envelope[1:-1]
+    peaks = (middle > envelope[:-2]) & (middle >= envelope[2:]) & voiced[1:-1]
+    floor = np.percentile(envelope[voiced], 30) if voiced.any() else SILENCE_DBFS
+    peaks &= middle > floor
+    return int(np.count_nonzero(peaks))
+
+
+def _count_pauses(span: np.ndarray, min_frames: int) -> int:
+    """Number of silent runs of at least ``min_frames`` inside a span that starts and ends voiced."""
+    edges = np.diff(span.astype(np.int8))
+    lengths = np.flatnonzero(edges == 1) - np.flatnonzero(edges == -1)
+    return int(np.count_nonzero(lengths >= min_frames))
+
+
+def analyze_pronunciation(samples: np.ndarray, sample_rate: int = SAMPLE_RATE) -> PronunciationBreakdown:
+    """Vectorized VAD, loudness, ZCR, pitch and speaking-rate analysis of int16 PCM."""
+    samples = np.asarray(samples, dtype=np.int16)
+    return analyze_pronunciation_batch(samples, [samples.size], sample_rate)[0]
+
+
+def analyze_pronunciation_batch(
+    samples: np.ndarray, lengths: Sequence[int], sample_rate: int = SAMPLE_RATE
+) -> list[PronunciationBreakdown]:
+    """:func:`analyze_pronunciation` for turns of ``lengths`` samples laid out back to back in ``samples``.
+
+    Frame energies, zero crossings, clipping counts, the per-turn loudness and
+    ZCR reductions (``np.add.reduceat`` over each turn's frames) and the pitch
+    autocorrelation are each one numpy call over the whole batch; only the VAD
+    threshold, syllable and pause counts loop over turns, on per-frame data.
+    """
+    samples = np.asarray(samples, dtype=np.int16)
+    lengths = np.asarray(lengths, dtype=np.int64)
+    breakdowns = [PronunciationBreakdown(duration_s=length / sample_rate) for length in lengths.tolist()]
+    frame_len = int(sample_rate * FRAME_MS / 1000)
+    hop = int(sample_rate * HOP_MS / 1000)
+    window = int(sample_rate * PITCH_WINDOW_MS / 1000)
+    n_frames = np.where(lengths >= frame_len, 1 + (lengths - frame_len) // hop, 0)
+    total_frames = int(n_frames.sum())
+    if total_frames == 0:
+        return breakdowns
+
+    # Global frame index -> turn, and the frame's first sample in ``samples``.
+    offsets = np.concatenate(([0], np.cumsum(lengths)))
+    frame_offsets = np.concatenate(([0], np.cumsum(n_frames)))
+    turn_of_frame = np.repeat(np.arange(lengths.size), n_frames)
+    starts = offsets[turn_of_frame] + (np.arange(total_frames) - frame_offsets[turn_of_frame]) * hop
+
+    # int16 squares fit int32; only their running total needs 64 bits.
+    squares = _cumulative(np.square(samples, dtype=np.int32))
+    energy = _window_sums(squares, starts, frame_len).astype(np.float64)
+    frame_db = 10.0 * np.log10(energy / frame_len / (32768.0**2) + _EPS)
+    negative = np.signbit(samples)
+    # A frame never spans two turns, so the crossing between them is never counted.
+    crossings = _window_sums(_cumulative(negative[1:] != negative[:-1], np.int32), starts, frame_len - 1)
+    clipped = _cumulative(np.abs(samples, dtype=np.int32) >= CLIP_LEVEL, np.int32)
+
+    voiced = np.zeros(total_frames, dtype=bool)
+    pitch_starts: list[np.ndarray] = []
+    for index in np.flatnonzero(n_frames).tolist():
+        span = slice(frame_offsets[index], frame_offsets[index + 1])
+        turn_voiced = _voice_activity(frame_db[span])
+        voiced[span] = turn_voiced
+        local_starts = _pitch_frame_starts(np.flatnonzero(turn_voiced) * hop, int(lengths[index]), window)
+        pitch_starts.append(offsets[index] + local_starts)
+
+    segments = frame_offsets[:-1][n_frames > 0]
+    voiced_frames = np.zeros(lengths.size, dtype=np.int64)
+    voiced_frames[n_frames > 0] = np.add.reduceat(voiced.astype(np.int64), segments)
+    db_sums = np.zeros(lengths.size)
+    db_sums[n_frames > 0] = np.add.reduceat(np.where(voiced, frame_db, 0.0), segments)
+    mean_db = db_sums / np.maximum(voiced_frames, 1)
+    deviation = np.where(voiced, frame_db - mean_db[turn_of_frame], 0.0)
+    db_spread = np.zeros(lengths.size)
+    db_spread[n_frames > 0] = np.add.reduceat(np.square(deviation), segments)
+    crossing_sums = np.zeros(lengths.size, dtype=np.int64)
+    crossing_sums[n_frames > 0] = np.add.reduceat(np.where(voiced, crossings, 0), segments)
+
+    pitch_counts = [part.size for part in pitch_starts]
+    pitch_all = _estimate_pitch(samples, np.concatenate(pitch_starts), sample_rate)
+    turn_pitches = iter(np.split(pitch_all, np.cumsum(pitch_counts)[:-1]))
+
+    for index in np.flatnonzero(n_frames).tolist():
+        pitch = next(turn_pitches)
+        count = int(voiced_frames[index])
+        if not count:
+            continue
+        breakdown = breakdowns[index]
+        span = slice(frame_offsets[index], frame_offsets[index + 1])
+        turn_voiced, turn_db = voiced[span], frame_db[span]
+        first, last = np.flatnonzero(turn_voiced)[[0, -1]]
+
+        breakdown.voiced_s = count * hop / sample_rate
+        breakdown.voiced_ratio = breakdown.voiced_s / max(breakdown.duration_s, _EPS)
+        start_sample = int(offsets[index] + first * hop)
+        end_sample = int(offsets[index] + last * hop + frame_len)
+        breakdown.clipping_ratio = int(clipped[end_sample] - clipped[start_sample]) / (end_sample - start_sample)
+        breakdown.rms_dbfs = float(mean_db[index])
+        breakdown.loudness_variation_db = float(np.sqrt(db_spread[index] / count))
+        breakdown.zcr = float(crossing_sums[index]) / count / (frame_len - 1)
+
+        pitch = pitch[~np.isnan(pitch)]
+        if pitch.size >= 3:
+            breakdown.pitch_hz = float(np.median(pitch))
+            breakdown.pitch_variation_semitones = float(np.std(12.0 * np.log2(pitch / breakdown.pitch_hz)))
+
+        breakdown.pause_count = _count_pauses(turn_voiced[first : last + 1], int(MIN_PAUSE_MS / HOP_MS))
+        breakdown.speaking_rate_sps = _count_syllables(turn_db, turn_voiced) / max(breakdown.voiced_s, _EPS)
+
+        breakdown.fluency_score = _band_score(breakdown.speaking_rate_sps, 3.0, 5.5, 1.5) - min(
+            30, 5 * breakdown.pause_count
+        )
+        breakdown.intonation_score = (
+            _band_score(breakdown.pitch_variation_semitones, 1.5, 5.0, 1.0)
+            if breakdown.pitch_variation_semitones is not None
+            else 0
+        )
+        breakdown.volume_score = _band_score(breakdown.rms_dbfs, -30.0, -12.0, 10.0) - int(
+            breakdown.clipping_ratio * 500
+        )
+        breakdown.fluency_score = max(0, breakdown.fluency_score)
+        breakdown.volume_score = max(0, breakdown.volume_score)
+    return breakdowns
+
+
+def _band_score(value: float, low: float, high: float, falloff: float) -> int:
+    """100 inside ``[low, high]``, decreasing linearly to 0 over ``falloff`` units outside."""
+    if low <= value <= high:
+        return 100
+    distance = low - value if value < low else value - high
+    return int(max(0.0, 100.0 * (1.0 - distance / falloff)))
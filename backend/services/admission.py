@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, Optional, Sequence
+
+from .metrics import ADMISSION_REJECTED, ADMISSION_WAIT_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(RuntimeError):
+    """No upstream capacity within the queue limits; the client should retry later."""
+
+
+class TokenBucket:
+    """Classic token bucket; a ``rate`` of zero or less means unlimited."""
+
+    def __init__(self, *, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.rate <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self, amount: float = 1.0) -> float:
+        """Seconds until ``amount`` tokens are available (0 if they are now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        missing = min(amount, self.burst) - self._tokens
+        return max(0.0, missing / self.rate)
+
+    def take(self, amount: float = 1.0) -> None:
+        if self.unlimited:
+            return
+        self._refill()
+        self._tokens -= amount
+
+    async def wait(self, amount: float) -> None:
+        """Take ``amount`` tokens, sleeping while the bucket refills."""
+        delay = self.delay(amount)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.delay(amount)
+        self.take(amount)
+
+
+@dataclass
+class ApiKeyState:
+    """Quota bookkeeping for one upstream API key."""
+
+    api_key: str
+    sessions: TokenBucket
+    audio: TokenBucket
+    tts: TokenBucket
+    active_sessions: int = 0
+    tts_in_flight: int = 0
+
+    @property
+    def label(self) -> str:
+        # Enough to tell keys apart in /health without exposing them.
+        return f"…{self.api_key[-4:]}"
+
+
+class SessionLease:
+    """One admitted conversation; holds a session slot on ``api_key`` until released."""
+
+    def __init__(self, controller: "AdmissionController", key: ApiKeyState) -> None:
+        self._controller = controller
+        self._key = key
+        self._released = False
+
+    @property
+    def api_key(self) -> str:
+        return self._key.api_key
+
+    async def throttle_audio(self, nbytes: int) -> None:
+        await self._key.audio.wait(nbytes)
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self._key)
+
+
+class AdmissionController:
+    """Per-API-key limits on conversations, upstream audio and TTS requests.
+
+    A new conversation is admitted on the least-loaded key that has a free
+    session slot (``max_sessions`` concurrent) and a token in its session
+    bucket (``sessions_per_minute``).  When no key can take it, the client
+    waits in a single FIFO queue (so nobody is overtaken) and is told its
+    position; past ``max_waiting`` waiters or ``queue_timeout`` seconds it is
+    rejected with :class:`AdmissionRejected`.  Audio and TTS buckets pace
+    work on an admitted key instead of rejecting it.
+    """
+
+    def __init__(
+        self,
+        api_keys: Sequence[str],
+        *,
+        max_sessions: int = 50,
+        sessions_per_minute: float = 60.0,
+        audio_bytes_per_second: float = 0.0,
+        tts_per_minute: float = 0.0,
+        max_waiting: int = 100,
+        queue_timeout: float = 120.0,
+        position_interval: float = 1.0,
+    ) -> None:
+        if not api_keys:
+            raise ValueError("At least one API key is required")
+        self._keys = [
+            ApiKeyState(
+                api_key=api_key,
+                sessions=TokenBucket(rate=sessions_per_minute / 60, burst=max(1.0, sessions_per_minute)),
+                # One second of audio may go out in a burst.
+                audio=TokenBucket(rate=audio_bytes_per_second, burst=audio_bytes_per_second),
+                tts=TokenBucket(rate=tts_per_minute / 60, burst=max(1.0, tts_per_minute / 6)),
+            )
+            for api_key in dict.fromkeys(api_keys)
+        ]
+        self._max_sessions = max_sessions
+        self._max_waiting = max_waiting
+        self._queue_timeout = queue_timeout
+        self._position_interval = position_interval
+        self._waiters: deque[asyncio.Future[SessionLease]] = deque()
+        self._retry: asyncio.TimerHandle | None = None
+        self.admitted = 0
+        self.queued = 0
+
+    @property
+    def api_keys(self) -> list[str]:
+        return [key.api_key for key in self._keys]
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "max_sessions_per_key": self._max_sessions,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": ADMISSION_REJECTED.value,
+            "keys": [
+                {"key": key.label, "sessions": key.active_sessions, "tts_in_flight": key.tts_in_flight}
+                for key in self._keys
+            ],
+        }
+
+    def least_loaded_key(self) -> str:
+        """Key for work that is not admitted per conversation (e.g. pre-warmed sessions)."""
+        return min(self._keys, key=lambda key: key.active_sessions).api_key
+
+    async def acquire_session(
+        self, *, on_position: Optional[Callable[[int], Awaitable[None]]] = None
+    ) -> SessionLease:
+        if not self._waiters:
+            key, _ = self._pick_session_key()
+            if key is not None:
+                return self._grant(key)
+        if len(self._waiters) >= self._max_waiting:
+            ADMISSION_REJECTED.inc()
+            raise AdmissionRejected(f"{len(self._waiters)} conversations are already waiting")
+        waiter: asyncio.Future[SessionLease] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        self._dispatch()
+        queued_at = time.monotonic()
+        last_position = 0
+        try:
+            while True:
+                position = self._position(waiter)
+                if on_position is not None and position and position != last_position:
+                    last_position = position
+                    await on_position(position)
+                remaining = self._queue_timeout - (time.monotonic() - queued_at)
+                if remaining <= 0:
+                    ADMISSION_REJECTED.inc()
+                    raise AdmissionRejected(f"no upstream capacity after {self._queue_timeout:.0f}s in the queue")
+                try:
+                    lease = await asyncio.wait_for(
+                        asyncio.shield(waiter), min(self._position_interval, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    continue
+                ADMISSION_WAIT_SECONDS.observe(time.monotonic() - queued_at)
+                return lease
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as we gave up; hand the slot to the next in line.
+                waiter.result().release()
+            else:
+                waiter.cancel()
+                self._remove(waiter)
+            raise
+
+    @asynccontextmanager
+    async def tts_slot(self) -> AsyncIterator[str]:
+        """Yield the least-loaded key with TTS budget, waiting for the earliest refill if none has any."""
+        while True:
+            delays = [(key.tts.delay(), key.tts_in_flight, index) for index, key in enumerate(self._keys)]
+            delay, _, index = min(delays)
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        key = self._keys[index]
+        key.tts.take()
+        key.tts_in_flight += 1
+        try:
+            yield key.api_key
+        finally:
+            key.tts_in_flight -= 1
+
+    def _position(self, waiter: asyncio.Future[SessionLease]) -> int:
+        try:
+            return self._waiters.index(waiter) + 1
+        except ValueError:
+            return 0
+
+    def _remove(self, waiter: asyncio.Future[SessionLease]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._dispatch()
+
+    def _pick_session_key(self) -> tuple[ApiKeyState | None, float]:
+        """Least-loaded key that can start a session now, else the shortest bucket wait (inf if all are full)."""
+        best: ApiKeyState | None = None
+        retry = float("inf")
+        for key in self._keys:
+            if self._max_sessions > 0 and key.active_sessions >= self._max_sessions:
+                continue
+            delay = key.sessions.delay()
+            if delay > 0:
+                retry = min(retry, delay)
+                continue
+            if best is None or key.active_sessions < best.active_sessions:
+                best = key
+        return best, retry
+
+    def _grant(self, key: ApiKeyState) -> SessionLease:
+        key.sessions.take()
+        key.active_sessions += 1
+        self.admitted += 1
+        return SessionLease(self, key)
+
+    def _release(self, key: ApiKeyState) -> None:
+        key.active_sessions -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            waiter = self._waiters[0]
+            if waiter.done():
+                self._waiters.popleft()
+                continue
+            key, retry = self._pick_session_key()
+            if key is None:
+                if retry != float("inf") and self._retry is None:
+                    # Only a rate limit is in the way; try again when it refills.
+                    self._retry = asyncio.get_running_loop().call_later(retry, self._retry_dispatch)
+                return
+            self._waiters.popleft()
+            waiter.set_result(self._grant(key))
+
+    def _retry_dispatch(self) -> None:
+        self._retry = None
+        self._dispatch()
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AudioFeatures:
+    """Running signal statistics for every sample appended during a turn."""
+
+    samples: int = 0
+    abs_sum: int = 0
+    zero_crossings: int = 0
+
+    @property
+    def mean_abs(self) -> float:
+        return self.abs_sum / self.samples if self.samples else 0.0
+
+
+class PcmRingBuffer:
+    """Fixed-capacity int16 ring buffer that keeps the most recent audio of a turn.
+
+    Appending only copies the chunk into the ring.  Energy and zero-crossing
+    accumulators are folded in lazily, in one pass over the samples not yet
+    counted, when :meth:`features` is called or just before the ring would
+    overwrite them, so turn-level features cover everything the learner said
+    while memory is capped at ``max_samples`` samples.
+    """
+
+    def __init__(self, *, max_samples: int) -> None:
+        if max_samples <= 0:
+            raise ValueError("max_samples must be positive")
+        self._capacity = max_samples
+        self._data: np.ndarray | None = None
+        # Byte view of ``_data``: copying a chunk in through it skips a numpy array per append.
+        self._bytes: memoryview | None = None
+        self._write = 0
+        self._size = 0
+        self._carry = b""
+        self._samples = 0
+        # Most recent retained samples not yet folded into the accumulators.
+        self._unscanned = 0
+        self._abs_sum = 0
+        self._zero_crossings = 0
+        self._last_negative: bool | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def nbytes(self) -> int:
+        return self._size * 2
+
+    def append(self, pcm: bytes | bytearray | memoryview) -> None:
+        if self._carry:
+            pcm = self._carry + bytes(pcm)
+            self._carry = b""
+        if len(pcm) % 2:
+            self._carry = bytes(pcm[-1:])
+            pcm = pcm[:-1]
+        if not len(pcm):
+            return
+        count = len(pcm) // 2
+        self._samples += count
+        if count >= self._capacity:
+            self._scan_unscanned()
+            self._accumulate(np.frombuffer(pcm, dtype=np.int16, count=count - self._capacity))
+            self._unscanned = self._capacity
+        else:
+            if self._unscanned + count > self._capacity:
+                self._scan_unscanned()
+            self._unscanned += count
+        self._store(pcm, count)
+
+    def features(self) -> AudioFeatures:
+        self._scan_unscanned()
+        return AudioFeatures(
+            samples=self._samples,
+            abs_sum=self._abs_sum,
+            zero_crossings=self._zero_crossings,
+        )
+
+    def snapshot(self) -> np.ndarray:
+        """Copy of the retained samples in chronological order."""
+        if self._data is None or not self._size:
+            return np.empty(0, dtype=np.int16)
+        start = (self._write - self._size) % self._capacity
+        if start + self._size <= self._capacity:
+            return self._data[start : start + self._size].copy()
+        return np.concatenate((self._data[start:], self._data[: self._write]))
+
+    def clear(self) -> None:
+        self._write = 0
+        self._size = 0
+        self._carry = b""
+        self._samples = 0
+        self._unscanned = 0
+        self._abs_sum = 0
+        self._zero_crossings = 0
+        self._last_negative = None
+
+    def release_storage(self) -> None:
+        """Free the backing array while the buffer is empty; it is reallocated on the next append."""
+        if self._size == 0:
+            self._data = None
+            self._bytes = None
+
+    def _scan_unscanned(self) -> None:
+        if not self._unscanned:
+            return
+        start = (self._write - self._unscanned) % self._capacity
+        if start < self._write:
+            self._accumulate(self._data[start : self._write])
+        else:
+            self._accumulate(self._data[start:])
+            self._accumulate(self._data[: self._write])
+        self._unscanned = 0
+
+    def _accumulate(self, chunk: np.ndarray) -> None:
+        if not chunk.size:
+            return
+        self._abs_sum += int(np.abs(chunk, dtype=np.int32).sum())
+        negative = np.signbit(chunk)
+        self._zero_crossings += int(np.count_nonzero(negative[1:] != negative[:-1]))
+        first_negative = bool(negative[0])
+        if self._last_negative is not None and self._last_negative != first_negative:
+            self._zero_crossings += 1
+        self._last_negative = bool(negative[-1])
+
+    def _store(self, pcm: bytes | bytearray | memoryview, count: int) -> None:
+        if self._data is None:
+            self._data = np.empty(self._capacity, dtype=np.int16)
+            self._bytes = memoryview(self._data).cast("B")
+        view = self._bytes
+        capacity = self._capacity
+        if count >= capacity:
+            view[:] = pcm[(count - capacity) * 2 :]
+            self._write = 0
+            self._size = capacity
+            return
+        start = self._write * 2
+        end = self._write + count
+        if end <= capacity:
+            view[start : end * 2] = pcm
+        else:
+            split = (capacity - self._write) * 2
+            view[start:] = pcm[:split]
+            view[: (end - capacity) * 2] = pcm[split:]
+        self._write = end % capacity
+        self._size = min(capacity, self._size + count)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Optional
+
+from .metrics import AUDIO_SEND_QUEUE_BYTES
+
+
+logger = logging.getLogger(__name__)
+
+SendPcm = Callable[[bytes], Awaitable[None]]
+
+
+@dataclass
+class AudioSendStats:
+    chunks_in: int = 0
+    frames_out: int = 0
+    bytes_out: int = 0
+    dropped_bytes: int = 0
+    max_pending_bytes: int = 0
+
+
+class AudioSendQueue:
+    """Coalesces small PCM chunks into larger upstream frames sent from one task.
+
+    ``submit`` never awaits the upstream socket: chunks are appended to a pending
+    buffer that is flushed once it reaches ``frame_bytes`` or has waited
+    ``max_latency`` seconds.  While the socket is slow, everything pending is
+    merged into the next frame (up to ``max_frame_bytes``) and the oldest audio is
+    dropped once ``max_pending_bytes`` is exceeded, so memory stays bounded.
+    """
+
+    def __init__(
+        self,
+        *,
+        send_pcm: SendPcm,
+        frame_bytes: int,
+        max_latency: float,
+        max_pending_bytes: int,
+        max_frame_bytes: int | None = None,
+    ) -> None:
+        self._send_pcm = send_pcm
+        self._frame_bytes = max(2, frame_bytes - frame_bytes % 2)
+        self._max_latency = max_latency
+        self._max_pending_bytes = max(self._frame_bytes, max_pending_bytes)
+        self._max_frame_bytes = max(self._frame_bytes, max_frame_bytes or self._frame_bytes * 4)
+        self._pending = bytearray()
+        self._pending_since: Optional[float] = None
+        self._wake = asyncio.Event()
+        self._send_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._error: BaseException | None = None
+        self._overflowing = False
+        self._stats = AudioSendStats()
+
+    @property
+    def pending_bytes(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> dict[str, int]:
+        return asdict(self._stats)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="gemini_audio_sender")
+
+    async def close(self) -> None:
+        task = self._task
+        self._task = None
+        if task is None:
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    def submit(self, pcm: bytes | bytearray | memoryview) -> None:
+        if self._error is not None:
+            raise RuntimeError("Gemini audio sender failed") from self._error
+        self._stats.chunks_in += 1
+        starts_batch = not self._pending
+        if starts_batch:
+            self._pending_since = asyncio.get_running_loop().time()
+        self._pending.extend(pcm)
+        overflow = len(self._pending) - self._max_pending_bytes
+        if overflow > 0:
+            # Keep sample alignment when trimming the oldest audio.
+            overflow += overflow % 2
+            del self._pending[:overflow]
+            self._stats.dropped_bytes += overflow
+            if not self._overflowing:
+                self._overflowing = True
+                logger.warning("Gemini audio sender is falling behind; dropping oldest audio")
+        if len(self._pending) > self._stats.max_pending_bytes:
+            self._stats.max_pending_bytes = len(self._pending)
+        # Wake the sender to start the latency timer, or to send a full frame.
+        if starts_batch or len(self._pending) >= self._frame_bytes:
+            self._wake.set()
+
+    async def flush(self) -> None:
+        """Send everything that is pending, e.g. before marking the end of a turn."""
+        async with self._send_lock:
+            while self._pending:
+                await self._send_next()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                if not self._pending:
+                    self._wake.clear()
+                    await self._wake.wait()
+                    continue
+                if len(self._pending) < self._frame_bytes and self._pending_since is not None:
+                    remaining = self._pending_since + self._max_latency - loop.time()
+                    if remaining > 0:
+                        self._wake.clear()
+                        with suppress(asyncio.TimeoutError):
+                            await asyncio.wait_for(self._wake.wait(), remaining)
+                        continue
+                async with self._send_lock:
+                    if self._pending:
+                        await self._send_next()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._error = exc
+            logger.warning("Gemini audio sender stopped: %s", exc)
+
+    async def _send_next(self) -> None:
+        size = min(len(self._pending), self._max_frame_bytes)
+        frame = bytes(self._pending[:size])
+        del self._pending[:size]
+        if self._pending:
+            self._pending_since = asyncio.get_running_loop().time()
+        else:
+            self._pending_since = None
+            self._overflowing = False
+        await self._send_pcm(frame)
+        self._stats.frames_out += 1
+        self._stats.bytes_out += size
+        AUDIO_SEND_QUEUE_BYTES.observe(len(self._pending))
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import base64
+import logging
+import struct
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+PCM16 = "pcm16"
+OPUS = "opus"
+CODEC_IDS = {PCM16: 0, OPUS: 1}
+
+# Binary downlink frame: kind, codec, seq, turn, sample rate, then the payload.
+# Opus payloads are a run of packets, each prefixed with its uint16 length.
+AUDIO_FRAME_HEADER = struct.Struct("<BBHII")
+FRAME_KIND_TTS = 1
+
+OPUS_FRAME_MS = 20
+
+SendJson = Callable[[dict[str, Any]], Awaitable[None]]
+SendBytes = Callable[[bytes], Awaitable[None]]
+
+
+@lru_cache(maxsize=None)
+def _av() -> Any:
+    """PyAV, imported on first use; it is optional and bundles libopus."""
+    try:
+        import av
+    except ImportError:  # pragma: no cover - depends on the deployment
+        return None
+    return av
+
+
+def opus_available() -> bool:
+    av = _av()
+    return av is not None and "libopus" in av.codecs_available
+
+
+def negotiate_codec(offer: Optional[str], *, allowed: Iterable[str]) -> Optional[str]:
+    """First codec in the client's ``?codecs=`` offer that the server allows and supports.
+
+    ``None`` means the original JSON/base64 messages: the client did not ask
+    for the binary transport, or nothing it offered is usable and the server
+    does not allow the PCM16 fallback either.
+    """
+    if not offer:
+        return None
+    allowed = set(allowed)
+    for codec in (item.strip().lower() for item in offer.split(",")):
+        if codec not in allowed:
+            continue
+        if codec == OPUS and not opus_available():
+            continue
+        if codec in CODEC_IDS:
+            return codec
+    return PCM16 if PCM16 in allowed else None
+
+
+class OpusUplinkDecoder:
+    """Turns the browser's Opus packets (one per websocket frame) back into 16-bit PCM."""
+
+    def __init__(self, *, sample_rate: int) -> None:
+        av = _av()
+        self._decoder = av.CodecContext.create("opus", "r")
+        self._decoder.sample_rate = 48000
+        self._decoder.layout = "mono"
+        self._resampler = av.AudioResampler(format="s16", layout="mono", rate=sample_rate)
+        self._packet = av.Packet
+
+    def decode(self, packet: bytes) -> bytes:
+        chunks: list[bytes] = []
+        for frame in self._decoder.decode(self._packet(packet)):
+            for resampled in self._resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().tobytes())
+        return b"".join(chunks)
+
+
+def encode_opus(pcm: bytes, *, sample_rate: int, bitrate: int) -> bytes:
+    """Encode a complete clip of 16-bit mono PCM as length-prefixed Opus packets."""
+    av = _av()
+    encoder = av.CodecContext.create("libopus", "w")
+    encoder.sample_rate = sample_rate
+    encoder.layout = "mono"
+    encoder.format = "s16"
+    encoder.bit_rate = bitrate
+    encoder.options = {"application": "voip", "frame_duration": str(OPUS_FRAME_MS)}
+    samples = np.frombuffer(pcm[: len(pcm) // 2 * 2], dtype="<i2")
+    frame = av.AudioFrame.from_ndarray(samples.reshape(1, -1), format="s16", layout="mono")
+    frame.sample_rate = sample_rate
+    frame.pts = 0
+    packets = [*encoder.encode(frame), *encoder.encode(None)]
+    return b"".join(struct.pack("<H", packet.size) + bytes(packet) for packet in packets)
+
+
+class AudioDownlink:
+    """Sends one connection's TTS audio in the format negotiated at connect time.
+
+    With no codec negotiated audio goes out as the original ``audio-chunk``
+    JSON message with base64 PCM; otherwise each chunk is one binary websocket
+    frame (``AUDIO_FRAME_HEADER`` + PCM or Opus), skipping the base64 overhead.
+    """
+
+    def __init__(
+        self,
+        *,
+        send_json: SendJson,
+        send_bytes: SendBytes,
+        codec: Optional[str],
+        mime_type: str,
+        sample_rate: int,
+        opus_bitrate: int = 24000,
+    ) -> None:
+        self._send_json = send_json
+        self._send_bytes = send_bytes
+        self._codec = codec
+        self._mime_type = mime_type
+        self._sample_rate = sample_rate
+        self._opus_bitrate = opus_bitrate
+        self._next_turn = 0
+        self.bytes_sent = 0
+
+    @property
+    def codec(self) -> Optional[str]:
+        return self._codec
+
+    def next_turn(self) -> int:
+        """Id for the next tutor turn's audio; live replies and banked sentences share one sequence."""
+        turn, self._next_turn = self._next_turn, (self._next_turn + 1) & 0xFFFFFFFF
+        return turn
+
+    async def send(self, audio: bytes, *, turn: int = 0, seq: int = 0, text: str = "") -> None:
+        if self._codec is None:
+            payload = base64.b64encode(audio).decode()
+            self.bytes_sent += len(payload)
+            await self._send_json(
+                {
+                    "type": "audio-chunk",
+                    "turn": turn,
+                    "seq": seq,
+                    "text": text,
+                    "mime_type": self._mime_type,
+                    "audio": payload,
+                }
+            )
+            return
+        if self._codec == OPUS:
+            # A long clip takes a few milliseconds to encode; keep it off the event loop.
+            audio = await asyncio.to_thread(
+                encode_opus, audio, sample_rate=self._sample_rate, bitrate=self._opus_bitrate
+            )
+        header = AUDIO_FRAME_HEADER.pack(FRAME_KIND_TTS, CODEC_IDS[self._codec], seq & 0xFFFF, turn, self._sample_rate)
+        self.bytes_sent += len(header) + len(audio)
+        await self._send_bytes(header + audio)
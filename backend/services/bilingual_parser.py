@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+
+SEPARATOR = "---"
+PAUSE_PHRASE = "can i have a break"
+RESUME_PHRASE = "ok let's continue"
+
+# Only this much earlier text is kept for matches that straddle deltas.
+_WINDOW_CHARS = 48
+# "score is 86", "Score: 78", "评分 86 分", "86/100"; a number at the very end of
+# the text so far is not taken until the next character shows it is complete.
+_SCORE_RE = re.compile(r"(?:score|评分|得分|分数)\D{0,24}?(\d{1,3})(?=\D)|(?<!\d)(\d{1,3})\s*(?:/\s*100|分(?!钟))")
+
+
+@dataclass
+class ParsedEvent:
+    """One piece of a tutor reply, known as soon as the stream has shown enough of it.
+
+    ``type`` is ``english-delta``, ``separator``, ``chinese-delta``, ``score``,
+    ``pause`` or ``resume``.
+    """
+
+    type: str
+    text: Optional[str] = None
+    score: Optional[int] = None
+
+
+class BilingualStreamParser:
+    """Incremental parser for ``English\\n---\\n中文`` tutor replies.
+
+    ``feed`` looks only at the new delta plus a few held-back characters, so
+    each delta costs time proportional to its own length however long the
+    reply gets.  Call ``finish`` at ``turnComplete`` and reuse the parser for
+    the next turn.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._in_chinese = False
+        # Trailing "-" characters that may be the start of a separator.
+        self._held = ""
+        self._english: list[str] = []
+        self._chinese: list[str] = []
+        self._window = ""
+        self._strip_newline = False
+        self.score: Optional[int] = None
+        self.pause = False
+        self.resume = False
+
+    @property
+    def english(self) -> str:
+        return "".join(self._english).strip()
+
+    @property
+    def chinese(self) -> str:
+        return "".join(self._chinese).strip()
+
+    def feed(self, delta: str) -> list[ParsedEvent]:
+        if not delta:
+            return []
+        events = self._split(delta)
+        self._detect(delta, events)
+        return events
+
+    def finish(self) -> list[ParsedEvent]:
+        """Flush held-back text; the accumulated ``english``/``chinese``/``score`` stay readable until ``reset``."""
+        events: list[ParsedEvent] = []
+        if self._held:
+            self._emit(self._held, events)
+            self._held = ""
+        if self.score is None:
+            # Lets a score that ends the reply satisfy the lookahead.
+            self._detect("\n", events)
+        return events
+
+    def _split(self, delta: str) -> list[ParsedEvent]:
+        events: list[ParsedEvent] = []
+        if self._in_chinese:
+            self._emit(delta, events)
+            return events
+        text = self._held + delta
+        self._held = ""
+        separator_at = text.find(SEPARATOR)
+        if separator_at != -1:
+            self._emit(text[:separator_at], events)
+            self._in_chinese = True
+            self._strip_newline = True
+            events.append(ParsedEvent(type="separator"))
+            rest = text[separator_at + len(SEPARATOR) :].lstrip("-")
+            self._emit(rest, events)
+            return events
+        keep = len(text) - len(text.rstrip("-"))
+        if keep:
+            keep = min(keep, len(SEPARATOR) - 1)
+            text, self._held = text[:-keep], text[-keep:]
+        self._emit(text, events)
+        return events
+
+    def _emit(self, text: str, events: list[ParsedEvent]) -> None:
+        if self._in_chinese and self._strip_newline:
+            text = text.lstrip()
+            if text:
+                self._strip_newline = False
+        if not text:
+            return
+        if self._in_chinese:
+            self._chinese.append(text)
+            events.append(ParsedEvent(type="chinese-delta", text=text))
+        else:
+            self._english.append(text)
+            events.append(ParsedEvent(type="english-delta", text=text))
+
+    def _detect(self, delta: str, events: list[ParsedEvent]) -> None:
+        window = self._window + delta.lower().replace("’", "'")
+        if self.score is None:
+            for match in _SCORE_RE.finditer(window):
+                value = int(match.group(1) or match.group(2))
+                if 0 <= value <= 100:
+                    self.score = value
+                    events.append(ParsedEvent(type="score", score=value))
+                    break
+        if not self.pause and PAUSE_PHRASE in window:
+            self.pause = True
+            events.append(ParsedEvent(type="pause"))
+        if not self.resume and RESUME_PHRASE in window:
+            self.resume = True
+            events.append(ParsedEvent(type="resume"))
+        self._window = window[-_WINDOW_CHARS:]
@@ -4,28 +4,125 @@ import asyncio
 import base64
 import json
 import logging
+import time
+from collections import deque
 from contextlib import suppress
 from dataclasses import dataclass
-from typing import AsyncGenerator, Optional
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Awaitable, Callable, Optional
 
+import numpy as np
 from websockets.asyncio.client import connect
 from websockets.asyncio.connection import Connection
 from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
-from websockets.legacy.client import WebSocketClientProtocol
-from websockets_proxy import Proxy, proxy_connect
+from websockets.protocol import State
 
+from .audio_buffer import AudioFeatures, PcmRingBuffer
+from .audio_sender import AudioSendQueue
+from .bilingual_parser import BilingualStreamParser
+from .metrics import (
+    GEMINI_CONTEXT_ROLLOVERS,
+    GEMINI_CONTEXT_TOKENS,
+    GEMINI_FIRST_TOKEN_SECONDS,
+    GEMINI_HIBERNATIONS,
+    GEMINI_REHYDRATE_SECONDS,
+    GEMINI_RESUMES,
+    GEMINI_SETUP_SECONDS,
+    GEMINI_TURN_SECONDS,
+)
+
+if TYPE_CHECKING:
+    from websockets.legacy.client import WebSocketClientProtocol
 
 logger = logging.getLogger(__name__)
 KEEPALIVE_INTERVAL_SECONDS = 15
+RESUME_BACKOFF_INITIAL_SECONDS = 0.5
+RESUME_BACKOFF_MAX_SECONDS = 8.0
+# Per-turn character cap for replayed transcript entries.
+RESUME_TURN_MAX_CHARS = 800
+VOICE_TURN_PLACEHOLDER = "(The learner answered by voice.)"
+# Rough upstream token accounting: about 4 characters of text per token, and
+# 16 kHz PCM is billed at 32 tokens per second (1,000 bytes per token).
+CHARS_PER_TOKEN = 4
+AUDIO_BYTES_PER_TOKEN = 1000
+# Per-turn character cap for exchanges quoted in a context rollover summary.
+SUMMARY_TURN_MAX_CHARS = 300
+SUMMARY_HEADER = "Summary of the lesson so far"
+
+# Sent once as the setup ``system_instruction`` so it is not part of the growing turn history.
+TUTOR_INSTRUCTIONS = (
+    "你是一名专业的英语口语指导老师。请用中英文双语进行回复，英文在前中文在后，用 --- 分隔。\n\n"
+    "Your responsibilities are:\n"
+    "1. Help users correct grammar and pronunciation\n"
+    "2. Give pronunciation scores and detailed feedback\n"
+    "3. Understand and respond to control commands:\n"
+    "   - Pause when user says \"Can I have a break\"\n"
+    "   - Continue when user says \"OK let's continue\"\n"
+    "4. Provide practice sentences based on chosen themes and scenarios\n\n"
+    "你的职责是：\n"
+    "1. 帮助用户纠正语法和发音\n"
+    "2. 给出发音评分和详细反馈\n"
+    "3. 理解并响应用户的控制指令：\n"
+    "   - 当用户说\"Can I have a break\"时暂停\n"
+    "   - 当用户说\"OK let's continue\"时继续\n"
+    "4. 基于选择的主题和场景提供练习句子\n\n"
+    "First, ask which theme they want to practice (business, travel, daily life, social) in English.\n\n"
+    "每次用户说完一个句子后，你需要：\n"
+    "1. 识别用户说的内容（英文）\n"
+    "2. 给出发音评分（0-100分）\n"
+    "3. 详细说明发音和语法中的问题（中英文对照）\n"
+    "4. 提供改进建议（中英文对照）\n"
+    "5. 提供下一个相关场景的练习句子（中英文对照）\n\n"
+    "请始终保持以下格式：\n"
+    "[English content]\n---\n[中文内容]"
+)
+KICKOFF_PROMPT = "如果明白了请用中英文回答OK"
+
+# Pre-serialised ``realtime_input`` envelope; only the base64 payload changes per chunk.
+_REALTIME_AUDIO_PREFIX = b'{"realtime_input":{"media_chunks":[{"mime_type":"audio/pcm","data":"'
+_REALTIME_AUDIO_SUFFIX = b'"}]}}'
+
+
+def build_realtime_audio_frame(pcm: bytes | bytearray | memoryview) -> bytes:
+    """Encode raw PCM into a ``realtime_input`` JSON frame with a single base64 pass."""
+    return b"".join((_REALTIME_AUDIO_PREFIX, base64.b64encode(pcm), _REALTIME_AUDIO_SUFFIX))
+
+
+def _text_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def practice_sentence_prompt(*, theme: str | None, scenario: str | None) -> str:
+    details: list[str] = []
+    if theme:
+        details.append(f"theme '{theme}'")
+    if scenario:
+        details.append(f"scenario '{scenario}'")
+    focus_clause = " focusing on " + " and ".join(details) if details else ""
+    return (
+        "Please provide one short, conversational practice sentence"
+        f"{focus_clause}. Respond using the agreed bilingual format (English line, newline, '---', newline, Chinese). "
+        "After presenting the sentence, encourage me to repeat it aloud and wait for my audio before giving corrections or scores."
+    )
 
 
 @dataclass
 class GeminiEvent:
-    """Represents a parsed event emitted from Gemini."""
+    """Represents a parsed event emitted from Gemini.
+
+    Besides the raw ``text-delta`` events, each reply is also reported as
+    ``english-delta`` / ``separator`` / ``chinese-delta`` / ``score`` /
+    ``pause`` / ``resume`` events (see :class:`BilingualStreamParser`) and ends
+    with ``turn-complete``.
+    """
 
     type: str
     text: Optional[str] = None
     paused: Optional[bool] = None
+    score: Optional[int] = None
+    english: Optional[str] = None
+    # Seconds from the user's turn being sent; only set on ``turn-complete``.
+    first_token_seconds: Optional[float] = None
+    turn_seconds: Optional[float] = None
 
 
 class GeminiSession:
@@ -38,36 +135,343 @@ class GeminiSession:
         api_key: str,
         host: str = "generativelanguage.googleapis.com",
         proxy_url: str | None = None,
+        endpoint: str | None = None,
+        audio_frame_bytes: int = 0,
+        audio_max_latency: float = 0.08,
+        audio_max_pending_bytes: int = 64_000,
+        audio_buffer_samples: int = 16000 * 60,
+        resume_attempts: int = 0,
+        transcript_turns: int = 12,
+        context_max_tokens: int = 0,
+        summary_turns: int = 6,
     ) -> None:
         self._model = model
         self._api_key = api_key
         self._host = host
         self._proxy_url = proxy_url
+        self._endpoint = endpoint
         self._ws: Connection | WebSocketClientProtocol | None = None
         self._ws_cm = None
         self.paused = False
-        self._audio_buffer: bytearray = bytearray()
+        self._audio_buffer = PcmRingBuffer(max_samples=audio_buffer_samples)
         self._keepalive_task: asyncio.Task[None] | None = None
+        self.connected_at: float | None = None
+        self.ready_at: float | None = None
+        self.resume_count = 0
+        self._resume_attempts = resume_attempts
+        self._transcript: deque[tuple[str, str]] = deque(maxlen=max(0, transcript_turns))
+        # Compact stand-in for the turns dropped at the last context rollover.
+        self._summary: str | None = None
+        self._context_max_tokens = context_max_tokens
+        self._summary_turns = summary_turns
+        self._context_tokens = 0
+        self.context_rollovers = 0
+        self.theme: str | None = None
+        self.scenario: str | None = None
+        self.turns = 0
+        self._scores: deque[int] = deque(maxlen=5)
+        # Cleared while reconnecting so senders hold their audio instead of failing.
+        self._connected = asyncio.Event()
+        self._closing = False
+        self._resuming = False
+        self._turn_started_at: float | None = None
+        self._awaiting_first_token = False
+        # A turn went upstream and its reply has not completed; unlike the timer this survives pooling.
+        self._reply_outstanding = False
+        # Paces upstream audio (PCM bytes) to the API key's quota; set once a conversation is admitted.
+        self.audio_limiter: Callable[[int], Awaitable[None]] | None = None
+        self.last_activity = time.monotonic()
+        self._hibernating = False
+        # Set whenever the session is not hibernating; the event stream waits on it.
+        self._awake = asyncio.Event()
+        self._awake.set()
+        self._state_lock = asyncio.Lock()
+        self._audio_queue: AudioSendQueue | None = None
+        if audio_frame_bytes > 0:
+            self._audio_queue = AudioSendQueue(
+                send_pcm=self._send_pcm,
+                frame_bytes=audio_frame_bytes,
+                max_latency=audio_max_latency,
+                max_pending_bytes=audio_max_pending_bytes,
+            )
+
+    @property
+    def audio_queue(self) -> AudioSendQueue | None:
+        return self._audio_queue
+
+    @property
+    def buffered_audio_bytes(self) -> int:
+        """Learner audio retained for scoring plus audio not yet sent upstream."""
+        pending = self._audio_queue.pending_bytes if self._audio_queue else 0
+        return self._audio_buffer.nbytes + pending
+
+    @property
+    def api_key(self) -> str:
+        return self._api_key
 
     @property
     def uri(self) -> str:
-        return (
-            f"wss://{self._host}/ws/google.ai.generativelanguage.v1alpha.GenerativeService"
-            f".BidiGenerateContent?key={self._api_key}"
+        endpoint = self._endpoint or (
+            f"wss://{self._host}/ws/google.ai.generativelanguage.v1alpha.GenerativeService.BidiGenerateContent"
         )
+        return f"{endpoint}?key={self._api_key}"
+
+    @property
+    def healthy(self) -> bool:
+        """True while the socket is open and the keepalive loop is still pinging."""
+        ws = self._ws
+        if ws is None or ws.state is not State.OPEN:
+            return False
+        task = self._keepalive_task
+        return task is not None and not task.done()
 
     async def __aenter__(self) -> "GeminiSession":
-        proxy: Optional[Proxy] = Proxy.from_url(self._proxy_url) if self._proxy_url else None
-        self._ws_cm = proxy_connect(self.uri, proxy=proxy) if proxy else connect(self.uri)
-        self._ws = await self._ws_cm.__aenter__()
-        logger.info("Gemini websocket connected to %s", self.uri)
-        await self._send_setup()
+        return await self.connect()
+
+    async def connect(self) -> "GeminiSession":
+        """Open the upstream socket, complete setup and send the instruction prompt."""
+        self.connected_at = time.monotonic()
+        await self._open()
         await self._send_initial_prompt()
         self._start_keepalive()
+        if self._audio_queue:
+            self._audio_queue.start()
+        self._connected.set()
+        self.ready_at = time.monotonic()
+        logger.debug("Gemini session ready in %.3fs", self.ready_at - self.connected_at)
         return self
 
+    async def _open(self) -> None:
+        self._ws_cm, self._ws = await self._dial()
+        self._context_tokens = _text_tokens(TUTOR_INSTRUCTIONS)
+
+    async def _dial(self) -> tuple[Any, Connection | WebSocketClientProtocol]:
+        """Connect a new upstream socket and complete setup on it, without touching the current one."""
+        if self._proxy_url:
+            # Only proxied deployments pay for importing the proxy stack.
+            from websockets_proxy import Proxy, proxy_connect
+
+            ws_cm = proxy_connect(self.uri, proxy=Proxy.from_url(self._proxy_url))
+        else:
+            ws_cm = connect(self.uri)
+        ws = await ws_cm.__aenter__()
+        logger.info("Gemini websocket connected to %s", self.uri)
+        try:
+            await self._send_setup(ws)
+        except BaseException:
+            with suppress(Exception):
+                await ws_cm.__aexit__(None, None, None)
+            raise
+        return ws_cm, ws
+
+    async def _drop_connection(self) -> None:
+        await self._stop_keepalive()
+        ws_cm, self._ws_cm, self._ws = self._ws_cm, None, None
+        if ws_cm:
+            with suppress(Exception):
+                await ws_cm.__aexit__(None, None, None)
+
+    async def _resume(self) -> bool:
+        """Reconnect with exponential backoff and replay the rolling transcript.
+
+        Audio submitted meanwhile stays in the send queue (bounded by its
+        overflow policy) and is flushed once the new connection is set up.
+        """
+        self._resuming = True
+        self._connected.clear()
+        await self._drop_connection()
+        delay = RESUME_BACKOFF_INITIAL_SECONDS
+        for attempt in range(1, self._resume_attempts + 1):
+            if self._closing:
+                break
+            await asyncio.sleep(delay)
+            try:
+                await self._open()
+                await self._replay_context()
+            except Exception as exc:
+                logger.warning("Gemini resume attempt %d/%d failed: %s", attempt, self._resume_attempts, exc)
+                await self._drop_connection()
+                delay = min(delay * 2, RESUME_BACKOFF_MAX_SECONDS)
+                continue
+            self._start_keepalive()
+            self.resume_count += 1
+            GEMINI_RESUMES.inc()
+            self._resuming = False
+            self._connected.set()
+            logger.info("Gemini session resumed after %d attempt(s), replayed %d turns", attempt, len(self._transcript))
+            return True
+        # Wake any sender waiting on the connection so it fails instead of hanging.
+        self._resuming = False
+        self._connected.set()
+        return False
+
+    @property
+    def hibernating(self) -> bool:
+        return self._hibernating
+
+    @property
+    def can_hibernate(self) -> bool:
+        """True when connected with no reply outstanding and no learner audio waiting to go upstream."""
+        if self._closing or self._hibernating or self._resuming or self._ws is None:
+            return False
+        if self._reply_outstanding:
+            return False
+        return not (self._audio_queue and self._audio_queue.pending_bytes)
+
+    async def hibernate(self) -> bool:
+        """Close the upstream socket and keepalive, keeping only the rolling transcript and flags.
+
+        The next send (or :meth:`wake`) reconnects and replays the
+        instructions and transcript, as after an upstream failure.
+        """
+        async with self._state_lock:
+            if not self.can_hibernate:
+                return False
+            self._hibernating = True
+            self._awake.clear()
+            await self._drop_connection()
+            self._audio_buffer.release_storage()
+            GEMINI_HIBERNATIONS.inc()
+            logger.info("Gemini session hibernated (paused=%s, %d turns kept)", self.paused, len(self._transcript))
+            return True
+
+    async def wake(self) -> None:
+        async with self._state_lock:
+            if not self._hibernating or self._closing:
+                return
+            started = time.perf_counter()
+            try:
+                await self._open()
+                await self._replay_context()
+            except BaseException:
+                await self._drop_connection()
+                raise
+            self._start_keepalive()
+            self._hibernating = False
+            self.last_activity = time.monotonic()
+            self._awake.set()
+            GEMINI_REHYDRATE_SECONDS.observe(time.perf_counter() - started)
+            logger.info("Gemini session rehydrated in %.3fs", time.perf_counter() - started)
+
+    async def _replay_context(self) -> None:
+        context = self.transcript()
+        if not context:
+            return
+        turns = [{"role": role, "parts": [{"text": text}]} for role, text in context]
+        await self._send_now({"client_content": {"turns": turns, "turn_complete": False}})
+        self._context_tokens += sum(_text_tokens(text) for _, text in context)
+
+    def transcript(self) -> list[tuple[str, str]]:
+        """Recent ``(role, text)`` turns kept for replay, oldest first, after any rollover summary."""
+        turns = list(self._transcript)
+        if self._summary:
+            turns.insert(0, ("user", self._summary))
+        return turns
+
+    @property
+    def context_tokens(self) -> int:
+        """Approximate size of the upstream context (exact when Gemini reports ``usageMetadata``)."""
+        return self._context_tokens
+
+    @property
+    def _needs_rollover(self) -> bool:
+        if self._context_max_tokens <= 0 or self._context_tokens < self._context_max_tokens:
+            return False
+        # Only between turns: nothing may be in flight on the connection being replaced.
+        return self.can_hibernate and not self._audio_buffer.nbytes
+
+    def _context_summary(self) -> str:
+        lines = [
+            f"{SUMMARY_HEADER} (continued on a new connection; keep following your instructions "
+            "and do not reply to this message):"
+        ]
+        if self.theme or self.scenario:
+            lines.append(f"Theme: {self.theme or 'not chosen'}; scenario: {self.scenario or 'not chosen'}.")
+        lines.append(f"Tutor replies so far: {self.turns}.")
+        if self._scores:
+            lines.append("Recent scores: " + ", ".join(str(score) for score in self._scores) + ".")
+        if self.paused:
+            lines.append("The learner asked for a break and has not resumed yet.")
+        recent = [(role, text) for role, text in self._transcript if text != VOICE_TURN_PLACEHOLDER]
+        if recent and self._summary_turns > 0:
+            lines.append("Recent exchanges:")
+            for role, text in recent[-self._summary_turns :]:
+                if role == "model":
+                    # The English half is enough to continue; the Chinese repeats it.
+                    text = text.split("\n---", 1)[0]
+                text = " ".join(text.split())[:SUMMARY_TURN_MAX_CHARS]
+                lines.append(f"{'Tutor' if role == 'model' else 'Learner'}: {text}")
+        return "\n".join(lines)
+
+    async def _roll_over(self) -> bool:
+        """Move to a fresh upstream connection seeded with a summary instead of the full history.
+
+        The new socket is set up before the old one is closed; senders wait
+        for the swap like during a resume.  On failure the current
+        connection is kept and the rollover is retried after a later turn.
+        """
+        async with self._state_lock:
+            if not self._needs_rollover:
+                return False
+            started = time.perf_counter()
+            previous_tokens = self._context_tokens
+            summary = self._context_summary()
+            self._resuming = True
+            self._connected.clear()
+            try:
+                ws_cm, ws = await self._dial()
+                seed = {"role": "user", "parts": [{"text": summary}]}
+                await ws.send(json.dumps({"client_content": {"turns": [seed], "turn_complete": False}}))
+            except Exception as exc:
+                logger.warning("Gemini context rollover failed; keeping the current connection: %s", exc)
+                self._resuming = False
+                self._connected.set()
+                return False
+            await self._stop_keepalive()
+            old_cm, self._ws_cm, self._ws = self._ws_cm, ws_cm, ws
+            self._summary = summary
+            self._transcript.clear()
+            self._context_tokens = _text_tokens(TUTOR_INSTRUCTIONS) + _text_tokens(summary)
+            self._start_keepalive()
+            self._resuming = False
+            self._connected.set()
+            self.context_rollovers += 1
+            GEMINI_CONTEXT_ROLLOVERS.inc()
+        logger.info(
+            "Gemini context rolled over in %.3fs (~%d -> ~%d tokens)",
+            time.perf_counter() - started,
+            previous_tokens,
+            self._context_tokens,
+        )
+        if old_cm is not None:
+            with suppress(Exception):
+                await old_cm.__aexit__(None, None, None)
+        return True
+
+    async def add_context(self, turns: list[tuple[str, str]]) -> None:
+        """Append ``(role, text)`` turns to the conversation without asking for a reply.
+
+        Used to restore an earlier connection's transcript and to record
+        practice sentences served from the sentence bank.
+        """
+        if not turns:
+            return
+        for role, text in turns:
+            self._remember(role, text)
+        content = [{"role": role, "parts": [{"text": text}]} for role, text in turns]
+        await self._send({"client_content": {"turns": content, "turn_complete": False}})
+        self._context_tokens += sum(_text_tokens(text) for _, text in turns)
+
+    def _remember(self, role: str, text: str) -> None:
+        if self._transcript.maxlen and text:
+            self._transcript.append((role, text[:RESUME_TURN_MAX_CHARS]))
+
     async def __aexit__(self, exc_type, exc, tb) -> None:  # pragma: no cover - cleanup logic
+        self._closing = True
+        self._connected.set()
         await self._stop_keepalive()
+        if self._audio_queue:
+            await self._audio_queue.close()
         if self._ws_cm:
             await self._ws_cm.__aexit__(exc_type, exc, tb)
         logger.info("Gemini websocket disconnected")
@@ -75,68 +479,112 @@ class GeminiSession:
         self._ws = None
 
     async def _send(self, payload: dict) -> None:
+        logger.debug("Sending payload to Gemini: %s", list(payload.keys()))
+        data = json.dumps(payload)
+        while True:
+            ws = await self._current_ws()
+            try:
+                await ws.send(data)
+                self.last_activity = time.monotonic()
+                return
+            except ConnectionClosedOK:
+                if not self._replaced(ws):
+                    raise
+            except ConnectionClosedError:
+                if not self._can_resume:
+                    raise
+                await self._wait_for_resume(ws)
+
+    async def _send_now(self, payload: dict) -> None:
+        """Send on the current socket without waiting for a resume (setup and replay)."""
         if not self._ws:
             raise RuntimeError("Gemini session is not initialized")
-        logger.debug("Sending payload to Gemini: %s", list(payload.keys()))
         await self._ws.send(json.dumps(payload))
 
-    async def _send_setup(self) -> None:
+    async def _send_frame(self, frame: bytes) -> None:
+        while True:
+            ws = await self._current_ws()
+            try:
+                if isinstance(ws, Connection):
+                    await ws.send(frame, text=True)
+                else:
+                    # The legacy protocol used for proxied connections cannot send bytes as a text frame.
+                    await ws.send(frame.decode("ascii"))
+                self.last_activity = time.monotonic()
+                return
+            except ConnectionClosedOK:
+                if not self._replaced(ws):
+                    raise
+            except ConnectionClosedError:
+                if not self._can_resume:
+                    raise
+                await self._wait_for_resume(ws)
+
+    @property
+    def _can_resume(self) -> bool:
+        return self._resume_attempts > 0 and not self._closing
+
+    def _replaced(self, ws: Connection | WebSocketClientProtocol) -> bool:
+        # We closed this socket ourselves to hibernate; retry on the next one.
+        return self._hibernating or self._ws is not ws
+
+    async def _current_ws(self) -> Connection | WebSocketClientProtocol:
+        if self._hibernating:
+            await self.wake()
+        if self._resuming:
+            await self._connected.wait()
+        if not self._ws:
+            raise RuntimeError("Gemini session is not initialized")
+        return self._ws
+
+    async def _wait_for_resume(self, failed_ws: Connection | WebSocketClientProtocol) -> None:
+        # The event stream sees the same failure and drives the reconnect;
+        # senders wait for it and retry on the new socket.
+        if self._ws is failed_ws:
+            self._resuming = True
+            self._connected.clear()
+        await self._connected.wait()
+
+    async def _send_pcm(self, pcm: bytes) -> None:
+        if self.audio_limiter is not None:
+            await self.audio_limiter(len(pcm))
+        await self._send_frame(build_realtime_audio_frame(pcm))
+        self._context_tokens += len(pcm) // AUDIO_BYTES_PER_TOKEN
+
+    async def _send_setup(self, ws: Connection | WebSocketClientProtocol) -> None:
         setup_msg = {
             "setup": {
                 "model": self._model,
                 "generation_config": {"response_modalities": ["TEXT"]},
+                "system_instruction": {"parts": [{"text": TUTOR_INSTRUCTIONS}]},
             }
         }
-        await self._send(setup_msg)
-        # Consume acknowledgement
-        if self._ws is None:
-            return
-        await self._ws.recv()
+        with GEMINI_SETUP_SECONDS.time():
+            await ws.send(json.dumps(setup_msg))
+            # Consume acknowledgement
+            await ws.recv()
         logger.debug("Received setup acknowledgement from Gemini")
 
     async def _send_initial_prompt(self) -> None:
-        initial_msg = {
-            "client_content": {
-                "turns": [
-                    {
-                        "role": "user",
-                        "parts": [
-                            {
-                                "text": (
-                                    "你是一名专业的英语口语指导老师。请用中英文双语进行回复，英文在前中文在后，用 --- 分隔。\n\n"
-                                    "Your responsibilities are:\n"
-                                    "1. Help users correct grammar and pronunciation\n"
-                                    "2. Give pronunciation scores and detailed feedback\n"
-                                    "3. Understand and respond to control commands:\n"
-                                    "   - Pause when user says \"Can I have a break\"\n"
-                                    "   - Continue when user says \"OK let's continue\"\n"
-                                    "4. Provide practice sentences based on chosen themes and scenarios\n\n"
-                                    "你的职责是：\n"
-                                    "1. 帮助用户纠正语法和发音\n"
-                                    "2. 给出发音评分和详细反馈\n"
-                                    "3. 理解并响应用户的控制指令：\n"
-                                    "   - 当用户说\"Can I have a break\"时暂停\n"
-                                    "   - 当用户说\"OK let's continue\"时继续\n"
-                                    "4. 基于选择的主题和场景提供练习句子\n\n"
-                                    "First, ask which theme they want to practice (business, travel, daily life, social) in English.\n\n"
-                                    "每次用户说完一个句子后，你需要：\n"
-                                    "1. 识别用户说的内容（英文）\n"
-                                    "2. 给出发音评分（0-100分）\n"
-                                    "3. 详细说明发音和语法中的问题（中英文对照）\n"
-                                    "4. 提供改进建议（中英文对照）\n"
-                                    "5. 提供下一个相关场景的练习句子（中英文对照）\n\n"
-                                    "请始终保持以下格式：\n"
-                                    "[English content]\n---\n[中文内容]\n\n"
-                                    "如果明白了请用中英文回答OK"
-                                )
-                            }
-                        ],
-                    }
-                ],
-                "turn_complete": True,
-            }
-        }
-        await self._send(initial_msg)
+        # The instructions went out with setup; this short turn only asks for the greeting.
+        kickoff = {"role": "user", "parts": [{"text": KICKOFF_PROMPT}]}
+        await self._send({"client_content": {"turns": [kickoff], "turn_complete": True}})
+        self._mark_turn_sent()
+        self._context_tokens += _text_tokens(KICKOFF_PROMPT)
+
+    def _mark_turn_sent(self) -> None:
+        self._turn_started_at = time.perf_counter()
+        self._awaiting_first_token = True
+        self._reply_outstanding = True
+
+    def reset_turn_timer(self) -> None:
+        """Stop timing the turn in flight, e.g. a pooled kickoff whose reply sat unread while idle.
+
+        The reply itself is still outstanding, so the session stays ineligible
+        for hibernation and context rollover until it completes.
+        """
+        self._turn_started_at = None
+        self._awaiting_first_token = False
 
     def _start_keepalive(self) -> None:
         if self._keepalive_task or not self._ws:
@@ -176,49 +624,58 @@ class GeminiSession:
                 break
 
     async def request_practice_sentence(self, *, theme: str | None, scenario: str | None) -> None:
-        details: list[str] = []
-        if theme:
-            details.append(f"theme '{theme}'")
-        if scenario:
-            details.append(f"scenario '{scenario}'")
-        focus_clause = " focusing on " + " and ".join(details) if details else ""
-        prompt = (
-            "Please provide one short, conversational practice sentence"
-            f"{focus_clause}. Respond using the agreed bilingual format (English line, newline, '---', newline, Chinese). "
-            "After presenting the sentence, encourage me to repeat it aloud and wait for my audio before giving corrections or scores."
-        )
-        logger.info("Requesting practice sentence from Gemini%s", f" ({', '.join(details)})" if details else "")
-        await self.send_user_text(prompt)
+        logger.info("Requesting practice sentence from Gemini (theme=%s scenario=%s)", theme, scenario)
+        if theme or scenario:
+            self.theme, self.scenario = theme, scenario
+        await self.send_user_text(practice_sentence_prompt(theme=theme, scenario=scenario))
 
     async def send_audio_chunk(self, *, base64_chunk: str, store_audio: bool = True) -> None:
         if self.paused:
             return
         logger.debug("Forwarding audio chunk to Gemini (len=%d)", len(base64_chunk))
-        await self._send(
-            {
-                "realtime_input": {
-                    "media_chunks": [
-                        {
-                            "data": base64_chunk,
-                            "mime_type": "audio/pcm",
-                        }
-                    ]
-                }
-            }
-        )
+        encoded = base64_chunk.encode("ascii")
+        if self._audio_queue:
+            # Coalescing needs raw PCM, so decode once and take the binary path.
+            try:
+                pcm = base64.b64decode(encoded)
+            except Exception:  # pragma: no cover - defensive fallback
+                return
+            await self.send_audio_bytes(pcm, store_audio=store_audio)
+            return
+        if self.audio_limiter is not None:
+            await self.audio_limiter(len(encoded) * 3 // 4)
+        await self._send_frame(b"".join((_REALTIME_AUDIO_PREFIX, encoded, _REALTIME_AUDIO_SUFFIX)))
+        self._context_tokens += len(encoded) * 3 // 4 // AUDIO_BYTES_PER_TOKEN
         # cache bytes for local scoring
         if store_audio:
             try:
-                self._audio_buffer.extend(base64.b64decode(base64_chunk))
+                self._audio_buffer.append(base64.b64decode(encoded))
             except Exception:  # pragma: no cover - defensive fallback
                 pass
 
+    async def send_audio_bytes(self, pcm: bytes | bytearray | memoryview, *, store_audio: bool = True) -> None:
+        """Forward raw 16-bit PCM without the base64/JSON round trip of ``send_audio_chunk``."""
+        if self.paused:
+            return
+        if self._audio_queue:
+            self._audio_queue.submit(pcm)
+        else:
+            await self._send_pcm(pcm)
+        if store_audio:
+            self._audio_buffer.append(pcm)
+
     async def end_user_turn(self) -> None:
         logger.debug("Marking end of user turn")
+        if self._audio_queue:
+            await self._audio_queue.flush()
         await self._send({"client_content": {"turn_complete": True}})
+        self._mark_turn_sent()
+        self._remember("user", VOICE_TURN_PLACEHOLDER)
 
     async def send_user_text(self, text: str) -> None:
         logger.debug("Sending user text to Gemini (%d chars)", len(text))
+        if self._audio_queue:
+            await self._audio_queue.flush()
         await self._send(
             {
                 "client_content": {
@@ -232,40 +689,121 @@ class GeminiSession:
                 }
             }
         )
+        self._mark_turn_sent()
+        self._remember("user", text)
+        self._context_tokens += _text_tokens(text)
+
+    def audio_samples(self) -> np.ndarray:
+        """Copy of the current turn's retained PCM samples."""
+        return self._audio_buffer.snapshot()
 
-    def reset_audio_buffer(self) -> bytes:
-        data = bytes(self._audio_buffer)
+    def reset_audio_buffer(self) -> AudioFeatures:
+        """Clear the turn's audio and return the features accumulated for it."""
+        features = self._audio_buffer.features()
         self._audio_buffer.clear()
-        if data:
-            logger.debug("Cleared audio buffer (%d bytes)", len(data))
-        return data
+        if features.samples:
+            logger.debug("Cleared audio buffer (%d samples)", features.samples)
+        return features
 
     async def events(self) -> AsyncGenerator[GeminiEvent, None]:
+        """Yield parsed events, transparently resuming after upstream failures.
+
+        When ``resume_attempts`` is set, an abnormal close yields a
+        ``reconnecting`` event, reconnects with the rolling transcript replayed
+        and yields ``reconnected`` (or re-raises if every attempt failed).
+        While the session is hibernating the stream yields ``hibernated`` and
+        waits, then ``rehydrated`` once a send or :meth:`wake` reconnects it.
+        After a turn that takes the context past ``context_max_tokens`` it
+        yields ``context-rollover`` and continues on the new connection.
+        """
+        while True:
+            ws = self._ws
+            try:
+                async for event in self._events_once():
+                    yield event
+                if self._closing or not self._replaced(ws):
+                    return
+                if self._hibernating:
+                    yield GeminiEvent(type="hibernated")
+                    await self._awake.wait()
+                    if self._closing:
+                        return
+                    yield GeminiEvent(type="rehydrated")
+                continue
+            except ConnectionClosedError as exc:
+                if not self._can_resume:
+                    raise
+                yield GeminiEvent(type="reconnecting")
+                if not await self._resume():
+                    raise exc
+                yield GeminiEvent(type="reconnected")
+
+    async def _events_once(self) -> AsyncGenerator[GeminiEvent, None]:
         if not self._ws:
             raise RuntimeError("Gemini session is not initialized")
         current_response: list[str] = []
+        parser = BilingualStreamParser()
+        first_token_seconds: float | None = None
         try:
             async for raw_response in self._ws:
                 logger.debug("Received payload from Gemini (bytes=%d)", len(raw_response))
+                self.last_activity = time.monotonic()
                 response = json.loads(raw_response)
+                usage = (response.get("usageMetadata") or {}).get("totalTokenCount")
+                if usage:
+                    self._context_tokens = int(usage)
                 server_content = response.get("serverContent")
                 if server_content:
                     parts = server_content.get("modelTurn", {}).get("parts", [])
                     for part in parts:
                         text = part.get("text")
                         if text:
+                            if self._awaiting_first_token and self._turn_started_at is not None:
+                                first_token_seconds = time.perf_counter() - self._turn_started_at
+                                GEMINI_FIRST_TOKEN_SECONDS.observe(first_token_seconds)
+                                self._awaiting_first_token = False
                             current_response.append(text)
                             yield GeminiEvent(type="text-delta", text=text)
+                            for parsed in parser.feed(text):
+                                yield GeminiEvent(type=parsed.type, text=parsed.text, score=parsed.score)
 
                     if server_content.get("turnComplete"):
+                        for parsed in parser.finish():
+                            yield GeminiEvent(type=parsed.type, text=parsed.text, score=parsed.score)
                         full_text = "".join(current_response)
                         current_response.clear()
-                        lowered = full_text.lower()
-                        if "can i have a break" in lowered:
+                        turn_seconds = None
+                        self._reply_outstanding = False
+                        if self._turn_started_at is not None:
+                            turn_seconds = time.perf_counter() - self._turn_started_at
+                            GEMINI_TURN_SECONDS.observe(turn_seconds)
+                            self._turn_started_at = None
+                            self._awaiting_first_token = False
+                        self._remember("model", full_text)
+                        if not usage:
+                            self._context_tokens += _text_tokens(full_text)
+                        GEMINI_CONTEXT_TOKENS.observe(self._context_tokens)
+                        self.turns += 1
+                        if parser.score is not None:
+                            self._scores.append(parser.score)
+                        if parser.pause:
                             self.paused = True
-                        elif "ok let's continue" in lowered:
+                        elif parser.resume:
                             self.paused = False
-                        yield GeminiEvent(type="turn-complete", text=full_text, paused=self.paused)
+                        yield GeminiEvent(
+                            type="turn-complete",
+                            text=full_text,
+                            paused=self.paused,
+                            score=parser.score,
+                            english=parser.english,
+                            first_token_seconds=first_token_seconds,
+                            turn_seconds=turn_seconds,
+                        )
+                        parser.reset()
+                        first_token_seconds = None
+                        if self._needs_rollover and await self._roll_over():
+                            yield GeminiEvent(type="context-rollover")
+                            return
         except ConnectionClosedOK as exc:
             logger.info(
                 "Gemini stream closed gracefully: code=%s reason=%s",
@@ -284,7 +822,12 @@ class GeminiSession:
             raise
 
     async def close(self) -> None:
+        self._closing = True
+        self._connected.set()
+        self._awake.set()
         await self._stop_keepalive()
+        if self._audio_queue:
+            await self._audio_queue.close()
         if self._ws:
             try:
                 await self._ws.close()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from typing import Callable, Iterable
+
+from .gemini_session import GeminiSession
+
+
+logger = logging.getLogger(__name__)
+
+
+class HibernationMonitor:
+    """Periodically hibernates conversations that have gone quiet.
+
+    A paused conversation is hibernated after ``paused_timeout`` seconds
+    without upstream traffic, any other after ``idle_timeout``; ``0`` turns
+    either off.  One task sweeps every connected session, so idle tabs cost
+    no per-connection timers.
+    """
+
+    def __init__(
+        self,
+        *,
+        sessions: Callable[[], Iterable[GeminiSession]],
+        idle_timeout: float,
+        paused_timeout: float,
+        interval: float = 5.0,
+    ) -> None:
+        self._sessions = sessions
+        self._idle_timeout = idle_timeout
+        self._paused_timeout = paused_timeout
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None and (self._idle_timeout > 0 or self._paused_timeout > 0):
+            self._task = asyncio.create_task(self._run(), name="hibernation_monitor")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def sweep(self) -> int:
+        now = time.monotonic()
+        due = []
+        for session in list(self._sessions()):
+            timeout = self._paused_timeout if session.paused else self._idle_timeout
+            if timeout > 0 and now - session.last_activity >= timeout and session.can_hibernate:
+                due.append(session)
+        if not due:
+            return 0
+        results = await asyncio.gather(*(session.hibernate() for session in due), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning("Failed to hibernate Gemini session: %r", result)
+        return sum(1 for result in results if result is True)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.sweep()
+            except Exception:
+                logger.exception("Hibernation sweep failed")
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from bisect import bisect_left
+from contextlib import suppress
+from typing import Callable, Iterator, TypeVar, Union
+
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (0, 1_600, 3_200, 6_400, 12_800, 25_600, 51_200, 102_400, 204_800)
+QUEUE_DEPTH_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+TOKEN_BUCKETS = (1_000, 2_000, 4_000, 8_000, 16_000, 32_000, 64_000, 128_000)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Histogram:
+    """Cumulative-bucket histogram; ``observe`` is a bisect and two additions."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.name = name
+        self.help = help_text
+        self._bounds = tuple(sorted(buckets))
+        self._counts = [0] * (len(self._bounds) + 1)
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def samples(self) -> Iterator[str]:
+        cumulative = 0
+        for bound, count in zip((*self._bounds, math.inf), self._counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{le="{_format_value(bound)}"}} {cumulative}'
+        yield f"{self.name}_sum {_format_value(self._sum)}"
+        yield f"{self.name}_count {self._count}"
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self._histogram = histogram
+        self._start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class Gauge:
+    """Point-in-time value, either set directly or read from ``function`` at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, function: Callable[[], float] | None = None) -> None:
+        self.name = name
+        self.help = help_text
+        self._value = 0.0
+        self._function = function
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1) -> None:
+        self._value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self._value -= amount
+
+    def set_function(self, function: Callable[[], float] | None) -> None:
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is None:
+            return self._value
+        try:
+            return float(self._function())
+        except Exception:  # pragma: no cover - a broken callback must not break scraping
+            logger.debug("Gauge %s callback failed", self.name, exc_info=True)
+            return math.nan
+
+    def samples(self) -> Iterator[str]:
+        value = self.value
+        yield f"{self.name} {'NaN' if math.isnan(value) else _format_value(value)}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str) -> None:
+        self.name = name
+        self.help = help_text
+        self._value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def samples(self) -> Iterator[str]:
+        yield f"{self.name}_total {self._value}"
+
+
+Metric = Union[Histogram, Gauge, Counter]
+_M = TypeVar("_M", Histogram, Gauge, Counter)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: _M) -> _M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name!r} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def histogram(self, name: str, help_text: str, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, buckets))
+
+    def gauge(self, name: str, help_text: str, function: Callable[[], float] | None = None) -> Gauge:
+        return self.register(Gauge(name, help_text, function))
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        return self.register(Counter(name, help_text))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        lines.append("")
+        return "\n".join(lines)
+
+
+REGISTRY = MetricsRegistry()
+
+GEMINI_SETUP_SECONDS = REGISTRY.histogram(
+    "gemini_setup_ack_seconds", "Time from sending setup to the Gemini setup acknowledgement."
+)
+GEMINI_FIRST_TOKEN_SECONDS = REGISTRY.histogram(
+    "gemini_first_token_seconds", "Time from the end of a user turn to the first text delta."
+)
+GEMINI_TURN_SECONDS = REGISTRY.histogram(
+    "gemini_turn_complete_seconds", "Time from the end of a user turn to turnComplete."
+)
+GEMINI_RESUMES = REGISTRY.counter("gemini_session_resumes", "Gemini sessions resumed after an abnormal close.")
+GEMINI_HIBERNATIONS = REGISTRY.counter(
+    "gemini_session_hibernations", "Idle or paused conversations whose upstream socket was closed."
+)
+GEMINI_REHYDRATE_SECONDS = REGISTRY.histogram(
+    "gemini_rehydrate_seconds", "Time to reconnect and replay context for a hibernated conversation."
+)
+GEMINI_CONTEXT_TOKENS = REGISTRY.histogram(
+    "gemini_context_tokens", "Approximate upstream context size of a session after each turn.", TOKEN_BUCKETS
+)
+GEMINI_CONTEXT_ROLLOVERS = REGISTRY.counter(
+    "gemini_context_rollovers", "Sessions moved to a fresh upstream connection seeded with a context summary."
+)
+AUDIO_SEND_QUEUE_BYTES = REGISTRY.histogram(
+    "gemini_audio_send_queue_bytes", "Pending upstream audio left after each frame is sent.", BYTES_BUCKETS
+)
+CLIENT_SEND_QUEUE_MESSAGES = REGISTRY.histogram(
+    "client_send_queue_messages", "Outbound websocket messages queued for the browser after each enqueue.",
+    QUEUE_DEPTH_BUCKETS,
+)
+CLIENT_SEND_QUEUE_BYTES = REGISTRY.histogram(
+    "client_send_queue_bytes", "Outbound websocket bytes queued for the browser after each enqueue.", BYTES_BUCKETS
+)
+VAD_DROPPED_BYTES = REGISTRY.counter(
+    "vad_dropped_audio_bytes", "Learner silence dropped by the VAD instead of being sent upstream."
+)
+VAD_AUTO_END_TURNS = REGISTRY.counter("vad_auto_end_turns", "User turns ended by the VAD after trailing silence.")
+CLIENT_WRITE_SECONDS = REGISTRY.histogram(
+    "client_write_seconds", "Time one outbound websocket message took to hand to the browser connection."
+)
+CLIENT_PARTIALS_COALESCED = REGISTRY.counter(
+    "client_partials_coalesced", "partial-response deltas merged into an already queued message."
+)
+CLIENT_SLOW_DISCONNECTS = REGISTRY.counter(
+    "client_slow_disconnects", "Browser connections dropped because they could not keep up with outbound messages."
+)
+TURN_STORE_FLUSH_SECONDS = REGISTRY.histogram(
+    "turn_store_flush_seconds", "Time to write one batch of turns to the turn log."
+)
+TURN_STORE_DROPPED = REGISTRY.counter(
+    "turn_store_dropped", "Turns not logged because the writer fell behind or a batch failed."
+)
+ADMISSION_WAIT_SECONDS = REGISTRY.histogram(
+    "admission_wait_seconds", "Time a new conversation waited in the admission queue for upstream capacity."
+)
+ADMISSION_REJECTED = REGISTRY.counter(
+    "admission_rejected", "Conversations turned away because the admission queue was full or timed out."
+)
+TTS_SYNTHESIS_SECONDS = REGISTRY.histogram("tts_synthesis_seconds", "Upstream TTS synthesis time (cache misses).")
+TTS_ADMISSION_WAIT_SECONDS = REGISTRY.histogram(
+    "tts_admission_wait_seconds", "Time a TTS request waited for a concurrency slot."
+)
+TTS_REJECTED = REGISTRY.counter("tts_rejected", "TTS requests rejected because the admission queue was full.")
+TTS_TIMEOUTS = REGISTRY.counter("tts_timeouts", "TTS requests that exceeded the per-request timeout.")
+SCORING_SECONDS = REGISTRY.histogram(
+    "scoring_batch_seconds", "Wall time of one batched pronunciation analysis dispatch."
+)
+ANALYSIS_SECONDS = REGISTRY.histogram(
+    "pronunciation_analysis_seconds", "Time from requesting one turn's frame-level analysis to its result."
+)
+EVENT_LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a periodic timer.", (0.001, *LATENCY_BUCKETS)
+)
+EVENT_LOOP_STALLS = REGISTRY.counter(
+    "event_loop_stalls", "Times the event loop was blocked past the stall threshold (see the logged stack)."
+)
+ADMISSION_WAITING = REGISTRY.gauge("admission_waiting", "Conversations waiting for upstream capacity.")
+HIBERNATED_SESSIONS = REGISTRY.gauge(
+    "hibernated_sessions", "Connected conversations currently holding no upstream socket."
+)
+ACTIVE_SESSIONS = REGISTRY.gauge("active_sessions", "Browser conversations currently connected.")
+BUFFERED_AUDIO_BYTES = REGISTRY.gauge(
+    "buffered_audio_bytes", "Learner audio held for scoring plus audio waiting to be sent upstream."
+)
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag by measuring how late a periodic sleep wakes up."""
+
+    def __init__(self, *, interval: float = 0.5, histogram: Histogram = EVENT_LOOP_LAG_SECONDS) -> None:
+        self._interval = interval
+        self._histogram = histogram
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop_lag_monitor")
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self._interval
+            await asyncio.sleep(self._interval)
+            self._histogram.observe(max(0.0, loop.time() - expected))
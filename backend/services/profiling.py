@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import sys
+import threading
+import time
+import weakref
+from collections import Counter, deque
+from contextlib import contextmanager
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Coroutine, Iterator, Optional
+
+from .metrics import EVENT_LOOP_STALLS
+
+
+logger = logging.getLogger(__name__)
+
+# Conversation the running code belongs to; inherited by tasks it creates.
+SESSION_ID: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("session_id", default=None)
+_task_sessions: "weakref.WeakKeyDictionary[asyncio.Task[Any], str]" = weakref.WeakKeyDictionary()
+
+# Innermost frames of worker threads with nothing to do; left out of profiles unless asked for.
+_IDLE_FRAMES = {("thread.py", "_worker"), ("threading.py", "wait"), ("queue.py", "get"), ("selectors.py", "select")}
+
+
+def bind_session(session_id: str, *tasks: Optional[asyncio.Task[Any]]) -> None:
+    """Attribute the current task, ``tasks`` and every task created from here on to ``session_id``."""
+    SESSION_ID.set(session_id)
+    for task in (asyncio.current_task(), *tasks):
+        if task is not None:
+            _task_sessions[task] = session_id
+
+
+def session_of(task: Optional[asyncio.Task[Any]]) -> Optional[str]:
+    if task is None:
+        return None
+    try:
+        return _task_sessions.get(task)
+    except RuntimeError:  # pragma: no cover - resized by the loop thread while a sampler reads it
+        return None
+
+
+def track_session_tasks(loop: asyncio.AbstractEventLoop) -> None:
+    """Install a task factory recording which conversation created each task (one dict insert per task)."""
+    previous = loop.get_task_factory()
+
+    def factory(loop: asyncio.AbstractEventLoop, coro: Coroutine[Any, Any, Any], **kwargs: Any) -> asyncio.Task[Any]:
+        # Newer Pythons also pass ``name`` and ``eager_start``; hand everything through.
+        if previous is not None:
+            task = previous(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        context: contextvars.Context | None = kwargs.get("context")
+        session_id = SESSION_ID.get() if context is None else context.get(SESSION_ID)
+        if session_id is not None:
+            _task_sessions[task] = session_id
+        return task
+
+    loop.set_task_factory(factory)
+
+
+_labels: dict[CodeType, str] = {}
+
+
+def _label(code: CodeType) -> str:
+    label = _labels.get(code)
+    if label is None:
+        label = _labels[code] = f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+    return label
+
+
+def _stack(frame: Optional[FrameType], max_depth: int) -> list[str]:
+    """Frame labels, outermost first."""
+    labels: list[str] = []
+    while frame is not None and len(labels) < max_depth:
+        labels.append(_label(frame.f_code))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def _idle(frame: FrameType) -> bool:
+    code = frame.f_code
+    return (Path(code.co_filename).name, code.co_name) in _IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """Statistical profiler producing collapsed stacks (``a;b;c 42``) for flamegraph tools.
+
+    A daemon thread wakes every ``interval`` seconds and records the Python
+    stack of every other thread from :func:`sys._current_frames`, so the
+    profiled code runs untouched: the cost is one stack walk per thread per
+    sample, about 1% of a core at the default 100 Hz.  Stacks are rooted at
+    the thread name; with ``by_session`` the event-loop thread's stacks also
+    get the conversation whose task was running.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, *, max_depth: int = 64) -> None:
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._max_depth = max_depth
+        self._lock = threading.Lock()
+        self.samples = 0
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(
+        self, seconds: float, *, interval: float = 0.01, idle: bool = False, by_session: bool = False
+    ) -> str:
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already being taken")
+        try:
+            stop = threading.Event()
+            counts: Counter[str] = Counter()
+            sampler = threading.Thread(
+                target=self._sample, args=(stop, counts, interval, idle, by_session), name="profiler", daemon=True
+            )
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stop.set()
+                await asyncio.to_thread(sampler.join)
+        finally:
+            self._lock.release()
+        logger.info("Profiled %.1fs: %d stacks from %d samples", seconds, len(counts), sum(counts.values()))
+        return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+    def _sample(
+        self, stop: threading.Event, counts: Counter[str], interval: float, idle: bool, by_session: bool
+    ) -> None:
+        own = threading.get_ident()
+        while not stop.wait(interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own or (not idle and thread_id != self._loop_thread and _idle(frame)):
+                    continue
+                root = [names.get(thread_id, f"thread-{thread_id}")]
+                if by_session and thread_id == self._loop_thread:
+                    session_id = session_of(asyncio.current_task(self._loop))
+                    if session_id is not None:
+                        root.append(f"session:{session_id}")
+                counts[";".join(root + _stack(frame, self._max_depth))] += 1
+            self.samples += 1
+
+
+class LoopWatchdog:
+    """Logs event-loop stalls with the stack, task and conversation that caused them.
+
+    The loop bumps a heartbeat every ``interval`` seconds; a daemon thread
+    checks it and, once it is more than ``threshold`` late, captures the
+    loop thread's stack and current task while the stall is still going on.
+    When the loop gets back to the heartbeat the stall is logged with its
+    full duration, counted in ``event_loop_stalls`` and kept in
+    :meth:`recent`.  Unlike ``loop.set_debug`` nothing wraps each callback,
+    so it can stay on in production.
+    """
+
+    def __init__(self, *, threshold: float = 0.1, interval: float = 0.02, history: int = 50) -> None:
+        self._threshold = threshold
+        self._interval = interval
+        self._stalls: deque[dict[str, Any]] = deque(maxlen=history)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread = 0
+        self._handle: asyncio.TimerHandle | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._last_beat = 0.0
+        # (heartbeat the capture belongs to, details), written by the watchdog thread.
+        self._captured: tuple[float, dict[str, Any]] | None = None
+
+    def start(self) -> None:
+        if self._thread is not None or self._threshold <= 0:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._handle = self._loop.call_later(self._interval, self._beat)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop_watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        if self._handle is not None:
+            self._handle.cancel()
+        self._stop.set()
+        await asyncio.to_thread(thread.join)
+
+    def recent(self) -> list[dict[str, Any]]:
+        return list(self._stalls)
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        late = now - self._last_beat - self._interval
+        previous, self._last_beat = self._last_beat, now
+        self._handle = self._loop.call_later(self._interval, self._beat)
+        if late < self._threshold:
+            return
+        captured, self._captured = self._captured, None
+        details = captured[1] if captured is not None and captured[0] == previous else {}
+        stall = {
+            "at": round(time.time(), 3),
+            "blocked_ms": round(late * 1000, 1),
+            "task": details.get("task"),
+            "session": details.get("session"),
+            "stack": details.get("stack", []),
+        }
+        self._stalls.append(stall)
+        EVENT_LOOP_STALLS.inc()
+        logger.warning(
+            "Event loop stalled for %.0f ms in %s (session %s)%s",
+            stall["blocked_ms"],
+            stall["task"] or "a callback",
+            stall["session"] or "-",
+            "".join(f"\n    {frame}" for frame in stall["stack"]),
+        )
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._interval):
+            beat = self._last_beat
+            if time.monotonic() - beat < self._interval + self._threshold:
+                continue
+            if self._captured is not None and self._captured[0] == beat:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            task = asyncio.current_task(self._loop)
+            self._captured = (
+                beat,
+                {
+                    "task": task.get_name() if task is not None else None,
+                    "session": session_of(task),
+                    # The innermost frames say what is blocking; the outer ones are the loop itself.
+                    "stack": _stack(frame, 64)[-16:],
+                },
+            )
+
+
+class TurnTimings:
+    """Wall time per phase of a conversation's most recent ``max_turns`` turns."""
+
+    def __init__(self, *, max_turns: int = 20) -> None:
+        self._turns: deque[dict[str, Any]] = deque(maxlen=max_turns)
+        self._current: dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        self._current[name] = self._current.get(name, 0.0) + seconds
+
+    def finish(self, **upstream_seconds: Optional[float]) -> None:
+        """Close the current turn; ``upstream_seconds`` are measured elsewhere (e.g. Gemini latencies)."""
+        phases = {**self._current, **{name: value for name, value in upstream_seconds.items() if value is not None}}
+        turn = {f"{name}_ms": round(value * 1000, 2) for name, value in phases.items()}
+        self._turns.append({"at": round(time.time(), 3), **turn})
+        self._current = {}
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return list(self._turns)
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Sequence
+
+import numpy as np
+
+from ..pronunciation import analyze_pronunciation_batch
+from .metrics import ANALYSIS_SECONDS, SCORING_SECONDS
+
+
+logger = logging.getLogger(__name__)
+SCORING_MODES = ("auto", "process", "thread", "inline")
+
+
+Kernel = Callable[[np.ndarray, list[int]], list[Any]]
+
+
+def analyze_pronunciations(samples: np.ndarray, lengths: list[int]) -> list[dict[str, Any]]:
+    """Breakdowns of turns of ``lengths`` samples laid out back to back in ``samples``, in one vectorized pass."""
+    return [breakdown.to_dict() for breakdown in analyze_pronunciation_batch(samples, lengths)]
+
+
+def _start_method() -> str:
+    # Forking the server would copy the locks of its watchdog, profiler and SQLite writer threads mid-use.
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _run_on_shared_memory(kernel: Kernel, name: str, lengths: list[int]) -> list[Any]:
+    """Process-pool entry point: run ``kernel`` over turns laid out back to back in shared memory."""
+    # Forkserver and spawn workers share the parent's resource tracker, so the
+    # registration made by attaching is the parent's own and its unlink clears it.
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        total = sum(lengths)
+        samples = np.ndarray((total,), dtype=np.int16, buffer=segment.buf)
+        results = kernel(samples, lengths)
+        del samples
+        return results
+    finally:
+        segment.close()
+
+
+def _run_concatenated(kernel: Kernel, arrays: list[np.ndarray], lengths: list[int]) -> list[Any]:
+    """Thread-pool entry point: lay the turns out back to back off the loop, then run ``kernel``."""
+    return kernel(np.concatenate(arrays), lengths)
+
+
+class ScoringEngine:
+    """Runs pronunciation scoring off the asyncio event loop.
+
+    ``process`` mode hands PCM to a ``ProcessPoolExecutor`` through
+    ``multiprocessing.shared_memory`` so audio is copied once rather than
+    pickled; ``thread`` mode relies on numpy releasing the GIL; ``inline`` runs
+    on the loop and is meant for tests and tiny deployments.
+
+    Concurrent :meth:`analyze` calls arriving within ``batch_window`` seconds
+    are merged into one :meth:`analyze_batch` dispatch, which analyzes the
+    turns together in one vectorized pass over their concatenated samples, so a
+    burst of turn-ends costs one executor round trip and one set of numpy calls
+    instead of one per learner.  Worker processes are started by a forkserver
+    (``spawn`` where that is unavailable), never forked from the threaded
+    server; :meth:`warm_up` blocks while they start and belongs in a thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: str = "auto",
+        max_workers: int | None = None,
+        batch_window: float = 0.002,
+        max_batch: int = 64,
+    ) -> None:
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode {mode!r}; expected one of {SCORING_MODES}")
+        if mode == "auto":
+            # A worker process only helps when it does not share the loop's only core.
+            mode = "process" if (os.cpu_count() or 1) > 1 else "thread"
+        self._mode = mode
+        self._max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._executor: Executor | None = None
+        self._executor_lock = threading.Lock()
+        self._batch_window = batch_window
+        self._max_batch = max_batch
+        self._pending: list[tuple[np.ndarray, asyncio.Future[dict[str, Any]]]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task[None]] = set()
+
+    @property
+    def mode(self) -> str:
+        return self._mode
+
+    def _ensure_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                if self._mode == "process":
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self._max_workers, mp_context=multiprocessing.get_context(_start_method())
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="scoring")
+            return self._executor
+
+    async def analyze(self, samples: np.ndarray) -> dict[str, Any]:
+        """Frame-level breakdown (VAD, loudness, pitch, speaking rate) for one turn."""
+        with ANALYSIS_SECONDS.time():
+            if self._mode == "inline":
+                return analyze_pronunciations(samples, [samples.size])[0]
+            loop = asyncio.get_running_loop()
+            future: asyncio.Future[dict[str, Any]] = loop.create_future()
+            self._pending.append((samples, future))
+            if len(self._pending) >= self._max_batch:
+                self._flush_pending()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self._batch_window, self._flush_pending)
+            return await future
+
+    def _flush_pending(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._analyze_pending(batch), name="scoring_batch")
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _analyze_pending(self, batch: list[tuple[np.ndarray, asyncio.Future[dict[str, Any]]]]) -> None:
+        try:
+            results = await self.analyze_batch([samples for samples, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def analyze_batch(self, arrays: Sequence[np.ndarray]) -> list[dict[str, Any]]:
+        """Analyze many turns in one dispatch to the configured executor."""
+        with SCORING_SECONDS.time():
+            return await self._dispatch(analyze_pronunciations, arrays)
+
+    async def _dispatch(self, kernel: Kernel, arrays: Sequence[np.ndarray]) -> list[Any]:
+        if not arrays:
+            return []
+        lengths = [int(array.size) for array in arrays]
+        if self._mode == "inline":
+            return kernel(np.concatenate(arrays), lengths)
+        loop = asyncio.get_running_loop()
+        executor = self._ensure_executor()
+        if self._mode == "thread":
+            return await loop.run_in_executor(executor, _run_concatenated, kernel, list(arrays), lengths)
+
+        total = sum(lengths)
+        if total == 0:
+            return kernel(np.empty(0, dtype=np.int16), lengths)
+        segment = shared_memory.SharedMemory(create=True, size=total * 2)
+        try:
+            staging = np.ndarray((total,), dtype=np.int16, buffer=segment.buf)
+            offset = 0
+            for array, length in zip(arrays, lengths):
+                staging[offset : offset + length] = array
+                offset += length
+            del staging
+            return await loop.run_in_executor(executor, _run_on_shared_memory, kernel, segment.name, lengths)
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def warm_up(self) -> None:
+        """Start executor workers ahead of the first turn; blocks until process workers are up."""
+        if self._mode == "inline":
+            return
+        executor = self._ensure_executor()
+        if isinstance(executor, ProcessPoolExecutor):
+            for started in [executor.submit(os.getpid) for _ in range(self._max_workers)]:
+                started.result()
+
+    def shutdown(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for _, future in self._pending:
+            future.cancel()
+        self._pending.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            logger.debug("Scoring executor shut down")
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Protocol
+
+from .tts_client import TTSClient, TTSOverloadedError, import_genai_sdk
+
+try:  # POSIX only; elsewhere every worker refills and persists its own bank.
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the platform
+    fcntl = None
+
+if TYPE_CHECKING:
+    from google import genai
+
+logger = logging.getLogger(__name__)
+
+BANK_FORMAT_VERSION = 1
+
+
+@dataclass
+class PracticeSentence:
+    english: str
+    chinese: str
+    created_at: float
+    served: int = 0
+
+    @property
+    def text(self) -> str:
+        """The sentence in the tutor's bilingual reply format."""
+        return f"{self.english}\n---\n{self.chinese}"
+
+
+class SentenceGenerator(Protocol):
+    async def generate(
+        self, *, theme: str, scenario: str, count: int, avoid: Iterable[str] = ()
+    ) -> list[tuple[str, str]]: ...
+
+
+class GeminiSentenceGenerator:
+    """Asks a (non-live) Gemini text model for a batch of ``(english, chinese)`` practice sentences.
+
+    The SDK is imported and the client built on the first refill, off the startup path.
+    """
+
+    def __init__(self, *, api_key: str, model: str, timeout: float = 30.0) -> None:
+        self._model = model
+        self._api_key = api_key
+        self._timeout = timeout
+        self._client: Optional["genai.Client"] = None
+
+    async def generate(
+        self, *, theme: str, scenario: str, count: int, avoid: Iterable[str] = ()
+    ) -> list[tuple[str, str]]:
+        prompt = (
+            f"Write {count} short, conversational English sentences a Chinese learner could practice aloud "
+            f"for the theme '{theme}' and the scenario '{scenario}'. Each sentence should be 6-16 words. "
+            'Return a JSON array of objects with the keys "english" and "chinese" (a natural Simplified Chinese '
+            "translation) and nothing else."
+        )
+        avoid = list(avoid)
+        if avoid:
+            prompt += " Do not repeat any of these: " + " | ".join(avoid)
+        _, genai, types = await asyncio.to_thread(import_genai_sdk)
+        if self._client is None:
+            self._client = genai.Client(
+                api_key=self._api_key, http_options=types.HttpOptions(timeout=int(self._timeout * 1000))
+            )
+        response = await self._client.aio.models.generate_content(
+            model=self._model,
+            contents=prompt,
+            config=types.GenerateContentConfig(response_mime_type="application/json", temperature=1.0),
+        )
+        try:
+            items = json.loads(response.text or "[]")
+        except json.JSONDecodeError as exc:
+            raise RuntimeError("Sentence generator returned invalid JSON") from exc
+        pairs: list[tuple[str, str]] = []
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            english = str(item.get("english", "")).strip()
+            chinese = str(item.get("chinese", "")).strip()
+            if english and chinese and "---" not in english:
+                pairs.append((english, chinese))
+        return pairs
+
+
+class SentenceBank:
+    """Ready-to-serve practice sentences, with their TTS audio pre-synthesized, for every theme/scenario.
+
+    A background task keeps ``target_size`` sentences per scenario: it drops
+    sentences served ``max_serves`` times or older than ``max_age`` seconds,
+    generates replacements and synthesizes their audio through ``tts_client``.
+    Sentences are kept in a gzipped JSON file at ``path`` between restarts and
+    their audio in ``<path>.audio/`` (in memory without a ``path``), owned by
+    the bank rather than the TTS cache so LRU eviction there never turns a
+    banked sentence into a live synthesis.  Each refill pass re-synthesizes
+    audio that has gone missing and deletes audio no sentence uses.
+
+    With several workers sharing ``path``, only the one holding an exclusive
+    lock on ``<path>.lock`` refills and writes the file; the others serve from
+    it, reload it when it changes and take over the lock if its owner exits.
+    """
+
+    def __init__(
+        self,
+        *,
+        generator: SentenceGenerator,
+        tts_client: TTSClient,
+        scenarios: dict[str, list[str]],
+        path: Path | None = None,
+        target_size: int = 6,
+        max_serves: int = 20,
+        max_age: float = 7 * 24 * 3600,
+        refill_interval: float = 900.0,
+    ) -> None:
+        self._generator = generator
+        self._tts_client = tts_client
+        self._scenarios = [(theme, scenario) for theme, names in scenarios.items() for scenario in names]
+        self._path = path
+        self._audio_dir = path.with_name(path.name + ".audio") if path is not None else None
+        self._audio: dict[str, bytes] = {}
+        self._target_size = max(1, target_size)
+        self._max_serves = max(1, max_serves)
+        self._max_age = max_age
+        self._refill_interval = refill_interval
+        self._sentences: dict[tuple[str, str], list[PracticeSentence]] = {key: [] for key in self._scenarios}
+        self._refill_needed = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._dirty = False
+        self._lock_fd: int | None = None
+        self._loaded_mtime: float | None = None
+        self._hits = 0
+        self._misses = 0
+        self._generated = 0
+        self._failures = 0
+        self._audio_misses = 0
+
+    @property
+    def owner(self) -> bool:
+        """Whether this process refills and persists the bank."""
+        return self._path is None or fcntl is None or self._lock_fd is not None
+
+    def _try_lock(self) -> bool:
+        if self.owner:
+            return True
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self._path.with_name(self._path.name + ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        logger.info("Worker %d now refills the sentence bank %s", os.getpid(), self._path)
+        return True
+
+    def _unlock(self) -> None:
+        fd, self._lock_fd = self._lock_fd, None
+        if fd is not None:
+            # Closing the descriptor releases the lock.
+            os.close(fd)
+
+    def load(self) -> None:
+        if self._path is None or not self._path.exists():
+            return
+        try:
+            mtime = self._path.stat().st_mtime
+            with gzip.open(self._path, "rt", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            logger.warning("Ignoring unreadable sentence bank %s", self._path, exc_info=True)
+            return
+        if data.get("version") != BANK_FORMAT_VERSION:
+            return
+        sentences: dict[tuple[str, str], list[PracticeSentence]] = {key: [] for key in self._scenarios}
+        loaded = 0
+        for entry in data.get("sentences", []):
+            key = (entry.pop("theme", None), entry.pop("scenario", None))
+            if key in sentences:
+                sentences[key].append(PracticeSentence(**entry))
+                loaded += 1
+        self._sentences = sentences
+        self._loaded_mtime = mtime
+        logger.info("Loaded %d practice sentences from %s", loaded, self._path)
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = self._path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            self.load()
+
+    def save(self) -> None:
+        if self._path is not None:
+            self._write(self._snapshot())
+
+    def _snapshot(self) -> str:
+        sentences = [
+            {"theme": theme, "scenario": scenario, **asdict(sentence)}
+            for (theme, scenario), bucket in self._sentences.items()
+            for sentence in bucket
+        ]
+        self._dirty = False
+        return json.dumps({"version": BANK_FORMAT_VERSION, "sentences": sentences}, ensure_ascii=False)
+
+    def _write(self, payload: str) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process name, so a concurrent writer can never interleave with this file.
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            with suppress(OSError):
+                tmp_path.unlink()
+            raise
+        with suppress(OSError):
+            self._loaded_mtime = self._path.stat().st_mtime
+
+    async def _persist(self) -> None:
+        if self._dirty and self._path is not None and self.owner:
+            # Snapshot on the loop so ``take`` cannot mutate a bucket mid-serialisation.
+            await asyncio.to_thread(self._write, self._snapshot())
+
+    def take(self, theme: str, scenario: str, *, exclude: Iterable[str] = ()) -> Optional[PracticeSentence]:
+        """The least-served sentence for the scenario that is not in ``exclude``, or ``None``."""
+        bucket = self._sentences.get((theme, scenario))
+        excluded = set(exclude)
+        candidates = [sentence for sentence in bucket or () if sentence.english not in excluded]
+        if not candidates:
+            self._misses += 1
+            if bucket is not None:
+                self._refill_needed.set()
+            return None
+        sentence = min(candidates, key=lambda candidate: candidate.served)
+        sentence.served += 1
+        self._hits += 1
+        self._dirty = True
+        if sentence.served >= self._max_serves:
+            bucket.remove(sentence)
+            self._refill_needed.set()
+        return sentence
+
+    async def audio(self, sentence: PracticeSentence) -> Optional[bytes]:
+        """The sentence's banked audio, or a synthesis through ``tts_client`` when the bank has none yet."""
+        if not self._tts_client.enabled:
+            return None
+        key = self._tts_client.cache_key(sentence.english)
+        if self._audio_dir is None:
+            data = self._audio.get(key)
+        else:
+            data = await asyncio.to_thread(_read_audio, self._audio_dir / f"{key}.pcm")
+        if data:
+            return data
+        self._audio_misses += 1
+        # Have the owner put it back in the bank.
+        self._refill_needed.set()
+        return await self._tts_client.synthesize_bytes(sentence.english)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "sentences": sum(len(bucket) for bucket in self._sentences.values()),
+            "scenarios": len(self._sentences),
+            "empty_scenarios": sum(1 for bucket in self._sentences.values() if not bucket),
+            "hits": self._hits,
+            "misses": self._misses,
+            "generated": self._generated,
+            "failures": self._failures,
+            "audio_misses": self._audio_misses,
+            "owner": self.owner,
+        }
+
+    def start(self) -> None:
+        if self._task is None:
+            self.load()
+            self._task = asyncio.create_task(self._run(), name="sentence_bank_refill")
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await self._persist()
+        self._unlock()
+
+    async def _run(self) -> None:
+        while True:
+            self._refill_needed.clear()
+            try:
+                if self._try_lock():
+                    await self.refill()
+                else:
+                    # Another worker refills; pick up what it has written.
+                    await asyncio.to_thread(self._reload_if_changed)
+            except Exception:
+                logger.exception("Sentence bank refill failed")
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._refill_needed.wait(), self._refill_interval)
+
+    async def refill(self) -> None:
+        """Retire stale sentences and top every scenario back up to ``target_size``."""
+        cutoff = time.time() - self._max_age
+        for key, bucket in self._sentences.items():
+            fresh = [sentence for sentence in bucket if sentence.created_at >= cutoff]
+            if len(fresh) != len(bucket):
+                self._sentences[key] = fresh
+                self._dirty = True
+        await self._restore_audio()
+        for (theme, scenario), bucket in self._sentences.items():
+            missing = self._target_size - len(bucket)
+            if missing <= 0:
+                continue
+            try:
+                pairs = await self._generator.generate(
+                    theme=theme, scenario=scenario, count=missing, avoid=[sentence.english for sentence in bucket]
+                )
+            except Exception as exc:
+                # Usually quota or connectivity; the next pass retries and live requests still work.
+                self._failures += 1
+                logger.warning("Could not generate practice sentences for %s/%s: %r", theme, scenario, exc)
+                break
+            known = {sentence.english for sentence in bucket}
+            for english, chinese in pairs[:missing]:
+                if english in known or not await self._warm_audio(english):
+                    continue
+                known.add(english)
+                bucket.append(PracticeSentence(english=english, chinese=chinese, created_at=time.time()))
+                self._generated += 1
+                self._dirty = True
+        await self._persist()
+
+    async def _restore_audio(self) -> None:
+        """Re-synthesize banked audio that has gone missing and delete audio of retired sentences."""
+        if not self._tts_client.enabled:
+            return
+        keys = {
+            self._tts_client.cache_key(sentence.english): sentence
+            for bucket in self._sentences.values()
+            for sentence in bucket
+        }
+        if self._audio_dir is None:
+            for key in self._audio.keys() - keys.keys():
+                del self._audio[key]
+            present = set(self._audio)
+        else:
+            present = await asyncio.to_thread(_sync_audio_dir, self._audio_dir, set(keys))
+        for key, sentence in keys.items():
+            if key not in present and not await self._warm_audio(sentence.english):
+                # Served through the TTS client until a later pass manages it.
+                break
+
+    async def _warm_audio(self, english: str) -> bool:
+        if not self._tts_client.enabled:
+            return True
+        try:
+            data = await self._tts_client.synthesize_bytes(english)
+        except TTSOverloadedError:
+            # Live traffic comes first; leave this sentence for a quieter pass.
+            return False
+        except Exception as exc:
+            logger.warning("Could not pre-synthesize practice sentence: %r", exc)
+            return False
+        if not data:
+            return False
+        key = self._tts_client.cache_key(english)
+        if self._audio_dir is None:
+            self._audio[key] = data
+        else:
+            await asyncio.to_thread(_write_audio, self._audio_dir / f"{key}.pcm", data)
+        return True
+
+
+def _read_audio(path: Path) -> Optional[bytes]:
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _write_audio(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            tmp_path.unlink()
+        raise
+
+
+def _sync_audio_dir(directory: Path, keys: set[str]) -> set[str]:
+    """Delete audio files whose key is not in ``keys``; return the keys that have a file."""
+    present: set[str] = set()
+    if not directory.is_dir():
+        return present
+    for entry in os.scandir(directory):
+        key, _, suffix = entry.name.partition(".")
+        if suffix != "pcm":
+            continue
+        if key in keys:
+            present.add(key)
+        else:
+            with suppress(OSError):
+                os.unlink(entry.path)
+    return present
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from .gemini_session import GeminiSession
+
+
+logger = logging.getLogger(__name__)
+
+
+class LatencyWindow:
+    """Rolling window of recent latency samples with cheap percentile summaries."""
+
+    def __init__(self, maxlen: int = 256) -> None:
+        self._samples: deque[float] = deque(maxlen=maxlen)
+
+    def observe(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def summary(self) -> dict[str, float | int]:
+        if not self._samples:
+            return {"count": 0}
+        ordered = sorted(self._samples)
+        return {
+            "count": len(ordered),
+            "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+
+@dataclass
+class SessionPoolStats:
+    warm_hits: int = 0
+    cold_starts: int = 0
+    created: int = 0
+    expired: int = 0
+    unhealthy: int = 0
+    connect_failures: int = 0
+
+
+class GeminiSessionPool:
+    """Keeps ``size`` connected, set-up ``GeminiSession``s ready for new clients.
+
+    Sessions are single-use: ``acquire`` hands one out and the caller closes it
+    when the conversation ends.  A background task replaces handed-out sessions,
+    retires idle ones older than ``ttl`` seconds and drops any whose keepalive
+    ping has stopped (see ``GeminiSession.healthy``).  ``factory`` is called
+    with the API key to connect with; ``pick_key`` chooses it for pre-warmed
+    sessions (``None`` lets the factory use its default).
+    """
+
+    def __init__(
+        self,
+        *,
+        factory: Callable[[Optional[str]], GeminiSession],
+        size: int,
+        ttl: float,
+        check_interval: float = 5.0,
+        pick_key: Callable[[], Optional[str]] | None = None,
+    ) -> None:
+        self._factory = factory
+        self._pick_key = pick_key
+        self._size = size
+        self._ttl = ttl
+        self._check_interval = check_interval
+        self._idle: deque[GeminiSession] = deque()
+        self._connecting = 0
+        self._connects: set[asyncio.Task[None]] = set()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closed = False
+        self._failure_backoff = 0.0
+        self._stats = SessionPoolStats()
+        self.session_ready = LatencyWindow()
+        self.first_token = LatencyWindow()
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "size": self._size,
+            "idle": len(self._idle),
+            "connecting": self._connecting,
+            **asdict(self._stats),
+            "session_ready": self.session_ready.summary(),
+            "connect_to_first_token": self.first_token.summary(),
+        }
+
+    def start(self) -> None:
+        if self._task is None and self._size > 0:
+            self._task = asyncio.create_task(self._maintain(), name="gemini_session_pool")
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for task in list(self._connects):
+            task.cancel()
+        if self._connects:
+            await asyncio.gather(*self._connects, return_exceptions=True)
+        while self._idle:
+            await self._discard(self._idle.popleft())
+
+    async def acquire(self, api_key: str | None = None) -> GeminiSession:
+        """Return a ready session (on ``api_key`` if given), connecting a fresh one if none is warm."""
+        for session in [s for s in self._idle if api_key is None or s.api_key == api_key]:
+            if session not in self._idle:
+                continue
+            self._idle.remove(session)
+            self._wake.set()
+            if self._usable(session):
+                self._stats.warm_hits += 1
+                # The kickoff went out when the session was pooled; its latency would include the idle time.
+                session.reset_turn_timer()
+                return session
+            await self._discard(session)
+        self._stats.cold_starts += 1
+        self._wake.set()
+        session = self._factory(api_key)
+        try:
+            return await session.connect()
+        except BaseException:
+            await self._discard(session)
+            raise
+
+    def _usable(self, session: GeminiSession) -> bool:
+        if not session.healthy:
+            self._stats.unhealthy += 1
+            return False
+        if session.ready_at is not None and time.monotonic() - session.ready_at > self._ttl:
+            self._stats.expired += 1
+            return False
+        return True
+
+    async def _maintain(self) -> None:
+        while not self._closed:
+            for session in list(self._idle):
+                if not self._usable(session):
+                    self._idle.remove(session)
+                    await self._discard(session)
+            missing = self._size - len(self._idle) - self._connecting
+            for _ in range(max(0, missing)):
+                self._connecting += 1
+                task = asyncio.create_task(self._add_session(), name="gemini_session_pool_connect")
+                self._connects.add(task)
+                task.add_done_callback(self._connects.discard)
+            self._wake.clear()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self._check_interval + self._failure_backoff)
+
+    async def _add_session(self) -> None:
+        session = self._factory(self._pick_key() if self._pick_key else None)
+        try:
+            await session.connect()
+        except asyncio.CancelledError:
+            await self._discard(session)
+            raise
+        except Exception as exc:
+            self._stats.connect_failures += 1
+            self._failure_backoff = min(60.0, max(1.0, self._failure_backoff * 2))
+            logger.warning("Failed to pre-warm Gemini session: %s", exc)
+            await self._discard(session)
+            return
+        finally:
+            self._connecting -= 1
+        self._failure_backoff = 0.0
+        self._stats.created += 1
+        if session.connected_at is not None and session.ready_at is not None:
+            self.session_ready.observe(session.ready_at - session.connected_at)
+        if self._closed:
+            await self._discard(session)
+            return
+        self._idle.append(session)
+
+    async def _discard(self, session: GeminiSession) -> None:
+        with suppress(Exception):
+            await session.close()
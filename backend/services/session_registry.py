@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SessionRecord:
+    """Worker-independent state of one learner conversation."""
+
+    session_id: str
+    worker: int
+    created_at: float
+    updated_at: float
+    connected: bool = True
+    learner_id: str | None = None
+    paused: bool = False
+    theme: str | None = None
+    scenario: str | None = None
+    transcript: list[tuple[str, str]] = field(default_factory=list)
+    counters: dict[str, int] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "SessionRecord":
+        data = json.loads(raw)
+        data["transcript"] = [tuple(turn) for turn in data.get("transcript", [])]
+        return cls(**data)
+
+
+class SessionRegistry(ABC):
+    """Where conversations are recorded so any worker can resume them.
+
+    The websocket itself always stays on the worker that accepted it; the
+    registry lets a reconnecting client (``?session=<id>``) land on any worker
+    and still get its theme, counters and recent transcript back.  Expired
+    records are swept every ``sweep_interval`` seconds by :meth:`start`, not
+    on each write.
+    """
+
+    def __init__(self, *, ttl: float, sweep_interval: float = 60.0) -> None:
+        self._ttl = ttl
+        self._sweep_interval = sweep_interval
+        self._sweeper: asyncio.Task[None] | None = None
+
+    @abstractmethod
+    async def get(self, session_id: str) -> SessionRecord | None: ...
+
+    @abstractmethod
+    async def put(self, record: SessionRecord) -> None: ...
+
+    @abstractmethod
+    async def remove(self, session_id: str) -> None: ...
+
+    @abstractmethod
+    async def stats(self) -> dict[str, Any]: ...
+
+    @abstractmethod
+    async def sweep(self) -> int:
+        """Drop expired records; returns how many were removed."""
+
+    def start(self) -> None:
+        if self._sweeper is None and self._sweep_interval > 0:
+            self._sweeper = asyncio.create_task(self._sweep_loop(), name="session_registry_sweep")
+
+    async def close(self) -> None:
+        task, self._sweeper = self._sweeper, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+    async def _sweep_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            try:
+                removed = await self.sweep()
+            except Exception:
+                logger.exception("Session registry sweep failed")
+                continue
+            if removed:
+                logger.debug("Swept %d expired sessions", removed)
+
+    def _expired(self, record: SessionRecord, now: float) -> bool:
+        # Also covers records left "connected" by a worker that crashed.
+        return now - record.updated_at > self._ttl
+
+
+class InMemorySessionRegistry(SessionRegistry):
+    """Per-process registry; the default for single-worker deployments."""
+
+    def __init__(self, *, ttl: float = 3600.0, sweep_interval: float = 60.0) -> None:
+        super().__init__(ttl=ttl, sweep_interval=sweep_interval)
+        self._records: dict[str, SessionRecord] = {}
+
+    async def get(self, session_id: str) -> SessionRecord | None:
+        record = self._records.get(session_id)
+        if record is not None and self._expired(record, time.time()):
+            del self._records[session_id]
+            return None
+        return record
+
+    async def put(self, record: SessionRecord) -> None:
+        self._records[record.session_id] = record
+
+    async def sweep(self) -> int:
+        now = time.time()
+        expired = [key for key, value in self._records.items() if self._expired(value, now)]
+        for session_id in expired:
+            del self._records[session_id]
+        return len(expired)
+
+    async def remove(self, session_id: str) -> None:
+        self._records.pop(session_id, None)
+
+    async def stats(self) -> dict[str, Any]:
+        connected = sum(1 for record in self._records.values() if record.connected)
+        return {"backend": "memory", "sessions": len(self._records), "connected": connected}
+
+
+class SqliteSessionRegistry(SessionRegistry):
+    """File-backed registry shared by every worker on the host (SQLite in WAL mode).
+
+    Records are only touched on connect, turn end and disconnect, never per
+    audio chunk, so one small write per event is cheap; it still runs in a
+    thread so a slow disk never stalls the event loop.
+    """
+
+    def __init__(self, path: Path, *, ttl: float = 3600.0, sweep_interval: float = 60.0) -> None:
+        super().__init__(ttl=ttl, sweep_interval=sweep_interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, connected INTEGER NOT NULL,"
+            " updated_at REAL NOT NULL, record TEXT NOT NULL)"
+        )
+        # The expiry sweep is a range delete on updated_at.
+        self._db.execute("CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at)")
+        logger.info("Session registry stored in %s", path)
+
+    def _execute(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    async def get(self, session_id: str) -> SessionRecord | None:
+        rows = await asyncio.to_thread(self._execute, "SELECT record FROM sessions WHERE session_id = ?", (session_id,))
+        if not rows:
+            return None
+        record = SessionRecord.from_json(rows[0][0])
+        if self._expired(record, time.time()):
+            await self.remove(session_id)
+            return None
+        return record
+
+    async def put(self, record: SessionRecord) -> None:
+        await asyncio.to_thread(
+            self._execute,
+            "INSERT OR REPLACE INTO sessions (session_id, connected, updated_at, record) VALUES (?, ?, ?, ?)",
+            (record.session_id, int(record.connected), record.updated_at, record.to_json()),
+        )
+
+    async def sweep(self) -> int:
+        def _delete() -> int:
+            with self._lock:
+                cursor = self._db.execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self._ttl,))
+                return cursor.rowcount
+
+        return await asyncio.to_thread(_delete)
+
+    async def remove(self, session_id: str) -> None:
+        await asyncio.to_thread(self._execute, "DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    async def stats(self) -> dict[str, Any]:
+        rows = await asyncio.to_thread(self._execute, "SELECT COUNT(*), COALESCE(SUM(connected), 0) FROM sessions")
+        total, connected = rows[0]
+        return {"backend": "sqlite", "path": str(self._path), "sessions": total, "connected": connected}
+
+    async def close(self) -> None:
+        await super().close()
+        with self._lock:
+            self._db.close()
+
+
+def create_session_registry(kind: str, *, path: Path, ttl: float) -> SessionRegistry:
+    if kind == "memory":
+        return InMemorySessionRegistry(ttl=ttl)
+    if kind == "sqlite":
+        return SqliteSessionRegistry(path, ttl=ttl)
+    raise ValueError(f"Unknown session registry {kind!r}; expected 'memory' or 'sqlite'")
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+try:  # Optional: about 15-20% smaller than gzip for our JS and CSS.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the deployment
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = b"public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = b"no-cache"
+# Assets whose text may reference other assets by relative path.
+_REWRITTEN_SUFFIXES = {".html", ".js", ".css"}
+_TEXT_TYPES = {".html": "text/html", ".js": "text/javascript", ".css": "text/css"}
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+@dataclass
+class _Variant:
+    body: bytes
+    etag: bytes
+    encoding: Optional[bytes] = None
+
+
+@dataclass
+class StaticAsset:
+    """One frontend file held in memory with its precompressed variants."""
+
+    path: str
+    fingerprinted_path: str
+    content_type: bytes
+    variants: dict[str, _Variant] = field(default_factory=dict)
+
+    def variant(self, accept_encoding: str) -> _Variant:
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and _accepts(accept_encoding, encoding):
+                return self.variants[encoding]
+        return self.variants["identity"]
+
+
+def _accepts(header: str, encoding: str) -> bool:
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() == encoding:
+            return params.replace(" ", "") not in {"q=0", "q=0.0", "q=0.00", "q=0.000"}
+    return False
+
+
+def _etag_matches(header: str, etag: bytes) -> bool:
+    if header.strip() == "*":
+        return True
+    tag = etag.decode()
+    # Weak comparison, as If-None-Match requires.
+    return any(candidate.strip().removeprefix("W/") == tag for candidate in header.split(","))
+
+
+class StaticAssets:
+    """ASGI app serving the frontend from memory with fingerprinted, immutable URLs.
+
+    At :meth:`load` every file under ``directory`` is read once, hashed and
+    compressed (gzip, plus brotli when installed).  References between HTML,
+    JS and CSS files (``"practice.js"``, ``'worklets/recorder-processor.js'``)
+    are rewritten to ``name.<hash>.ext`` so those URLs can be cached forever
+    (``Cache-Control: immutable``); ``index.html`` and the original file names
+    stay revalidated with ``no-cache`` and a strong ETag, answered with 304
+    when unchanged.  A request is a dict lookup plus one send of prebuilt
+    bytes, so serving assets costs the websocket workers almost no CPU.
+    :meth:`load` hashes and compresses every file, so call it off the event
+    loop; until it has finished requests get 503.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        index: str = "index.html",
+        compress_min_bytes: int = 512,
+        gzip_level: int = 9,
+        brotli_quality: int = 11,
+    ) -> None:
+        self._directory = directory
+        self._index = index
+        self._compress_min_bytes = compress_min_bytes
+        self._gzip_level = gzip_level
+        self._brotli_quality = brotli_quality
+        self._routes: dict[str, tuple[StaticAsset, bytes]] = {}
+        self._assets: dict[str, StaticAsset] = {}
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "assets": len(self._assets),
+            "bytes": sum(len(asset.variants["identity"].body) for asset in self._assets.values()),
+            "compressed_bytes": sum(
+                min(len(variant.body) for variant in asset.variants.values()) for asset in self._assets.values()
+            ),
+            "brotli": brotli is not None,
+        }
+
+    def load(self) -> None:
+        sources: dict[str, bytes] = {}
+        for file in sorted(self._directory.rglob("*")):
+            relative = file.relative_to(self._directory)
+            if file.is_file() and not any(part.startswith(".") for part in relative.parts):
+                sources[relative.as_posix()] = file.read_bytes()
+        fingerprinted: dict[str, str] = {}
+        digests: dict[str, str] = {}
+        contents: dict[str, bytes] = {}
+        pending = dict(sources)
+        while pending:
+            # Fingerprint files whose references are already fingerprinted, so a
+            # change to the worklet also changes the URL of the script loading it.
+            ready = [path for path, data in pending.items() if not self._references(path, data, pending)]
+            if not ready:
+                logger.warning("Circular references between %s; not rewriting them", ", ".join(sorted(pending)))
+                ready = list(pending)
+            for path in ready:
+                data = self._rewrite(path, pending.pop(path), fingerprinted)
+                contents[path] = data
+                digests[path] = hashlib.sha256(data).hexdigest()[:12]
+                fingerprinted[path] = _fingerprinted_path(path, digests[path])
+        assets = {
+            path: self._build(path, fingerprinted[path], digests[path], data) for path, data in contents.items()
+        }
+        routes: dict[str, tuple[StaticAsset, bytes]] = {}
+        for asset in assets.values():
+            routes["/" + asset.path] = (asset, REVALIDATE_CACHE_CONTROL)
+            routes["/" + asset.fingerprinted_path] = (asset, IMMUTABLE_CACHE_CONTROL)
+        if self._index in assets:
+            routes["/"] = (assets[self._index], REVALIDATE_CACHE_CONTROL)
+        self._assets, self._routes = assets, routes
+        self._loaded = True
+        stats = self.stats()
+        logger.info(
+            "Loaded %d static assets (%d bytes, %d compressed)",
+            stats["assets"],
+            stats["bytes"],
+            stats["compressed_bytes"],
+        )
+
+    def _references(self, path: str, data: bytes, candidates: dict[str, bytes]) -> bool:
+        if Path(path).suffix not in _REWRITTEN_SUFFIXES:
+            return False
+        return any(other != path and _reference_pattern(other).search(data) for other in candidates)
+
+    def _rewrite(self, path: str, data: bytes, fingerprinted: dict[str, str]) -> bytes:
+        if Path(path).suffix not in _REWRITTEN_SUFFIXES:
+            return data
+        for other, target in fingerprinted.items():
+            data = _reference_pattern(other).sub(lambda match: match[1] + target.encode() + match[1], data)
+        return data
+
+    def _build(self, path: str, fingerprinted_path: str, digest: str, data: bytes) -> StaticAsset:
+        suffix = Path(path).suffix
+        content_type = _TEXT_TYPES.get(suffix) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type.startswith("text/"):
+            content_type += "; charset=utf-8"
+        asset = StaticAsset(path=path, fingerprinted_path=fingerprinted_path, content_type=content_type.encode())
+        asset.variants["identity"] = _Variant(body=data, etag=f'"{digest}"'.encode())
+        if len(data) >= self._compress_min_bytes:
+            compressed = {"gzip": gzip.compress(data, compresslevel=self._gzip_level, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(data, quality=self._brotli_quality)
+            for encoding, body in compressed.items():
+                if len(body) < len(data):
+                    asset.variants[encoding] = _Variant(
+                        body=body, etag=f'"{digest}-{encoding}"'.encode(), encoding=encoding.encode()
+                    )
+        return asset
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            raise RuntimeError("StaticAssets only serves HTTP requests")
+        if not self._loaded:
+            await _send_plain(send, 503, b"Starting up", [(b"retry-after", b"1")])
+            return
+        method = scope["method"]
+        if method not in ("GET", "HEAD"):
+            await _send_plain(send, 405, b"Method Not Allowed", [(b"allow", b"GET, HEAD")])
+            return
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :] or "/"
+        route = self._routes.get(path)
+        if route is None:
+            await _send_plain(send, 404, b"Not Found")
+            return
+        asset, cache_control = route
+        accept_encoding = if_none_match = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+            elif name == b"if-none-match":
+                if_none_match = value.decode("latin-1")
+        variant = asset.variant(accept_encoding)
+        headers = [
+            (b"etag", variant.etag),
+            (b"cache-control", cache_control),
+            (b"vary", b"Accept-Encoding"),
+        ]
+        if if_none_match and _etag_matches(if_none_match, variant.etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers.append((b"content-type", asset.content_type))
+        headers.append((b"content-length", str(len(variant.body)).encode()))
+        if variant.encoding is not None:
+            headers.append((b"content-encoding", variant.encoding))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b"" if method == "HEAD" else variant.body})
+
+
+def _fingerprinted_path(path: str, digest: str) -> str:
+    stem, dot, suffix = path.rpartition(".")
+    if not dot or "/" in suffix:
+        return f"{path}.{digest}"
+    return f"{stem}.{digest}.{suffix}"
+
+
+def _reference_pattern(path: str) -> re.Pattern[bytes]:
+    # Quoted relative references only, optionally written as "./path".
+    return re.compile(rb"([\"'])(?:\./)?" + re.escape(path.encode()) + rb"\1")
+
+
+async def _send_plain(send: Send, status: int, body: bytes, extra: Optional[list[tuple[bytes, bytes]]] = None) -> None:
+    headers = [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode())]
+    await send({"type": "http.response.start", "status": status, "headers": [*headers, *(extra or [])]})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_tts_text(text: str) -> str:
+    """Normalise text so trivially different inputs share one cache entry."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def tts_cache_key(*, model_id: str, voice_name: str, text: str) -> str:
+    """Content address for synthesized audio: sha256 over model, voice and normalised text."""
+    material = "\x1f".join((model_id, voice_name, normalize_tts_text(text)))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TTSCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    memory_evictions: int = 0
+    disk_evictions: int = 0
+    memory_entries: int = 0
+    memory_bytes: int = 0
+    disk_bytes: int = 0
+
+
+class DiskAudioStore:
+    """Directory of content-addressed audio blobs.
+
+    Entries are written atomically (temp file + ``os.replace``) so concurrent
+    workers sharing the directory never observe partial files.  Eviction drops
+    the least recently touched files once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int) -> None:
+        self._dir = directory
+        self._max_bytes = max_bytes
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self.total_bytes = sum(size for _, size, _ in self._scan())
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self._dir / key[:2] / f"{key}.pcm"
+
+    def _scan(self) -> list[tuple[Path, int, float]]:
+        entries: list[tuple[Path, int, float]] = []
+        for shard in os.scandir(self._dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".pcm"):
+                    stat = entry.stat()
+                    entries.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            # The caller keeps the bytes in the memory tier, so a plain read is the only copy needed.
+            data = path.read_bytes()
+            if not data:
+                return None
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError as exc:  # pragma: no cover - filesystem safeguard
+            logger.warning("Failed to read cached TTS audio %s: %s", path, exc)
+            return None
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not data or len(data) > self._max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        try:
+            with open(tmp_path, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp_path, path)
+        except OSError as exc:  # pragma: no cover - filesystem safeguard
+            logger.warning("Failed to persist TTS audio %s: %s", path, exc)
+            _unlink_quietly(tmp_path)
+            return
+        self.total_bytes += len(data) - replaced
+        if self.total_bytes > self._max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._scan(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self._max_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            _unlink_quietly(path)
+            total -= size
+            self.evictions += 1
+        self.total_bytes = total
+
+
+def _unlink_quietly(path: Path) -> None:
+    try:
+        path.unlink()
+    except OSError:
+        pass
+
+
+class TTSCache:
+    """Two-tier (memory LRU + on-disk) cache for synthesized speech.
+
+    Concurrent lookups for the same key share a single in-flight load, so a
+    burst of identical sentences costs one upstream synthesis.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_memory_bytes: int,
+        disk_dir: Path | None = None,
+        max_disk_bytes: int = 0,
+    ) -> None:
+        self._max_memory_bytes = max_memory_bytes
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = DiskAudioStore(disk_dir, max_bytes=max_disk_bytes) if disk_dir and max_disk_bytes > 0 else None
+        self._inflight: dict[str, asyncio.Task[Optional[bytes]]] = {}
+        self._stats = TTSCacheStats()
+
+    def stats(self) -> dict[str, int]:
+        self._stats.memory_entries = len(self._memory)
+        self._stats.memory_bytes = self._memory_bytes
+        if self._disk:
+            self._stats.disk_bytes = self._disk.total_bytes
+            self._stats.disk_evictions = self._disk.evictions
+        return asdict(self._stats)
+
+    async def get_or_create(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Optional[bytes]]],
+    ) -> Optional[bytes]:
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            self._stats.memory_hits += 1
+            return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats.coalesced += 1
+        else:
+            task = asyncio.create_task(self._load(key, factory), name=f"tts_cache_load_{key[:12]}")
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled waiter does not abort the load for the others.
+        return await asyncio.shield(task)
+
+    async def _load(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[Optional[bytes]]],
+    ) -> Optional[bytes]:
+        if self._disk:
+            data = await asyncio.to_thread(self._disk.get, key)
+            if data is not None:
+                self._stats.disk_hits += 1
+                self._remember(key, data)
+                return data
+        self._stats.misses += 1
+        data = await factory()
+        if data:
+            self._remember(key, data)
+            if self._disk:
+                await asyncio.to_thread(self._disk.put, key, data)
+        return data
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self._max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > self._max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._stats.memory_evictions += 1
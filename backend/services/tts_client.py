@@ -2,60 +2,263 @@ from __future__ import annotations
 
 import asyncio
 import base64
-from typing import Optional
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional, Sequence
 
-from google import genai
-from google.genai import types
+import numpy as np
+
+from .metrics import TTS_ADMISSION_WAIT_SECONDS, TTS_REJECTED, TTS_SYNTHESIS_SECONDS, TTS_TIMEOUTS
+from .tts_cache import TTSCache, normalize_tts_text, tts_cache_key
+
+if TYPE_CHECKING:
+    import httpx
+    from google import genai
+
+    from .admission import AdmissionController
+
+logger = logging.getLogger(__name__)
+
+# Gemini TTS models return raw 16-bit little-endian mono PCM at 24 kHz.
+TTS_AUDIO_MIME_TYPE = "audio/pcm;rate=24000"
+TTS_SAMPLE_RATE = 24000
+KEEPALIVE_EXPIRY_SECONDS = 60.0
+
+
+class TTSOverloadedError(RuntimeError):
+    """Raised when the admission queue is full; callers fall back to text-only feedback."""
 
 
 class TTSClient:
+    """Gemini TTS over the SDK's async client with a pooled keep-alive HTTP transport.
+
+    At most ``max_concurrency`` uncached syntheses run at once; up to
+    ``max_queue`` more wait for a slot and anything beyond that is rejected
+    with :class:`TTSOverloadedError`.  Each request is bounded by ``timeout``
+    seconds.  No thread pool is involved, so slow TTS cannot starve the
+    default executor.  With an ``admission`` controller, each synthesis also
+    waits for that controller's per-key TTS rate limit and goes out on the
+    least-loaded of ``api_key`` and ``extra_api_keys``.
+
+    ``google.genai`` and ``httpx`` are imported, and the SDK clients built,
+    on the first synthesis or an earlier :meth:`warm_up`, so constructing
+    the client does not slow down worker start.
+    """
+
     def __init__(
         self,
         *,
         api_key: Optional[str],
         voice_name: str,
         model_id: str,
+        cache: TTSCache | None = None,
+        max_concurrency: int = 4,
+        max_queue: int = 32,
+        timeout: float = 20.0,
+        extra_api_keys: Sequence[str] = (),
+        admission: "AdmissionController | None" = None,
     ) -> None:
         self._voice_name = voice_name
         self._model_id = model_id
-        self._client: Optional[genai.Client] = None
-        if api_key:
-            self._client = genai.Client(api_key=api_key)
+        self._cache = cache
+        self._max_concurrency = max(1, max_concurrency)
+        self._max_queue = max(0, max_queue)
+        self._timeout = timeout
+        self._slots = asyncio.Semaphore(self._max_concurrency)
+        self._waiting = 0
+        self._in_flight = 0
+        self._admission = admission
+        self._api_key = api_key
+        self._api_keys = list(dict.fromkeys([api_key, *extra_api_keys])) if api_key else []
+        self._clients: dict[str, "genai.Client"] = {}
+        self._http: Optional["httpx.AsyncClient"] = None
 
     @property
     def enabled(self) -> bool:
-        return self._client is not None
+        return self._api_key is not None
+
+    @property
+    def warm(self) -> bool:
+        return not self._api_keys or bool(self._clients)
+
+    async def warm_up(self) -> None:
+        """Import the SDK in a thread and build the clients ahead of the first synthesis."""
+        if self.warm:
+            return
+        await asyncio.to_thread(import_genai_sdk)
+        self._ensure_clients()
+
+    def _ensure_clients(self) -> None:
+        if self.warm:
+            return
+        httpx, genai, types = import_genai_sdk()
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self._max_concurrency,
+                max_keepalive_connections=self._max_concurrency,
+                keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+            ),
+            timeout=self._timeout,
+        )
+        # One SDK client per key, all sharing the pooled HTTP transport.
+        self._clients = {
+            key: genai.Client(
+                api_key=key,
+                http_options=types.HttpOptions(timeout=int(self._timeout * 1000), httpx_async_client=self._http),
+            )
+            for key in self._api_keys
+        }
+
+    @property
+    def audio_mime_type(self) -> str:
+        return TTS_AUDIO_MIME_TYPE
+
+    @property
+    def cache(self) -> TTSCache | None:
+        return self._cache
+
+    def stats(self) -> dict[str, int]:
+        return {"max_concurrency": self._max_concurrency, "in_flight": self._in_flight, "waiting": self._waiting}
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+
+    def cache_key(self, text: str) -> str:
+        """Content address of ``text`` spoken with this client's model and voice."""
+        return tts_cache_key(model_id=self._model_id, voice_name=self._voice_name, text=text)
 
     async def synthesize(self, text: str) -> Optional[str]:
-        if not self._client:
+        audio_bytes = await self.synthesize_bytes(text)
+        if not audio_bytes:
             return None
+        return base64.b64encode(audio_bytes).decode()
 
-        def _synthesize() -> str:
-            response = self._client.models.generate_content(
-                model=self._model_id,
-                contents=text,
-                config=types.GenerateContentConfig(
-                    response_modalities=["AUDIO"],
-                    speech_config=types.SpeechConfig(
-                        voice_config=types.VoiceConfig(
-                            prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                                voice_name=self._voice_name
-                            )
-                        )
-                    ),
-                ),
-            )
+    async def synthesize_bytes(self, text: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        text = normalize_tts_text(text)
+        if not text:
+            return None
+        if not self._cache:
+            return await self._synthesize_uncached(text)
+        return await self._cache.get_or_create(self.cache_key(text), lambda: self._synthesize_uncached(text))
+
+    @asynccontextmanager
+    async def _admit(self) -> AsyncIterator[None]:
+        if self._slots.locked() and self._waiting >= self._max_queue:
+            TTS_REJECTED.inc()
+            raise TTSOverloadedError(f"TTS admission queue is full ({self._waiting} waiting)")
+        self._waiting += 1
+        queued_at = time.perf_counter()
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        TTS_ADMISSION_WAIT_SECONDS.observe(time.perf_counter() - queued_at)
+        self._in_flight += 1
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._slots.release()
+
+    async def _synthesize_uncached(self, text: str) -> bytes:
+        await self.warm_up()
+        default = self._clients.get(self._api_key) if self._api_key else None
+        async with self._admit():
+            if self._admission is None:
+                return await self._timed_generate(text, default)
+            async with self._admission.tts_slot() as api_key:
+                return await self._timed_generate(text, self._clients.get(api_key, default))
+
+    async def _timed_generate(self, text: str, client: Optional["genai.Client"]) -> bytes:
+        with TTS_SYNTHESIS_SECONDS.time():
             try:
-                candidate = response.candidates[0]
-                part = candidate.content.parts[0]
-                inline_data = getattr(part, "inline_data", None)
-                if not inline_data or not inline_data.data:
-                    raise KeyError("missing inline audio data")
-                audio_bytes = inline_data.data
-                if isinstance(audio_bytes, str):
-                    audio_bytes = base64.b64decode(audio_bytes)
-                return base64.b64encode(audio_bytes).decode()
-            except (IndexError, AttributeError, KeyError) as exc:
-                raise RuntimeError("Unexpected response format from TTS API") from exc
-
-        return await asyncio.to_thread(_synthesize)
+                return await asyncio.wait_for(self._generate(text, client), self._timeout)
+            except asyncio.TimeoutError:
+                TTS_TIMEOUTS.inc()
+                raise
+
+    async def _generate(self, text: str, client: Optional["genai.Client"]) -> bytes:
+        _, _, types = import_genai_sdk()
+        response = await client.aio.models.generate_content(
+            model=self._model_id,
+            contents=text,
+            config=types.GenerateContentConfig(
+                response_modalities=["AUDIO"],
+                speech_config=types.SpeechConfig(
+                    voice_config=types.VoiceConfig(
+                        prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=self._voice_name)
+                    )
+                ),
+            ),
+        )
+        try:
+            candidate = response.candidates[0]
+            part = candidate.content.parts[0]
+            inline_data = getattr(part, "inline_data", None)
+            if not inline_data or not inline_data.data:
+                raise KeyError("missing inline audio data")
+            audio_bytes = inline_data.data
+            if isinstance(audio_bytes, str):
+                audio_bytes = base64.b64decode(audio_bytes)
+            return audio_bytes
+        except (IndexError, AttributeError, KeyError) as exc:
+            raise RuntimeError("Unexpected response format from TTS API") from exc
+
+
+class FakeTTSClient(TTSClient):
+    """Offline stand-in that returns a tone sized like real speech after ``latency`` seconds.
+
+    Used for local load tests (``TTS_BACKEND=fake``); it goes through the same
+    cache and streaming paths as :class:`TTSClient`.
+    """
+
+    def __init__(
+        self,
+        *,
+        voice_name: str = "fake",
+        model_id: str = "fake-tts",
+        cache: TTSCache | None = None,
+        latency: float = 0.2,
+        chars_per_second: float = 15.0,
+        max_concurrency: int = 4,
+        max_queue: int = 32,
+        timeout: float = 20.0,
+        admission: "AdmissionController | None" = None,
+    ) -> None:
+        super().__init__(
+            api_key=None,
+            voice_name=voice_name,
+            model_id=model_id,
+            cache=cache,
+            max_concurrency=max_concurrency,
+            max_queue=max_queue,
+            timeout=timeout,
+            admission=admission,
+        )
+        self._latency = latency
+        self._chars_per_second = chars_per_second
+
+    @property
+    def enabled(self) -> bool:
+        return True
+
+    async def _generate(self, text: str, client: Optional["genai.Client"]) -> bytes:
+        await asyncio.sleep(self._latency)
+        seconds = max(0.2, len(text) / self._chars_per_second)
+        t = np.arange(int(seconds * TTS_SAMPLE_RATE), dtype=np.float32) / TTS_SAMPLE_RATE
+        tone = 0.2 * np.sin(2 * math.pi * 220.0 * t)
+        return (tone * 32767).astype("<i2").tobytes()
+
+
+def import_genai_sdk() -> tuple[Any, Any, Any]:
+    """``(httpx, google.genai, google.genai.types)``, imported on first use; ``google.genai`` alone takes ~0.4 s."""
+    import httpx
+    from google import genai
+    from google.genai import types
+
+    return httpx, genai, types
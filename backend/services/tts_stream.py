@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from contextlib import suppress
+from typing import Awaitable, Callable, Optional
+
+from .tts_client import TTSClient
+
+
+logger = logging.getLogger(__name__)
+_SENTENCE_END_RE = re.compile(r"[.!?;:](?=[\s\"')\]]*\s)|\n")
+
+# ``send_audio(audio, *, turn, seq, text)``, normally ``AudioDownlink.send``.
+SendAudio = Callable[..., Awaitable[None]]
+
+
+class SentenceSegmenter:
+    """Incrementally splits the English half of a bilingual response into sentences.
+
+    It is fed the ``english-delta`` events of :class:`BilingualStreamParser`,
+    so the Chinese half never reaches it.  Each delta is only scanned from
+    where the previous scan stopped, so the work per delta is proportional to
+    the delta itself.
+    """
+
+    def __init__(self, *, min_chars: int = 12) -> None:
+        self._min_chars = min_chars
+        self._buffer = ""
+        self._scan_from = 0
+        self._done = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, text: str) -> list[str]:
+        if self._done or not text:
+            return []
+        self._buffer += text
+        return self._take_sentences(final=False)
+
+    def flush(self) -> list[str]:
+        if self._done:
+            return []
+        self._done = True
+        return self._take_sentences(final=True)
+
+    def _take_sentences(self, *, final: bool) -> list[str]:
+        sentences: list[str] = []
+        cut = 0
+        for match in _SENTENCE_END_RE.finditer(self._buffer, self._scan_from):
+            end = match.end()
+            if len(self._buffer[cut:end].strip()) < self._min_chars:
+                continue
+            sentences.append(self._buffer[cut:end].strip())
+            cut = end
+        self._buffer = self._buffer[cut:]
+        # Punctuation at the very end may still become a boundary once whitespace arrives.
+        self._scan_from = max(0, len(self._buffer) - 4)
+        if final:
+            tail = self._buffer.strip()
+            self._buffer = ""
+            self._scan_from = 0
+            if tail:
+                sentences.append(tail)
+        return [sentence for sentence in sentences if sentence]
+
+
+class TTSStreamPipeline:
+    """Synthesizes sentences of one turn as they arrive and sends them in order.
+
+    Synthesis runs concurrently, bounded by the TTS client's own concurrency
+    limit and admission control, while a single sender task awaits results in
+    sequence order, so the client can start playback after the first sentence.
+    """
+
+    def __init__(
+        self,
+        *,
+        tts_client: TTSClient,
+        send_audio: SendAudio,
+        turn_id: int,
+    ) -> None:
+        self._tts_client = tts_client
+        self._send_audio = send_audio
+        self._turn_id = turn_id
+        self._segmenter = SentenceSegmenter()
+        self._queue: asyncio.Queue[Optional[tuple[str, asyncio.Task[Optional[bytes]]]]] = asyncio.Queue()
+        self._sender: asyncio.Task[None] | None = None
+        self._scheduled = 0
+        self.sent = 0
+
+    @property
+    def scheduled(self) -> int:
+        return self._scheduled
+
+    def feed(self, text: str) -> None:
+        for sentence in self._segmenter.feed(text):
+            self._schedule(sentence)
+
+    def end_text(self) -> None:
+        """The English half is complete: synthesize its last sentence without waiting for the turn to end."""
+        for sentence in self._segmenter.flush():
+            self._schedule(sentence)
+
+    async def finish(self) -> int:
+        """Flush the remaining text and wait until every chunk has been sent."""
+        self.end_text()
+        if self._sender is None:
+            return 0
+        self._queue.put_nowait(None)
+        await self._sender
+        return self.sent
+
+    async def cancel(self) -> None:
+        if self._sender is None:
+            return
+        self._sender.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._sender
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                item[1].cancel()
+
+    def _schedule(self, sentence: str) -> None:
+        task = asyncio.create_task(self._synthesize(sentence), name=f"tts_stream_{self._turn_id}_{self._scheduled}")
+        self._queue.put_nowait((sentence, task))
+        self._scheduled += 1
+        if self._sender is None:
+            self._sender = asyncio.create_task(self._send_in_order(), name=f"tts_stream_sender_{self._turn_id}")
+
+    async def _synthesize(self, sentence: str) -> Optional[bytes]:
+        return await self._tts_client.synthesize_bytes(sentence)
+
+    async def _send_in_order(self) -> None:
+        seq = 0
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                break
+            sentence, task = item
+            try:
+                audio_bytes = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Streaming TTS failed for sentence %d of turn %d", seq, self._turn_id)
+                audio_bytes = None
+            if audio_bytes:
+                await self._send_audio(audio_bytes, turn=self._turn_id, seq=seq, text=sentence)
+                self.sent += 1
+            seq += 1
+        logger.debug("Streamed %d TTS chunks for turn %d", self.sent, self._turn_id)
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from .metrics import TURN_STORE_DROPPED, TURN_STORE_FLUSH_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "learner_id",
+    "session_id",
+    "created_at",
+    "source",
+    "theme",
+    "scenario",
+    "tutor_text",
+    "score",
+    "tutor_score",
+    "breakdown",
+    "paused",
+    "first_token_ms",
+    "turn_ms",
+)
+
+
+@dataclass
+class TurnEntry:
+    """One finished tutor turn as it is written to the log."""
+
+    learner_id: str
+    session_id: str
+    tutor_text: str
+    created_at: float = field(default_factory=time.time)
+    source: str = "gemini"
+    theme: Optional[str] = None
+    scenario: Optional[str] = None
+    score: Optional[int] = None
+    tutor_score: Optional[int] = None
+    breakdown: Optional[dict[str, Any]] = None
+    paused: bool = False
+    first_token_ms: Optional[float] = None
+    turn_ms: Optional[float] = None
+
+    def row(self) -> tuple:
+        breakdown = json.dumps(self.breakdown, ensure_ascii=False) if self.breakdown else None
+        return (
+            self.learner_id,
+            self.session_id,
+            self.created_at,
+            self.source,
+            self.theme,
+            self.scenario,
+            self.tutor_text,
+            self.score,
+            self.tutor_score,
+            breakdown,
+            int(self.paused),
+            self.first_token_ms,
+            self.turn_ms,
+        )
+
+
+class TurnStore:
+    """Append-only log of every learner turn (SQLite in WAL mode).
+
+    ``append`` only puts the entry in memory; a background task writes
+    whatever has accumulated every ``flush_interval`` seconds (or as soon as
+    ``batch_size`` entries are waiting) as one transaction in a thread.  If
+    the disk cannot keep up, more than ``max_pending`` waiting entries are
+    dropped (oldest first) rather than slowing live conversations.
+
+    Rows are never updated, and history/progress queries are range scans on
+    the ``(learner_id, created_at)`` index, so they stay fast however many
+    turns other learners have logged.  Reads use their own connection and
+    never wait for the writer.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_pending: int = 10_000,
+        wal_limit_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._pending: deque[TurnEntry] = deque(maxlen=max_pending)
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task[None] | None = None
+        self._written = 0
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._writer = self._connect()
+        # Checkpoint and truncate the WAL instead of letting it grow with the log.
+        self._writer.execute(f"PRAGMA journal_size_limit={int(wal_limit_bytes)}")
+        self._writer.executescript(
+            "CREATE TABLE IF NOT EXISTS turns ("
+            " id INTEGER PRIMARY KEY, learner_id TEXT NOT NULL, session_id TEXT NOT NULL,"
+            " created_at REAL NOT NULL, source TEXT NOT NULL, theme TEXT, scenario TEXT,"
+            " tutor_text TEXT NOT NULL, score INTEGER, tutor_score INTEGER, breakdown TEXT,"
+            " paused INTEGER NOT NULL, first_token_ms REAL, turn_ms REAL);"
+            "CREATE INDEX IF NOT EXISTS turns_learner_time ON turns (learner_id, created_at);"
+            "CREATE INDEX IF NOT EXISTS turns_learner_scenario ON turns (learner_id, theme, scenario);"
+        )
+        self._reader = self._connect()
+        logger.info("Turn log stored in %s", path)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self._path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="turn_store_writer")
+
+    def append(self, entry: TurnEntry) -> None:
+        if len(self._pending) == self._pending.maxlen:
+            TURN_STORE_DROPPED.inc()
+        self._pending.append(entry)
+        if len(self._pending) >= self._batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            while self._pending:
+                batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+                started = time.perf_counter()
+                try:
+                    await asyncio.to_thread(self._write, [entry.row() for entry in batch])
+                except Exception:
+                    logger.exception("Failed to write %d turns to the turn log", len(batch))
+                    TURN_STORE_DROPPED.inc(len(batch))
+                    return
+                TURN_STORE_FLUSH_SECONDS.observe(time.perf_counter() - started)
+                self._written += len(batch)
+
+    def _write(self, rows: list[tuple]) -> None:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        with self._write_lock:
+            self._writer.execute("BEGIN IMMEDIATE")
+            try:
+                self._writer.executemany(f"INSERT INTO turns ({', '.join(_COLUMNS)}) VALUES ({placeholders})", rows)
+            except BaseException:
+                self._writer.execute("ROLLBACK")
+                raise
+            self._writer.execute("COMMIT")
+
+    async def _run(self) -> None:
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def history(
+        self,
+        learner_id: str,
+        *,
+        limit: int = 50,
+        before: float | None = None,
+        theme: str | None = None,
+        scenario: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Most recent turns first; pass the last ``created_at`` as ``before`` for the next page."""
+        sql = f"SELECT {', '.join(_COLUMNS)} FROM turns WHERE learner_id = ?"
+        params: list[Any] = [learner_id]
+        if before is not None:
+            sql += " AND created_at < ?"
+            params.append(before)
+        if theme:
+            sql += " AND theme = ?"
+            params.append(theme)
+        if scenario:
+            sql += " AND scenario = ?"
+            params.append(scenario)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(max(1, min(limit, 500)))
+        rows = await asyncio.to_thread(self._read, sql, tuple(params))
+        turns = []
+        for row in rows:
+            turn = dict(zip(_COLUMNS, row))
+            turn["paused"] = bool(turn["paused"])
+            turn["breakdown"] = json.loads(turn["breakdown"]) if turn["breakdown"] else None
+            turns.append(turn)
+        return turns
+
+    async def progress(self, learner_id: str, *, days: int = 30) -> dict[str, Any]:
+        """Totals, per-scenario averages and a daily score trend for one learner."""
+        since = time.time() - days * 86400
+
+        def _query() -> dict[str, Any]:
+            total = self._read(
+                "SELECT COUNT(*), AVG(score), AVG(tutor_score), MIN(created_at), MAX(created_at)"
+                " FROM turns WHERE learner_id = ?",
+                (learner_id,),
+            )[0]
+            scenarios = self._read(
+                "SELECT theme, scenario, COUNT(*), AVG(score), AVG(tutor_score), MAX(created_at)"
+                " FROM turns WHERE learner_id = ? GROUP BY theme, scenario ORDER BY MAX(created_at) DESC",
+                (learner_id,),
+            )
+            daily = self._read(
+                "SELECT date(created_at, 'unixepoch') AS day, COUNT(*), AVG(score), AVG(tutor_score)"
+                " FROM turns WHERE learner_id = ? AND created_at >= ? GROUP BY day ORDER BY day",
+                (learner_id, since),
+            )
+            return {"total": total, "scenarios": scenarios, "daily": daily}
+
+        result = await asyncio.to_thread(_query)
+        turns, avg_score, avg_tutor_score, first_at, last_at = result["total"]
+        return {
+            "learner_id": learner_id,
+            "turns": turns,
+            "avg_score": _round(avg_score),
+            "avg_tutor_score": _round(avg_tutor_score),
+            "first_turn_at": first_at,
+            "last_turn_at": last_at,
+            "scenarios": [
+                {
+                    "theme": theme,
+                    "scenario": scenario,
+                    "turns": count,
+                    "avg_score": _round(score),
+                    "avg_tutor_score": _round(tutor_score),
+                    "last_turn_at": last,
+                }
+                for theme, scenario, count, score, tutor_score, last in result["scenarios"]
+            ],
+            "daily": [
+                {"day": day, "turns": count, "avg_score": _round(score), "avg_tutor_score": _round(tutor_score)}
+                for day, count, score, tutor_score in result["daily"]
+            ],
+        }
+
+    def _read(self, sql: str, params: tuple = ()) -> list[tuple]:
+        with self._read_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "path": str(self._path),
+            "pending": len(self._pending),
+            "written": self._written,
+            "dropped": TURN_STORE_DROPPED.value,
+        }
+
+    async def close(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
+        with self._write_lock:
+            self._writer.close()
+        with self._read_lock:
+            self._reader.close()
+
+
+def _round(value: float | None) -> float | None:
+    return None if value is None else round(value, 1)
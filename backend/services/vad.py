@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..pronunciation import SILENCE_DBFS, VAD_MARGIN_DB
+from .metrics import VAD_AUTO_END_TURNS, VAD_DROPPED_BYTES
+
+_EPS = 1e-10
+# Per-frame rate at which the noise floor creeps up towards louder background noise.
+FLOOR_RISE_PER_FRAME = 0.005
+
+
+@dataclass
+class VadResult:
+    """What to forward upstream from one chunk, and whether it started or ended speech."""
+
+    audio: bytes
+    speech_started: bool = False
+    turn_ended: bool = False
+
+
+class StreamingVAD:
+    """Energy-based voice activity detector for a live 16-bit PCM stream.
+
+    Frame energies are computed for a whole chunk at once; a frame is voiced
+    when it is ``margin_db`` above an adaptive noise floor (which drops
+    immediately to quieter frames and rises slowly towards louder background
+    noise).  Silence before speech is dropped except for a ``pre_roll_ms``
+    lead-in, and once speech has been followed by ``hangover_ms`` of silence
+    the turn is reported as ended and the rest of the silence is dropped.
+    """
+
+    def __init__(
+        self,
+        *,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        hangover_ms: int = 900,
+        pre_roll_ms: int = 200,
+        min_speech_ms: int = 60,
+        margin_db: float = VAD_MARGIN_DB,
+        min_level_db: float = SILENCE_DBFS,
+    ) -> None:
+        self._frame_samples = sample_rate * frame_ms // 1000
+        self._frame_bytes = self._frame_samples * 2
+        self._hangover_frames = max(1, hangover_ms // frame_ms)
+        self._min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self._pre_roll: deque[bytes] = deque(maxlen=max(self._min_speech_frames, pre_roll_ms // frame_ms))
+        self._margin_db = margin_db
+        self._min_level_db = min_level_db
+        self._floor_db: float | None = None
+        self._carry = b""
+        self._in_speech = False
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.ended_turn = False
+
+    @property
+    def in_speech(self) -> bool:
+        return self._in_speech
+
+    @property
+    def noise_floor_db(self) -> float | None:
+        return self._floor_db
+
+    def reset(self) -> None:
+        """Start a new turn; the learned noise floor is kept."""
+        VAD_DROPPED_BYTES.inc(len(self._carry) + len(self._pre_roll) * self._frame_bytes)
+        self._carry = b""
+        self._pre_roll.clear()
+        self._in_speech = False
+        self._voiced_run = 0
+        self._silent_run = 0
+        self.ended_turn = False
+
+    def process(self, pcm: bytes | bytearray | memoryview) -> VadResult:
+        data = self._carry + bytes(pcm)
+        n_frames = len(data) // self._frame_bytes
+        self._carry = data[n_frames * self._frame_bytes :]
+        if not n_frames:
+            return VadResult(audio=b"")
+        frames = np.frombuffer(data, dtype="<i2", count=n_frames * self._frame_samples)
+        frames = frames.reshape(n_frames, self._frame_samples).astype(np.float32) / 32768.0
+        frame_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + _EPS)
+        if self._floor_db is None:
+            # Start low enough that a learner who speaks straight away is still detected.
+            self._floor_db = min(float(frame_db.min()), self._min_level_db - self._margin_db)
+        voiced = frame_db > max(self._floor_db + self._margin_db, self._min_level_db)
+        self._adapt_floor(frame_db)
+
+        forwarded: list[bytes] = []
+        result = VadResult(audio=b"")
+        for index, is_voiced in enumerate(voiced.tolist()):
+            frame = data[index * self._frame_bytes : (index + 1) * self._frame_bytes]
+            if not self._in_speech:
+                if len(self._pre_roll) == self._pre_roll.maxlen:
+                    VAD_DROPPED_BYTES.inc(self._frame_bytes)
+                self._pre_roll.append(frame)
+                self._voiced_run = self._voiced_run + 1 if is_voiced else 0
+                if self._voiced_run >= self._min_speech_frames:
+                    self._in_speech = True
+                    self._silent_run = 0
+                    self.ended_turn = False
+                    result.speech_started = True
+                    forwarded.extend(self._pre_roll)
+                    self._pre_roll.clear()
+                continue
+            forwarded.append(frame)
+            self._silent_run = 0 if is_voiced else self._silent_run + 1
+            if self._silent_run >= self._hangover_frames:
+                self._in_speech = False
+                self._voiced_run = 0
+                self.ended_turn = True
+                result.turn_ended = True
+                VAD_AUTO_END_TURNS.inc()
+        result.audio = b"".join(forwarded)
+        return result
+
+    def _adapt_floor(self, frame_db: np.ndarray) -> None:
+        quietest = float(frame_db.min())
+        if quietest < self._floor_db:
+            self._floor_db = quietest
+        else:
+            rate = 1.0 - (1.0 - FLOOR_RISE_PER_FRAME) ** frame_db.size
+            self._floor_db += rate * (quietest - self._floor_db)
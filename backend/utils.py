@@ -3,6 +3,14 @@ from __future__ import annotations
 import numpy as np
 
 
+def score_from_signal_stats(*, mean_abs: float, zero_crossings: float) -> int:
+    """Combine mean absolute amplitude and zero-crossing count into a 0-100 score."""
+    energy_score = min(100.0, mean_abs / 1000.0)
+    rhythm_score = min(100.0, zero_crossings / 100.0)
+    final_score = int(0.6 * energy_score + 0.4 * rhythm_score)
+    return max(0, min(100, final_score))
+
+
 def calculate_pronunciation_score(audio_data: bytes) -> int:
     """Approximate pronunciation score using simple signal features."""
     if not audio_data:
@@ -13,9 +21,7 @@ def calculate_pronunciation_score(audio_data: bytes) -> int:
             return 60
         energy = float(np.mean(np.abs(audio_array)))
         zero_crossings = float(np.sum(np.abs(np.diff(np.signbit(audio_array)))))
-        energy_score = min(100.0, energy / 1000.0)
-        rhythm_score = min(100.0, zero_crossings / 100.0)
-        final_score = int(0.6 * energy_score + 0.4 * rhythm_score)
-        return max(0, min(100, final_score))
+        return score_from_signal_stats(mean_abs=energy, zero_crossings=zero_crossings)
     except Exception:  # pragma: no cover - defensive fallback
         return 70
+
@@ -0,0 +1,159 @@
+"""Worker cold start: import time, time to first ``/health`` and to the first websocket accept.
+
+Runs ``import backend.app`` in fresh interpreters, then for each
+``STARTUP_WARMUP`` mode starts ``uvicorn backend.app:app`` against an
+in-process mock Gemini Live (real ``TTSClient`` construction, no network) and
+measures from process spawn until ``/health`` answers, until a
+``/ws/conversation`` client receives its first message, and until the
+background warm-up has finished (``warmed_up`` in ``/health``).
+
+    python -m benchmarks.bench_cold_start --runs 5
+    python -m benchmarks.bench_cold_start --modes background,eager --json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from websockets.asyncio.client import connect
+
+from benchmarks.mock_gemini_live import MockGeminiLive
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+POLL_SECONDS = 0.005
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _import_seconds() -> float:
+    code = "import time; t = time.perf_counter(); import backend.app; print(time.perf_counter() - t)"
+    env = {**os.environ, "LOG_LEVEL": "WARNING"}
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+async def _get_health(port: int) -> dict | None:
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    except OSError:
+        return None
+    try:
+        writer.write(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+        response = await reader.read()
+    finally:
+        writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    if not head.startswith(b"HTTP/1.1 200"):
+        return None
+    return json.loads(body)
+
+
+async def _start_once(mode: str, mock_port: int, timeout: float) -> dict[str, float]:
+    port = _free_port()
+    state_dir = tempfile.TemporaryDirectory()
+    env = {
+        **os.environ,
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "mock"),
+        "GEMINI_LIVE_URL": f"ws://127.0.0.1:{mock_port}/ws",
+        "TTS_BACKEND": "gemini",
+        "STARTUP_WARMUP": mode,
+        "SENTENCE_BANK": "0",
+        "SESSION_REGISTRY_PATH": str(Path(state_dir.name) / "sessions.sqlite3"),
+        "TURN_STORE_PATH": str(Path(state_dir.name) / "turns.sqlite3"),
+        "TTS_CACHE_DISK_BYTES": "0",
+        "LOG_LEVEL": "WARNING",
+        # The mock is local; never route it through a configured proxy.
+        "HTTP_PROXY": "",
+    }
+    spawned = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.app:app", "--port", str(port), "--log-level", "warning"],
+        cwd=REPO_ROOT,
+        env=env,
+        # After the measured accept, the tutor's greeting asks the real TTS API for
+        # audio, which fails without network access; keep that noise out of the report.
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = spawned + timeout
+        while (health := await _get_health(port)) is None:
+            if time.perf_counter() > deadline or server.poll() is not None:
+                raise TimeoutError(f"backend did not answer /health within {timeout:.0f}s")
+            await asyncio.sleep(POLL_SECONDS)
+        first_health = time.perf_counter() - spawned
+        async with connect(f"ws://127.0.0.1:{port}/ws/conversation") as ws:
+            await asyncio.wait_for(ws.recv(), timeout)
+            first_accept = time.perf_counter() - spawned
+        while not health.get("warmed_up") and mode != "lazy":
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"warm-up did not finish within {timeout:.0f}s")
+            await asyncio.sleep(POLL_SECONDS)
+            health = await _get_health(port) or health
+        warmed = time.perf_counter() - spawned if mode != "lazy" else float("nan")
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        state_dir.cleanup()
+    return {"first_health": first_health, "first_accept": first_accept, "warmed_up": warmed}
+
+
+async def _run(args: argparse.Namespace) -> dict[str, object]:
+    imports = [_import_seconds() for _ in range(args.runs)]
+    summary: dict[str, object] = {"import_ms": round(statistics.median(imports) * 1000, 1)}
+    mock = MockGeminiLive()
+    mock_server = await mock.serve()
+    mock_port = mock_server.sockets[0].getsockname()[1]
+    try:
+        for mode in args.modes.split(","):
+            runs = [await _start_once(mode, mock_port, args.timeout) for _ in range(args.runs)]
+            summary[mode] = {
+                key: round(statistics.median(run[key] for run in runs) * 1000, 1) for key in runs[0]
+            }
+    finally:
+        mock_server.close()
+        await mock_server.wait_closed()
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="cold starts per mode (medians are reported)")
+    parser.add_argument("--modes", default="background,lazy,eager", help="comma-separated STARTUP_WARMUP modes")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps(summary))
+        return
+    print(f"import backend.app: {summary['import_ms']:.1f} ms (median of {args.runs})")
+    for mode in args.modes.split(","):
+        result = summary[mode]
+        print(
+            f"  {mode:<10} first /health {result['first_health']:7.1f} ms"
+            f"  first ws accept {result['first_accept']:7.1f} ms"
+            f"  warmed up {result['warmed_up']:7.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Cost of the production profiling tools on a busy event loop.
+
+Runs a worker-like workload — concurrent tasks that decode base64 audio,
+score it and JSON-encode replies, yielding to the loop between steps — with
+nothing installed, with session task tracking plus the stall watchdog (always
+on in the server), and additionally with the sampling profiler running.  The
+modes are interleaved over several rounds and the median throughput of each is
+reported against the baseline.
+
+    python -m benchmarks.bench_profiling_overhead --seconds 3 --rounds 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import statistics
+import time
+
+import numpy as np
+
+from backend.services.client_writer import dumps_json
+from backend.services.profiling import LoopWatchdog, SamplingProfiler, bind_session, track_session_tasks
+from backend.utils import calculate_pronunciation_score
+
+# 100 ms of 16 kHz PCM, as the browser sends it.
+CHUNK = base64.b64encode(np.random.default_rng(0).integers(-3000, 3000, 1600, dtype=np.int16).tobytes()).decode()
+
+
+async def _conversation(session_id: str, deadline: float, done: list[int]) -> None:
+    bind_session(session_id)
+    while time.perf_counter() < deadline:
+        score = calculate_pronunciation_score(base64.b64decode(CHUNK))
+        dumps_json({"type": "partial-response", "text": "Nice try! " * 8, "score": score})
+        done[0] += 1
+        await asyncio.sleep(0)
+
+
+async def _measure(mode: str, args: argparse.Namespace) -> float:
+    loop = asyncio.get_running_loop()
+    watchdog = LoopWatchdog(threshold=0.1)
+    if mode != "baseline":
+        track_session_tasks(loop)
+        watchdog.start()
+    done = [0]
+    deadline = time.perf_counter() + args.seconds
+    work = [asyncio.create_task(_conversation(f"s{index}", deadline, done)) for index in range(args.sessions)]
+    if mode.startswith("profiler"):
+        interval = 1 / int(mode.partition("@")[2].removesuffix("hz"))
+        await SamplingProfiler(loop).profile(args.seconds, interval=interval, by_session=True)
+    await asyncio.gather(*work)
+    await watchdog.stop()
+    loop.set_task_factory(None)
+    return done[0] / args.seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0, help="length of each run")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--sessions", type=int, default=50)
+    args = parser.parse_args()
+    modes = ("baseline", "watchdog", "profiler@100hz", "profiler@1000hz")
+    rates: dict[str, list[float]] = {mode: [] for mode in modes}
+    for _ in range(args.rounds):
+        for mode in modes:
+            rates[mode].append(asyncio.run(_measure(mode, args)))
+    baseline = statistics.median(rates["baseline"])
+    for mode in modes:
+        rate = statistics.median(rates[mode])
+        print(f"  {mode:<16} {rate:10.0f} steps/s  {(rate / baseline - 1) * 100:+6.1f}%")
+
+
+if __name__ == "__main__":
+    main()
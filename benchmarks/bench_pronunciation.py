@@ -0,0 +1,63 @@
+"""CPU budget check for ``backend.pronunciation.analyze_pronunciation``.
+
+Synthesises speech-like PCM (harmonic voice with gliding pitch, ~4 syllables/s,
+pauses and leading/trailing silence), analyses it and fails with exit status 1
+when CPU time per second of audio exceeds ``--budget-ms``.
+
+    python -m benchmarks.bench_pronunciation --seconds 30 --budget-ms 2.0
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from backend.pronunciation import SAMPLE_RATE, analyze_pronunciation
+from backend.utils import calculate_pronunciation_score
+
+
+def synthetic_speech(seconds: float, *, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 150.0 + 30.0 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    syllables = 0.3 + 0.7 * np.sin(2 * np.pi * 2.0 * t) ** 2
+    phrases = (np.sin(2 * np.pi * 0.2 * t) > -0.6).astype(float)
+    edges = (t > 0.5) & (t < seconds - 0.5)
+    signal = 6000.0 * voice * syllables * phrases * edges + rng.normal(0, 60, t.size)
+    return np.clip(signal, -32768, 32767).astype(np.int16)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--budget-ms", type=float, default=2.0, help="max CPU ms per second of audio")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = synthetic_speech(args.seconds)
+    analyze_pronunciation(samples[:SAMPLE_RATE])
+    cpu_times = []
+    for _ in range(args.repeats):
+        started = time.process_time()
+        breakdown = analyze_pronunciation(samples)
+        cpu_times.append(time.process_time() - started)
+    started = time.process_time()
+    legacy_score = calculate_pronunciation_score(samples.tobytes())
+    legacy_ms = (time.process_time() - started) * 1000
+
+    per_second_ms = min(cpu_times) * 1000 / args.seconds
+    print(json.dumps(breakdown.to_dict(), indent=2))
+    print(f"legacy score {legacy_score} ({legacy_ms / args.seconds:.3f} ms CPU per audio second)")
+    print(f"analysis: {per_second_ms:.3f} ms CPU per audio second (budget {args.budget_ms:.3f} ms)")
+    if per_second_ms > args.budget_ms:
+        print("FAIL: pronunciation analysis exceeded its CPU budget", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Event-loop lag while N learners finish their turns at the same moment.
+
+Each simulated turn-end analyzes ``--seconds`` of 16 kHz PCM through
+``ScoringEngine.analyze`` (as the app does for ``score_breakdown``) while a
+ticker task measures how late the loop wakes it.  ``unbatched`` is the thread
+mode dispatching every turn on its own; the engine modes coalesce concurrent
+turn-ends into one dispatch.
+
+    python -m benchmarks.bench_scoring_loop_lag --turns 32 --seconds 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import numpy as np
+
+from backend.pronunciation import analyze_pronunciation
+from backend.services.scoring import SCORING_MODES, ScoringEngine
+
+from .bench_pronunciation import synthetic_speech
+
+SAMPLE_RATE = 16000
+TICK_SECONDS = 0.001
+
+
+async def _ticker(stop: asyncio.Event, lags: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def _inline_legacy(turns: list[np.ndarray]) -> None:
+    # The pre-engine behaviour: analyze each turn synchronously on the loop.
+    for turn in turns:
+        analyze_pronunciation(turn)
+        await asyncio.sleep(0)
+
+
+async def _run_mode(mode: str, turns: list[np.ndarray]) -> dict[str, float]:
+    engine = None
+    if mode == "unbatched":
+        # Thread mode: a second process pool in this interpreter would share the resource tracker.
+        engine = ScoringEngine(mode="thread", max_batch=1)
+    elif mode != "legacy":
+        engine = ScoringEngine(mode=mode)
+    if engine:
+        await asyncio.to_thread(engine.warm_up)
+        await engine.analyze(turns[0][:SAMPLE_RATE])
+    lags: list[float] = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(0.02)
+    started = time.perf_counter()
+    if engine:
+        await asyncio.gather(*(engine.analyze(turn) for turn in turns))
+    else:
+        await _inline_legacy(turns)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    if engine:
+        engine.shutdown()
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "elapsed_ms": elapsed * 1000,
+        "lag_p50_ms": statistics.median(lags_ms),
+        "lag_p99_ms": lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))],
+        "lag_max_ms": lags_ms[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=32, help="concurrent turn-ends")
+    parser.add_argument("--seconds", type=float, default=20.0, help="audio per turn")
+    args = parser.parse_args()
+
+    turns = [synthetic_speech(args.seconds, seed=index) for index in range(args.turns)]
+    print(f"{args.turns} concurrent turn-ends x {args.seconds:.0f} s of audio")
+    for mode in ("legacy", "unbatched", *(mode for mode in SCORING_MODES if mode != "auto")):
+        result = asyncio.run(_run_mode(mode, turns))
+        print(
+            f"  {mode:<9} total {result['elapsed_ms']:8.1f} ms  loop lag p50 {result['lag_p50_ms']:6.2f} ms"
+            f"  p99 {result['lag_p99_ms']:7.2f} ms  max {result['lag_max_ms']:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""CPU per static request: Starlette ``StaticFiles`` vs the in-memory ``StaticAssets`` app.
+
+Drives both ASGI apps directly (no sockets) with the requests a page load
+makes — ``/``, the stylesheet and the script, gzip accepted — plus the
+conditional revalidation a returning browser sends, and reports microseconds
+of CPU per request and bytes sent per page load.
+
+    python -m benchmarks.bench_static_assets --requests 3000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from starlette.staticfiles import StaticFiles
+
+from backend.services.static_assets import StaticAssets
+
+FRONTEND_DIR = Path(__file__).resolve().parents[1] / "frontend"
+PAGE = ("/", "/styles.css", "/practice.js")
+
+
+async def _request(app, path: str, headers: list[tuple[bytes, bytes]]) -> tuple[int, int, list]:
+    scope = {
+        "type": "http",
+        # As uvicorn reports it; with older specs file responses also poll ``receive`` for a disconnect.
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "method": "GET",
+        "path": path,
+        "root_path": "",
+        "headers": headers,
+        "query_string": b"",
+    }
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = sent[0]["status"]
+    body = sum(len(message.get("body", b"")) for message in sent[1:])
+    return status, body, sent[0]["headers"]
+
+
+async def _measure(app, requests: int, revalidate: bool) -> tuple[float, int]:
+    accept = [(b"accept-encoding", b"gzip, deflate, br")]
+    validators: dict[str, list[tuple[bytes, bytes]]] = {}
+    for path in PAGE:
+        _, _, headers = await _request(app, path, accept)
+        etag = dict(headers).get(b"etag")
+        validators[path] = [*accept, (b"if-none-match", etag)] if revalidate and etag else accept
+    page_bytes = 0
+    for path in PAGE:
+        page_bytes += (await _request(app, path, validators[path]))[1]
+    started = time.process_time()
+    for index in range(requests):
+        path = PAGE[index % len(PAGE)]
+        await _request(app, path, validators[path])
+    return (time.process_time() - started) / requests * 1e6, page_bytes
+
+
+async def _run(args: argparse.Namespace) -> None:
+    assets = StaticAssets(FRONTEND_DIR)
+    assets.load()
+    apps = {"StaticFiles": StaticFiles(directory=FRONTEND_DIR, html=True), "StaticAssets": assets}
+    for revalidate in (False, True):
+        label = "revalidation (If-None-Match)" if revalidate else "first visit"
+        print(label)
+        for name, app in apps.items():
+            cpu_us, page_bytes = await _measure(app, args.requests, revalidate)
+            print(f"  {name:<12} {cpu_us:8.1f} us CPU/request  {page_bytes / 1024:7.1f} KiB/page load")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    args = parser.parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""End-to-end load test: N concurrent learners against a local backend and mock Gemini.
+
+Starts :mod:`benchmarks.mock_gemini_live` in-process and ``uvicorn
+backend.app:app`` in a subprocess (``TTS_BACKEND=fake``), then opens
+``--sessions`` websocket clients that each stream synthetic 16 kHz PCM for
+``--turns`` turns.  Reports p50/p99 turn latency (end-turn, or with ``--vad``
+the end of the learner's audio, to ``final-response``), time to first audio, websocket bytes per session in each
+direction, and the server's CPU seconds and RSS growth per session.  Exits 1
+when ``--max-p99-ms`` is exceeded, for CI.
+
+    python -m benchmarks.load_conversation --sessions 20 --turns 3
+    python -m benchmarks.load_conversation --codec opus   # needs PyAV
+    python -m benchmarks.load_conversation --vad          # let the server VAD end each turn
+    # Long sessions where the mock slows down as its context grows:
+    python -m benchmarks.load_conversation --sessions 4 --turns 40 --context-ms-per-1k-tokens 40
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import suppress
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+from websockets.asyncio.client import connect
+
+from backend.services.audio_transport import AUDIO_FRAME_HEADER
+from benchmarks.bench_pronunciation import synthetic_speech
+from benchmarks.mock_gemini_live import MockGeminiConfig, MockGeminiLive
+
+SAMPLE_RATE = 16000
+CHUNK_MS = 20
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@dataclass
+class SessionResult:
+    first_token: float | None = None
+    turn_latencies: list[float] = field(default_factory=list)
+    first_audio: list[float] = field(default_factory=list)
+    bytes_up: int = 0
+    bytes_down: int = 0
+    error: str | None = None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _process_tree(pid: int) -> list[int]:
+    """``pid`` plus all descendants (uvicorn workers, scoring processes)."""
+    pids = [pid]
+    for parent in pids:
+        for children in Path(f"/proc/{parent}/task").glob("*/children"):
+            with suppress(FileNotFoundError):
+                pids.extend(int(child) for child in children.read_text().split())
+    return pids
+
+
+def _process_cpu_seconds(pid: int) -> float:
+    total = 0.0
+    for member in _process_tree(pid):
+        try:
+            with open(f"/proc/{member}/stat") as stat:
+                fields = stat.read().rsplit(")", 1)[1].split()
+        except FileNotFoundError:
+            continue
+        # utime and stime are fields 14 and 15 of /proc/<pid>/stat.
+        total += (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    return total
+
+
+def _process_rss_bytes(pid: int) -> int:
+    total = 0
+    for member in _process_tree(pid):
+        try:
+            with open(f"/proc/{member}/status") as status:
+                for line in status:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except FileNotFoundError:
+            continue
+    return total
+
+
+async def _wait_for_server(port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            await asyncio.sleep(0.1)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        return
+    raise TimeoutError(f"backend did not start on port {port} within {timeout:.0f}s")
+
+
+async def _await_reply(
+    ws, started: float, result: SessionResult, timeout: float, expect_audio: bool, turn: int = 0
+) -> None:
+    """Wait for the final response (and first audio) of server turn ``turn``.
+
+    Audio of an earlier turn can still be streaming in; it is counted as
+    traffic but not as this turn's first audio.
+    """
+    got_final = False
+    got_audio = not expect_audio
+    deadline = started + timeout
+    while not (got_final and got_audio):
+        raw = await asyncio.wait_for(ws.recv(), max(0.01, deadline - time.perf_counter()))
+        result.bytes_down += len(raw)
+        now = time.perf_counter() - started
+        if isinstance(raw, bytes):
+            # Binary transport: every binary frame from the server is TTS audio.
+            if not got_audio and AUDIO_FRAME_HEADER.unpack_from(raw)[3] == turn:
+                result.first_audio.append(now)
+                got_audio = True
+            continue
+        message = json.loads(raw)
+        kind = message.get("type")
+        if kind == "partial-response" and result.first_token is None:
+            result.first_token = now
+        elif kind == "audio-chunk" and not got_audio and message.get("turn") == turn:
+            result.first_audio.append(now)
+            got_audio = True
+        elif kind == "final-response":
+            got_final = True
+            if message.get("audio") and not got_audio:
+                result.first_audio.append(now)
+                got_audio = True
+            elif not message.get("audio_streamed"):
+                got_audio = True
+            result.turn_latencies.append(now)
+        elif kind == "error":
+            raise RuntimeError(message.get("message"))
+
+
+def _uplink_frames(pcm: bytes, codec: str) -> list[bytes]:
+    """The learner's audio as the browser would send it: 20 ms PCM chunks or Opus packets."""
+    if codec != "opus":
+        chunk_bytes = SAMPLE_RATE * 2 * CHUNK_MS // 1000
+        return [pcm[offset : offset + chunk_bytes] for offset in range(0, len(pcm), chunk_bytes)]
+    import av
+
+    encoder = av.CodecContext.create("libopus", "w")
+    encoder.sample_rate = SAMPLE_RATE
+    encoder.layout = "mono"
+    encoder.format = "s16"
+    encoder.bit_rate = 16000
+    encoder.options = {"application": "voip", "frame_duration": str(CHUNK_MS)}
+    frame = av.AudioFrame.from_ndarray(np.frombuffer(pcm, dtype="<i2").reshape(1, -1), format="s16", layout="mono")
+    frame.sample_rate = SAMPLE_RATE
+    frame.pts = 0
+    return [bytes(packet) for packet in (*encoder.encode(frame), *encoder.encode(None))]
+
+
+async def _send_frames(ws, frames: list[bytes], pace: float, result: SessionResult) -> None:
+    for frame in frames:
+        await ws.send(frame)
+        result.bytes_up += len(frame)
+        if pace:
+            await asyncio.sleep(pace)
+
+
+async def _run_session(
+    port: int, args: argparse.Namespace, frames: list[bytes], silence: list[bytes]
+) -> SessionResult:
+    result = SessionResult()
+    pace = CHUNK_MS / 1000 / args.speed if args.speed > 0 else 0.0
+    params = []
+    if args.codec != "json":
+        params.append(f"codecs={args.codec}")
+    if args.vad:
+        params.append("vad=1")
+    query = "?" + "&".join(params) if params else ""
+    try:
+        connecting = time.perf_counter()
+        async with connect(f"ws://127.0.0.1:{port}/ws/conversation{query}", max_size=None) as ws:
+            # The tutor's greeting answers the setup prompt; its first delta measures connect-to-first-token.
+            greeting = SessionResult()
+            await _await_reply(ws, connecting, greeting, args.timeout, expect_audio=False)
+            result.first_token = greeting.first_token
+            result.bytes_down += greeting.bytes_down
+            for turn_id in range(1, args.turns + 1):
+                await _send_frames(ws, frames, pace, result)
+                turn = SessionResult()
+                if silence:
+                    # Keep the microphone "open" and let the server's VAD decide the turn is over.
+                    started = time.perf_counter()
+                    trailing = asyncio.create_task(_send_frames(ws, silence, pace, result))
+                    try:
+                        await _await_reply(ws, started, turn, args.timeout, expect_audio=True, turn=turn_id)
+                    finally:
+                        await trailing
+                else:
+                    await ws.send(json.dumps({"type": "end-turn"}))
+                    await _await_reply(ws, time.perf_counter(), turn, args.timeout, expect_audio=True, turn=turn_id)
+                result.turn_latencies.extend(turn.turn_latencies)
+                result.first_audio.extend(turn.first_audio)
+                result.bytes_down += turn.bytes_down
+    except Exception as exc:
+        result.error = f"{type(exc).__name__}: {exc}"
+    return result
+
+
+async def _run(args: argparse.Namespace) -> dict[str, float | int]:
+    mock = MockGeminiLive(
+        MockGeminiConfig(
+            latency=args.gemini_latency_ms / 1000,
+            tokens_per_second=args.tokens_per_second,
+            context_latency_per_1k_tokens=args.context_ms_per_1k_tokens / 1000,
+        )
+    )
+    mock_server = await mock.serve()
+    mock_port = mock_server.sockets[0].getsockname()[1]
+    port = _free_port()
+    registry_dir = tempfile.TemporaryDirectory()
+    env = {
+        **os.environ,
+        "GOOGLE_API_KEY": os.environ.get("GOOGLE_API_KEY", "mock"),
+        "GEMINI_LIVE_URL": f"ws://127.0.0.1:{mock_port}/ws",
+        "TTS_BACKEND": "fake",
+        "TTS_FAKE_LATENCY_MS": str(args.tts_latency_ms),
+        "TTS_CACHE_DISK_BYTES": "0",
+        "LOG_LEVEL": "WARNING",
+        "WEB_CONCURRENCY": str(args.workers),
+        "SESSION_REGISTRY_PATH": str(Path(registry_dir.name) / "sessions.sqlite3"),
+        "TURN_STORE_PATH": str(Path(registry_dir.name) / "turns.sqlite3"),
+        "SENTENCE_BANK": "0",
+        **({"GEMINI_CONTEXT_MAX_TOKENS": str(args.context_max_tokens)} if args.context_max_tokens >= 0 else {}),
+        # The mock is local; never route it through a configured proxy.
+        "HTTP_PROXY": "",
+    }
+    server = subprocess.Popen(
+        [
+            *(sys.executable, "-m", "uvicorn", "backend.app:app"),
+            *("--port", str(port), "--workers", str(args.workers), "--log-level", "warning"),
+        ],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+    try:
+        await _wait_for_server(port, timeout=30)
+        # Give every worker time to finish startup and pre-warm its session pool.
+        await asyncio.sleep(0.5 + 0.5 * args.workers)
+        cpu_before = _process_cpu_seconds(server.pid)
+        rss_before = _process_rss_bytes(server.pid)
+        rss_peak = rss_before
+        frames = _uplink_frames(synthetic_speech(args.speech_seconds).tobytes(), args.codec)
+        silence: list[bytes] = []
+        if args.vad:
+            noise = np.random.default_rng(1).normal(0, 60, int(args.vad_silence_seconds * SAMPLE_RATE))
+            silence = _uplink_frames(noise.astype(np.int16).tobytes(), args.codec)
+
+        started = time.perf_counter()
+        sessions = asyncio.gather(*(_run_session(port, args, frames, silence) for _ in range(args.sessions)))
+        while not sessions.done():
+            rss_peak = max(rss_peak, _process_rss_bytes(server.pid))
+            await asyncio.wait({sessions}, timeout=0.2)
+        results: list[SessionResult] = sessions.result()
+        elapsed = time.perf_counter() - started
+        cpu_used = _process_cpu_seconds(server.pid) - cpu_before
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+        mock_server.close()
+        await mock_server.wait_closed()
+        registry_dir.cleanup()
+
+    errors = [result.error for result in results if result.error]
+    for error in sorted(set(errors)):
+        print(f"  session error: {error}", file=sys.stderr)
+    turns = [latency for result in results for latency in result.turn_latencies]
+    first_audio = [latency for result in results for latency in result.first_audio]
+    first_tokens = [result.first_token for result in results if result.first_token is not None]
+    # Compare each session's first and last quarter of turns to see whether latency grows with the session.
+    quarter = max(1, args.turns // 4)
+    early = [latency for result in results for latency in result.turn_latencies[:quarter]]
+    late = [latency for result in results for latency in result.turn_latencies[-quarter:]]
+    return {
+        "sessions": args.sessions,
+        "workers": args.workers,
+        "errors": len(errors),
+        "turns": len(turns),
+        "elapsed_s": round(elapsed, 2),
+        "turn_p50_ms": round(_percentile(turns, 0.5) * 1000, 1),
+        "turn_p99_ms": round(_percentile(turns, 0.99) * 1000, 1),
+        "early_turn_p50_ms": round(_percentile(early, 0.5) * 1000, 1),
+        "late_turn_p50_ms": round(_percentile(late, 0.5) * 1000, 1),
+        "first_audio_p50_ms": round(_percentile(first_audio, 0.5) * 1000, 1),
+        "first_audio_p99_ms": round(_percentile(first_audio, 0.99) * 1000, 1),
+        "first_token_p50_ms": round(statistics.median(first_tokens) * 1000, 1) if first_tokens else float("nan"),
+        "uplink_kib_per_session": round(sum(result.bytes_up for result in results) / args.sessions / 1024, 1),
+        "downlink_kib_per_session": round(sum(result.bytes_down for result in results) / args.sessions / 1024, 1),
+        "cpu_ms_per_session": round(cpu_used / args.sessions * 1000, 1),
+        "rss_kib_per_session": round((rss_peak - rss_before) / args.sessions / 1024, 1),
+        "upstream_connections": mock.stats.connections,
+        "max_context_tokens": mock.stats.max_context_tokens,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--speech-seconds", type=float, default=3.0, help="learner audio per turn")
+    parser.add_argument("--speed", type=float, default=4.0, help="audio streaming speed vs real time (0 = no pacing)")
+    parser.add_argument("--gemini-latency-ms", type=float, default=300.0)
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument("--tts-latency-ms", type=int, default=200)
+    parser.add_argument(
+        "--context-ms-per-1k-tokens", type=float, default=0.0, help="mock reply slowdown per 1k tokens of context"
+    )
+    parser.add_argument(
+        "--context-max-tokens", type=int, default=-1, help="server rollover threshold (0 = never; default: server's)"
+    )
+    parser.add_argument(
+        "--codec",
+        choices=("json", "pcm16", "opus"),
+        default="json",
+        help="audio transport: json (base64 downlink), binary pcm16 or opus",
+    )
+    parser.add_argument("--vad", action="store_true", help="send trailing silence instead of end-turn")
+    parser.add_argument("--vad-silence-seconds", type=float, default=1.5)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-turn timeout in seconds")
+    parser.add_argument("--max-p99-ms", type=float, default=0.0, help="fail when turn p99 exceeds this (0 = off)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = asyncio.run(_run(args))
+    if args.json:
+        print(json.dumps(summary))
+    else:
+        print(
+            f"{summary['sessions']} sessions x {args.turns} turns on {args.workers} worker(s)"
+            f" in {summary['elapsed_s']} s ({summary['errors']} errors)"
+        )
+        print(f"  turn latency   p50 {summary['turn_p50_ms']:8.1f} ms  p99 {summary['turn_p99_ms']:8.1f} ms")
+        print(f"  first audio    p50 {summary['first_audio_p50_ms']:8.1f} ms  p99 {summary['first_audio_p99_ms']:8.1f} ms")
+        print(f"  connect -> first token p50 {summary['first_token_p50_ms']:.1f} ms")
+        print(
+            f"  websocket traffic ({args.codec}) up {summary['uplink_kib_per_session']:.0f} KiB/session,"
+            f" down {summary['downlink_kib_per_session']:.0f} KiB/session"
+        )
+        print(f"  server CPU {summary['cpu_ms_per_session']:.1f} ms/session, RSS +{summary['rss_kib_per_session']:.0f} KiB/session")
+    if summary["errors"] or (args.max_p99_ms and summary["turn_p99_ms"] > args.max_p99_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Local stand-in for the Gemini Live BidiGenerateContent websocket.
+
+Speaks enough of the JSON protocol for the backend: acknowledges ``setup``,
+answers every completed client turn with a bilingual reply streamed as
+``serverContent`` text deltas at ``--tokens-per-second``, then sends
+``turnComplete``.  Audio in ``realtime_input`` is accepted and counted.
+
+Each connection keeps a rough token count of its context (system
+instruction, turns, audio at 32 tokens per second, replies), reports it as
+``usageMetadata`` and, with ``--context-ms-per-1k-tokens``, answers more
+slowly as it grows, like the real service does over a long session.
+
+    python -m benchmarks.mock_gemini_live --port 9100
+    GEMINI_LIVE_URL=ws://127.0.0.1:9100/ws TTS_BACKEND=fake uvicorn backend.app:app
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from itertools import cycle
+
+from websockets.asyncio.server import Server, ServerConnection, serve
+from websockets.exceptions import ConnectionClosed
+
+logger = logging.getLogger(__name__)
+
+REPLIES = (
+    "Good job! Your pronunciation score is 86. Watch the vowel in 'weather'. "
+    "Next, try: The weather is lovely today, isn't it?\n---\n做得好！发音评分 86 分。注意 weather 中的元音。"
+    "下一句：今天天气真好，不是吗？",
+    "Nice try! Score: 78. Link the words in 'check in' more smoothly. "
+    "Please repeat: I'd like to check in, please.\n---\n不错！评分 78 分。check in 两个词要连读。请跟读：我想办理入住。",
+    "Excellent! Score: 92. Your intonation rose naturally at the end. "
+    "Now say: Could you recommend a good restaurant nearby?\n---\n很棒！评分 92 分。句尾语调自然上扬。"
+    "接下来请说：你能推荐附近一家好餐厅吗？",
+)
+
+
+@dataclass
+class MockGeminiConfig:
+    latency: float = 0.3
+    tokens_per_second: float = 80.0
+    chars_per_token: int = 4
+    setup_latency: float = 0.05
+    # Extra reply latency per 1,000 tokens of context already on the connection.
+    context_latency_per_1k_tokens: float = 0.0
+
+
+@dataclass
+class MockGeminiStats:
+    connections: int = 0
+    turns: int = 0
+    audio_frames: int = 0
+    audio_bytes: int = 0
+    max_context_tokens: int = 0
+    active: set[ServerConnection] = field(default_factory=set)
+
+
+class MockGeminiLive:
+    def __init__(self, config: MockGeminiConfig | None = None) -> None:
+        self.config = config or MockGeminiConfig()
+        self.stats = MockGeminiStats()
+        self._replies = cycle(REPLIES)
+
+    async def handle(self, ws: ServerConnection) -> None:
+        self.stats.connections += 1
+        self.stats.active.add(ws)
+        responder: asyncio.Task[None] | None = None
+        # Single-element list so the responder task can add its reply.
+        context = [0]
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                if "setup" in message:
+                    instruction = message["setup"].get("system_instruction", {})
+                    context[0] += _text_tokens(instruction.get("parts", []))
+                    await asyncio.sleep(self.config.setup_latency)
+                    await ws.send(json.dumps({"setupComplete": {}}))
+                elif "realtime_input" in message:
+                    self.stats.audio_frames += 1
+                    for chunk in message["realtime_input"].get("media_chunks", []):
+                        nbytes = len(chunk.get("data", "")) * 3 // 4
+                        self.stats.audio_bytes += nbytes
+                        context[0] += nbytes // 1000
+                elif "client_content" in message:
+                    content = message["client_content"]
+                    for turn in content.get("turns", []):
+                        context[0] += _text_tokens(turn.get("parts", []))
+                    if content.get("turn_complete"):
+                        if responder is not None:
+                            await responder
+                        responder = asyncio.create_task(self._respond(ws, next(self._replies), context))
+        except ConnectionClosed:
+            pass
+        finally:
+            self.stats.active.discard(ws)
+            if responder is not None:
+                responder.cancel()
+
+    async def _respond(self, ws: ServerConnection, reply: str, context: list[int]) -> None:
+        self.stats.max_context_tokens = max(self.stats.max_context_tokens, context[0])
+        await asyncio.sleep(self.config.latency + context[0] / 1000 * self.config.context_latency_per_1k_tokens)
+        step = self.config.chars_per_token * 3
+        delay = 3 / self.config.tokens_per_second if self.config.tokens_per_second > 0 else 0.0
+        for start in range(0, len(reply), step):
+            delta = {"serverContent": {"modelTurn": {"parts": [{"text": reply[start : start + step]}]}}}
+            await ws.send(json.dumps(delta, ensure_ascii=False))
+            if delay:
+                await asyncio.sleep(delay)
+        context[0] += len(reply) // self.config.chars_per_token
+        complete = {"serverContent": {"turnComplete": True}, "usageMetadata": {"totalTokenCount": context[0]}}
+        await ws.send(json.dumps(complete))
+        self.stats.turns += 1
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0) -> Server:
+        """Start listening; ``port=0`` picks a free port (see ``Server.sockets``)."""
+        return await serve(self.handle, host, port, max_size=None)
+
+
+def _text_tokens(parts: list[dict]) -> int:
+    return sum(len(part.get("text", "")) for part in parts) // 4
+
+
+async def _main(args: argparse.Namespace) -> None:
+    mock = MockGeminiLive(
+        MockGeminiConfig(
+            latency=args.latency_ms / 1000,
+            tokens_per_second=args.tokens_per_second,
+            context_latency_per_1k_tokens=args.context_ms_per_1k_tokens / 1000,
+        )
+    )
+    server = await mock.serve(args.host, args.port)
+    port = server.sockets[0].getsockname()[1]
+    print(f"Mock Gemini Live listening on ws://{args.host}:{port}/ws")
+    await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="delay before the first delta")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0)
+    parser.add_argument(
+        "--context-ms-per-1k-tokens", type=float, default=0.0, help="extra reply delay per 1k tokens of context"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,10 @@ const ttsPlayer = document.querySelector('#ttsPlayer');
 
 const TARGET_SAMPLE_RATE = 16000;
 const CHUNK_DURATION_MS = 120;
+const TTS_SAMPLE_RATE = 24000;
+const OPUS_UPLINK_BITRATE = 16000;
+const AUDIO_FRAME_HEADER_BYTES = 12;
+const FRAME_CODECS = { 0: 'pcm16', 1: 'opus' };
 
 let websocket = null;
 let isConnected = false;
@@ -29,10 +33,99 @@ let recorderNode = null;
 let silentNode = null;
 let inputSampleRate = TARGET_SAMPLE_RATE;
 let bufferedFloat32 = new Float32Array(0);
+let playbackContext = null;
+let playbackCursor = 0;
+let opusEncoder = null;
+let opusDecoder = null;
+let captureTimestamp = 0;
+let playbackTimestamp = 0;
+
+function learnerId() {
+  // Survives reloads and new tabs so history and progress accumulate per learner.
+  let id = localStorage.getItem('learnerId');
+  if (!id) {
+    id = crypto.randomUUID ? crypto.randomUUID() : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    localStorage.setItem('learnerId', id);
+  }
+  return id;
+}
 
-function wsUrl() {
+function wsUrl(codecs) {
   const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-  return `${protocol}//${window.location.host}/ws/conversation`;
+  const params = new URLSearchParams();
+  const conversationId = sessionStorage.getItem('conversationId');
+  if (conversationId) {
+    params.set('session', conversationId);
+  }
+  params.set('learner', learnerId());
+  params.set('codecs', codecs);
+  // This page handles vad-end-turn, so let the server end turns on trailing silence.
+  params.set('vad', '1');
+  return `${protocol}//${window.location.host}/ws/conversation?${params}`;
+}
+
+async function preferredCodecs() {
+  // Opus needs WebCodecs in both directions; every browser can take binary PCM.
+  if (typeof AudioEncoder === 'undefined' || typeof AudioDecoder === 'undefined') {
+    return 'pcm16';
+  }
+  try {
+    const [encoder, decoder] = await Promise.all([
+      AudioEncoder.isConfigSupported(opusEncoderConfig()),
+      AudioDecoder.isConfigSupported({ codec: 'opus', sampleRate: TTS_SAMPLE_RATE, numberOfChannels: 1 }),
+    ]);
+    return encoder.supported && decoder.supported ? 'opus,pcm16' : 'pcm16';
+  } catch (error) {
+    return 'pcm16';
+  }
+}
+
+function opusEncoderConfig() {
+  return {
+    codec: 'opus',
+    sampleRate: TARGET_SAMPLE_RATE,
+    numberOfChannels: 1,
+    bitrate: OPUS_UPLINK_BITRATE,
+    opus: { frameDuration: 20000 },
+  };
+}
+
+function setupTransport(codec) {
+  closeTransport();
+  if (codec !== 'opus') {
+    return;
+  }
+  opusEncoder = new AudioEncoder({
+    output: (chunk) => {
+      const packet = new Uint8Array(chunk.byteLength);
+      chunk.copyTo(packet);
+      if (websocket && websocket.readyState === WebSocket.OPEN) {
+        websocket.send(packet.buffer);
+      }
+    },
+    error: (error) => console.error('Opus encoder error', error),
+  });
+  opusEncoder.configure(opusEncoderConfig());
+  opusDecoder = new AudioDecoder({
+    output: (audioData) => {
+      const channel = new Float32Array(audioData.numberOfFrames);
+      audioData.copyTo(channel, { planeIndex: 0, format: 'f32-planar' });
+      playFloat32(channel, audioData.sampleRate);
+      audioData.close();
+    },
+    error: (error) => console.error('Opus decoder error', error),
+  });
+  opusDecoder.configure({ codec: 'opus', sampleRate: TTS_SAMPLE_RATE, numberOfChannels: 1 });
+}
+
+function closeTransport() {
+  for (const codec of [opusEncoder, opusDecoder]) {
+    if (codec && codec.state !== 'closed') {
+      codec.close();
+    }
+  }
+  opusEncoder = null;
+  opusDecoder = null;
 }
 
 function updateStatus(message, tone = 'info') {
@@ -78,8 +171,10 @@ function finalizeResponse(payload) {
   contentEl.textContent = payload.text ?? contentEl.textContent;
   resetStreamingMessage();
 
-  if (typeof payload.score === 'number') {
-    scoreValue.textContent = payload.score.toString();
+  // The tutor's own score (parsed from its reply) wins over the acoustic estimate.
+  const score = typeof payload.tutor_score === 'number' ? payload.tutor_score : payload.score;
+  if (typeof score === 'number') {
+    scoreValue.textContent = score.toString();
   }
 
   if (typeof payload.paused === 'boolean') {
@@ -109,6 +204,81 @@ function finalizeResponse(payload) {
   }
 }
 
+function base64ToBytes(b64) {
+  const binary = atob(b64);
+  const bytes = new Uint8Array(binary.length);
+  for (let i = 0; i < binary.length; i += 1) {
+    bytes[i] = binary.charCodeAt(i);
+  }
+  return bytes;
+}
+
+function parseSampleRate(mimeType, fallback = TTS_SAMPLE_RATE) {
+  const match = /rate=(\d+)/.exec(mimeType ?? '');
+  return match ? Number(match[1]) : fallback;
+}
+
+function enqueueAudioChunk(payload) {
+  if (!payload.audio) {
+    return;
+  }
+  const bytes = base64ToBytes(payload.audio);
+  playPcm16(new Int16Array(bytes.buffer, 0, Math.floor(bytes.byteLength / 2)), parseSampleRate(payload.mime_type));
+}
+
+function handleAudioFrame(buffer) {
+  // Header (see backend/services/audio_transport.py): kind, codec, seq, turn, sample rate.
+  if (buffer.byteLength < AUDIO_FRAME_HEADER_BYTES) {
+    return;
+  }
+  const view = new DataView(buffer);
+  const codec = FRAME_CODECS[view.getUint8(1)];
+  const sampleRate = view.getUint32(8, true);
+  if (codec === 'pcm16') {
+    const samples = new Int16Array(buffer, AUDIO_FRAME_HEADER_BYTES, (buffer.byteLength - AUDIO_FRAME_HEADER_BYTES) >> 1);
+    playPcm16(samples, sampleRate);
+  } else if (codec === 'opus' && opusDecoder) {
+    let offset = AUDIO_FRAME_HEADER_BYTES;
+    while (offset + 2 <= buffer.byteLength) {
+      const length = view.getUint16(offset, true);
+      offset += 2;
+      opusDecoder.decode(
+        new EncodedAudioChunk({ type: 'key', timestamp: playbackTimestamp, data: new Uint8Array(buffer, offset, length) })
+      );
+      playbackTimestamp += 20000;
+      offset += length;
+    }
+  }
+}
+
+function playPcm16(samples, sampleRate) {
+  if (!samples.length) {
+    return;
+  }
+  const channel = new Float32Array(samples.length);
+  for (let i = 0; i < samples.length; i += 1) {
+    channel[i] = samples[i] / 0x8000;
+  }
+  playFloat32(channel, sampleRate);
+}
+
+function playFloat32(channel, sampleRate) {
+  if (!playbackContext) {
+    playbackContext = new AudioContext();
+  }
+  if (playbackContext.state === 'suspended') {
+    playbackContext.resume().catch(() => void 0);
+  }
+  const audioBuffer = playbackContext.createBuffer(1, channel.length, sampleRate);
+  audioBuffer.copyToChannel(channel, 0);
+  const source = playbackContext.createBufferSource();
+  source.buffer = audioBuffer;
+  source.connect(playbackContext.destination);
+  const startAt = Math.max(playbackContext.currentTime, playbackCursor);
+  source.start(startAt);
+  playbackCursor = startAt + audioBuffer.duration;
+}
+
 function concatFloat32(a, b) {
   const result = new Float32Array(a.length + b.length);
   result.set(a, 0);
@@ -152,6 +322,20 @@ function sendPcmChunk(pcm16) {
   if (!websocket || websocket.readyState !== WebSocket.OPEN) {
     return;
   }
+  if (opusEncoder) {
+    const audioData = new AudioData({
+      format: 's16',
+      sampleRate: TARGET_SAMPLE_RATE,
+      numberOfFrames: pcm16.length,
+      numberOfChannels: 1,
+      timestamp: captureTimestamp,
+      data: pcm16,
+    });
+    captureTimestamp += Math.round((pcm16.length / TARGET_SAMPLE_RATE) * 1e6);
+    opusEncoder.encode(audioData);
+    audioData.close();
+    return;
+  }
   const buffer = pcm16.buffer.slice(pcm16.byteOffset, pcm16.byteOffset + pcm16.byteLength);
   websocket.send(buffer);
 }
@@ -242,6 +426,10 @@ async function stopRecording({ sendTurnEnd = true } = {}) {
   recordBtn.disabled = sessionPaused || !isConnected;
   stopBtn.disabled = true;
   flushAudioBuffer();
+  if (opusEncoder) {
+    // Make sure the last partial Opus frame is on the wire before end-turn.
+    await opusEncoder.flush().catch(() => void 0);
+  }
   if (sendTurnEnd && websocket && websocket.readyState === WebSocket.OPEN) {
     websocket.send(JSON.stringify({ type: 'end-turn' }));
     awaitingFeedback = true;
@@ -284,7 +472,7 @@ async function connectWebSocket() {
     startPracticeBtn.disabled = false;
     return;
   }
-  websocket = new WebSocket(wsUrl());
+  websocket = new WebSocket(wsUrl(await preferredCodecs()));
   websocket.binaryType = 'arraybuffer';
 
   websocket.addEventListener('open', () => {
@@ -311,6 +499,7 @@ async function connectWebSocket() {
     if (isRecording) {
       stopRecording({ sendTurnEnd: false });
     }
+    closeTransport();
   });
 
   websocket.addEventListener('error', () => {
@@ -319,6 +508,10 @@ async function connectWebSocket() {
   });
 
   websocket.addEventListener('message', (event) => {
+    if (event.data instanceof ArrayBuffer) {
+      handleAudioFrame(event.data);
+      return;
+    }
     try {
       const data = JSON.parse(event.data);
       switch (data.type) {
@@ -333,12 +526,42 @@ async function connectWebSocket() {
             updateStatus(data.message ?? '');
           }
           break;
+        case 'transport':
+          setupTransport(data.codec);
+          break;
+        case 'session':
+          if (data.id) {
+            sessionStorage.setItem('conversationId', data.id);
+          }
+          break;
         case 'partial-response':
           appendPartialResponse(data.text ?? '');
           break;
         case 'final-response':
           finalizeResponse(data);
           break;
+        case 'hibernated':
+          updateStatus('会话已进入休眠，继续练习时会自动恢复。');
+          break;
+        case 'rehydrated':
+          updateStatus('会话已恢复。');
+          break;
+        case 'vad-end-turn':
+          // The server heard the learner stop talking and already ended the turn.
+          if (isRecording) {
+            stopRecording({ sendTurnEnd: false });
+          }
+          awaitingFeedback = true;
+          updateStatus('已检测到你说完了，等待 AI 反馈。');
+          break;
+        case 'tutor-score':
+          if (typeof data.score === 'number') {
+            scoreValue.textContent = data.score.toString();
+          }
+          break;
+        case 'audio-chunk':
+          enqueueAudioChunk(data);
+          break;
         case 'pause-state':
           sessionPaused = Boolean(data.paused);
           recordBtn.disabled = sessionPaused || !isConnected;
@@ -347,6 +570,23 @@ async function connectWebSocket() {
           updateStatus(data.message ?? '发生未知错误', 'error');
           startPracticeBtn.disabled = false;
           break;
+        case 'gemini-reconnecting':
+          updateStatus('与 Gemini 的连接中断，正在自动重连…', 'warning');
+          resetStreamingMessage();
+          break;
+        case 'gemini-reconnected':
+          if (awaitingFeedback || awaitingPracticeSentence) {
+            updateStatus('已重新连接 Gemini，上一条回复被中断，请重试。', 'warning');
+          } else {
+            updateStatus('已重新连接 Gemini，可以继续练习。');
+          }
+          awaitingFeedback = false;
+          if (awaitingPracticeSentence) {
+            awaitingPracticeSentence = false;
+            startPracticeBtn.disabled = false;
+          }
+          recordBtn.disabled = sessionPaused || !isConnected;
+          break;
         case 'gemini-disconnected':
           updateStatus('与 Gemini 的连接已断开，请重新开始练习。', 'warning');
           practiceReady = false;